@@ -0,0 +1,591 @@
+from __future__ import annotations
+
+import asyncio
+import typing as t
+from weakref import WeakKeyDictionary
+
+import sqlalchemy as sa
+import sqlalchemy.exc as sa_exc
+import sqlalchemy.ext.asyncio as sa_async
+from flask import abort
+from flask import current_app
+from flask import Flask
+from sqlalchemy.util import greenlet_spawn
+
+from .bulk import _bulk_write
+from .bulk import _insert_statement
+from .bulk import _upsert_statement
+from .extension import _abort_missing
+from .extension import _O
+from .extension import BindOperationError
+from .extension import SQLAlchemy
+from .health import EngineHealth
+from .loading import _get_many
+from .pagination import CountStrategy
+from .pagination import KeysetPagination
+from .pagination import Pagination
+from .pagination import SelectKeysetPagination
+from .pagination import SelectPagination
+from .query_cache import _cached_query
+from .session import _app_ctx_id
+from .session import Session
+from .streaming import _check_chunk_size
+from .streaming import _chunk_select
+from .streaming import _entity_indexes
+from .streaming import _expunge
+
+
+class AsyncSQLAlchemy(SQLAlchemy):
+    """An asyncio version of the :class:`.SQLAlchemy` extension. Engines are created
+    with an async driver, such as ``postgresql+asyncpg`` or ``sqlite+aiosqlite``, from
+    the same config, and :attr:`session` is an
+    :class:`~sqlalchemy.ext.asyncio.AsyncSession` scoped to the current app context.
+
+    .. code-block:: python
+
+        from flask_sqlalchemy.asyncio import AsyncSQLAlchemy
+
+        db = AsyncSQLAlchemy(app)
+
+        @app.get("/user/<int:id>")
+        async def user_detail(id):
+            user = await db.get_or_404(User, id)
+            return render_template("user.html", user=user)
+
+    Models, metadata, and bind keys work the same as the sync extension, and the
+    session's sync :class:`.Session` chooses an engine the same way. Methods that
+    perform I/O, such as :meth:`get_or_404`, :meth:`paginate`, and :meth:`create_all`,
+    are coroutines. The legacy ``Model.query`` interface is not supported.
+
+    Flask calls the async teardown that closes the session using its ``async`` extra,
+    install ``flask[async]``.
+
+    Takes the same arguments as :class:`.SQLAlchemy`. To scope sessions to the current
+    asyncio task rather than the app context, pass
+    ``session_options={"scopefunc": asyncio.current_task}``.
+
+    .. versionadded:: 3.2
+    """
+
+    session: _AsyncScopedSession  # type: ignore[assignment]
+    """An :class:`sqlalchemy.ext.asyncio.async_scoped_session` that creates instances
+    of :class:`~sqlalchemy.ext.asyncio.AsyncSession` scoped to the current Flask
+    application context. The session will be closed when the application context
+    exits.
+    """
+
+    def __init__(self, app: Flask | None = None, **kwargs: t.Any) -> None:
+        self._async_engines: WeakKeyDictionary[
+            sa.engine.Engine, sa_async.AsyncEngine
+        ] = WeakKeyDictionary()
+        super().__init__(app, **kwargs)
+
+    def init_app(self, app: Flask) -> None:
+        """Initialize a Flask application for use with this extension instance. See
+        :meth:`.SQLAlchemy.init_app`.
+
+        :data:`.SQLALCHEMY_HEALTH_CHECK_INTERVAL` is not supported, since the checks
+        would run outside an event loop. Call :meth:`check_health` instead.
+
+        :param app: The Flask application to initialize.
+        """
+        if app.config.get("SQLALCHEMY_HEALTH_CHECK_INTERVAL") is not None:
+            raise RuntimeError(
+                "'SQLALCHEMY_HEALTH_CHECK_INTERVAL' is not supported by"
+                " 'AsyncSQLAlchemy'. Call 'await db.check_health()' instead."
+            )
+
+        super().init_app(app)
+
+    def _make_scoped_session(  # type: ignore[override]
+        self, options: dict[str, t.Any]
+    ) -> _AsyncScopedSession:
+        """Create an :class:`sqlalchemy.ext.asyncio.async_scoped_session` around the
+        factory from :meth:`_make_session_factory`.
+
+        :meta private:
+
+        :param options: The ``session_options`` parameter from ``__init__``. A
+            ``scopefunc`` key is popped.
+        """
+        scope = options.pop("scopefunc", _app_ctx_id)
+        factory = self._make_session_factory(options)
+        return _AsyncScopedSession(factory, scope)
+
+    def _make_session_factory(  # type: ignore[override]
+        self, options: dict[str, t.Any]
+    ) -> sa_async.async_sessionmaker[sa_async.AsyncSession]:
+        """Create the :class:`sqlalchemy.ext.asyncio.async_sessionmaker` used by
+        :meth:`_make_scoped_session`. The ``class_`` key sets the sync session class,
+        which must be a subclass of :class:`.Session`. Each extension instance uses its
+        own subclass so session events only apply to its sessions.
+
+        :meta private:
+
+        :param options: The ``session_options`` parameter from ``__init__``. Keyword
+            arguments passed to the session factory.
+        """
+        base = options.pop("class_", Session)
+        options["sync_session_class"] = type(base.__name__, (base,), {})
+        options.setdefault("query_cls", self.Query)
+        return sa_async.async_sessionmaker(db=self, **options)
+
+    @property
+    def _session_events_target(self) -> t.Any:
+        return self.session.session_factory.kw["sync_session_class"]
+
+    async def _teardown_session(  # type: ignore[override]
+        self, exc: BaseException | None
+    ) -> None:
+        """Close the current session at the end of the request.
+
+        :meta private:
+        """
+        await self.session.remove()
+
+    def _make_engine(
+        self, bind_key: str | None, options: dict[str, t.Any], app: Flask
+    ) -> sa.engine.Engine:
+        """Create an :class:`~sqlalchemy.ext.asyncio.AsyncEngine` for the given bind
+        key and app, and return its sync engine, which is used to choose binds and
+        register events.
+
+        :meta private:
+        """
+        engine = sa_async.async_engine_from_config(options, prefix="")
+        self._async_engines[engine.sync_engine] = engine
+        return engine.sync_engine
+
+    @property
+    def async_engines(self) -> t.Mapping[str | None, sa_async.AsyncEngine]:
+        """Map of bind keys to :class:`sqlalchemy.ext.asyncio.AsyncEngine` instances
+        for the current application. :attr:`engines` contains the sync engine of each.
+
+        This requires that a Flask application context is active.
+        """
+        return {key: self._async_engines[e] for key, e in self.engines.items()}
+
+    @property
+    def async_engine(self) -> sa_async.AsyncEngine:
+        """The default :class:`~sqlalchemy.ext.asyncio.AsyncEngine` for the current
+        application.
+
+        This requires that a Flask application context is active.
+        """
+        return self._async_engines[self.engine]
+
+    async def _call_for_binds_async(
+        self, bind_key: str | None | list[str | None], op_name: str, parallel: bool
+    ) -> None:
+        """Call a method on each metadata. If ``parallel`` is true, each bind runs in
+        its own task rather than a thread, since the sync facade of an async engine
+        must be called from a greenlet.
+
+        :meta private:
+        """
+        if not parallel:
+            await greenlet_spawn(self._call_for_binds, bind_key, op_name)
+            return
+
+        ops = await greenlet_spawn(self._bind_operations, bind_key, op_name)
+        results = await asyncio.gather(
+            *(greenlet_spawn(op) for op in ops.values()), return_exceptions=True
+        )
+        errors = {
+            key: result
+            for key, result in zip(ops, results)
+            if isinstance(result, Exception)
+        }
+
+        if errors:
+            raise BindOperationError(errors)
+
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def create_all(  # type: ignore[override]
+        self,
+        bind_key: str | None | list[str | None] = "__all__",
+        parallel: bool = False,
+    ) -> None:
+        """Create tables that do not exist in the database. See
+        :meth:`.SQLAlchemy.create_all`.
+
+        This requires that a Flask application context is active.
+
+        :param bind_key: A bind key or list of keys to create the tables for. Defaults
+            to all binds.
+        :param parallel: Run the operation for each bind at the same time. If any
+            fail, a :exc:`.BindOperationError` is raised with each bind's error after
+            every bind is done.
+        """
+        await self._call_for_binds_async(bind_key, "create_all", parallel)
+
+    async def drop_all(  # type: ignore[override]
+        self,
+        bind_key: str | None | list[str | None] = "__all__",
+        parallel: bool = False,
+    ) -> None:
+        """Drop tables. See :meth:`.SQLAlchemy.drop_all`.
+
+        This requires that a Flask application context is active.
+
+        :param bind_key: A bind key or list of keys to drop the tables from. Defaults
+            to all binds.
+        :param parallel: Run the operation for each bind at the same time. If any
+            fail, a :exc:`.BindOperationError` is raised with each bind's error after
+            every bind is done.
+        """
+        await self._call_for_binds_async(bind_key, "drop_all", parallel)
+
+    async def reflect(  # type: ignore[override]
+        self,
+        bind_key: str | None | list[str | None] = "__all__",
+        parallel: bool = False,
+    ) -> None:
+        """Load table definitions from the database. See :meth:`.SQLAlchemy.reflect`.
+
+        This requires that a Flask application context is active.
+
+        :param bind_key: A bind key or list of keys to reflect the tables from.
+            Defaults to all binds.
+        :param parallel: Run the operation for each bind at the same time. If any
+            fail, a :exc:`.BindOperationError` is raised with each bind's error after
+            every bind is done.
+        """
+        await self._call_for_binds_async(bind_key, "reflect", parallel)
+
+    async def stream(  # type: ignore[override]
+        self,
+        select: sa.sql.Select[t.Any],
+        *,
+        chunk_size: int = 1000,
+        scalars: bool = True,
+    ) -> t.AsyncIterator[t.Any]:
+        """Iterate over the results of a select statement without loading them all
+        into memory. See :meth:`.SQLAlchemy.stream`. Use with ``async for``.
+
+        This requires that a Flask application context is active.
+        """
+        _check_chunk_size(chunk_size)
+        entities = _entity_indexes(select)
+        sync_session = self.session().sync_session
+        result = await self.session.stream(
+            select, execution_options={"yield_per": chunk_size}
+        )
+
+        try:
+            async for chunk in result.partitions():
+                for row in chunk:
+                    yield row[0] if scalars else row
+
+                _expunge(sync_session, chunk, entities)
+        finally:
+            await result.close()
+
+    async def iter_chunks(  # type: ignore[override]
+        self,
+        model: type[t.Any],
+        *,
+        chunk_size: int = 1000,
+        where: sa.ColumnElement[bool] | None = None,
+    ) -> t.AsyncIterator[list[t.Any]]:
+        """Walk every row of a model's table in chunks. See
+        :meth:`.SQLAlchemy.iter_chunks`. Use with ``async for``, and process each
+        chunk in the loop. The ``process`` and ``workers`` arguments are not
+        supported.
+
+        This requires that a Flask application context is active.
+        """
+        _check_chunk_size(chunk_size)
+        mapper = sa.inspect(model)
+        after = None
+
+        while True:
+            async with self.session.session_factory() as session:
+                with t.cast(Session, session.sync_session).using_primary():
+                    select = _chunk_select(model, where, after, chunk_size)
+                    items = list(await session.scalars(select))
+
+                    if not items:
+                        return
+
+                    after = mapper.primary_key_from_instance(items[-1])
+                    yield items
+                    await session.commit()
+
+            if len(items) < chunk_size:
+                return
+
+    async def bulk_insert(  # type: ignore[override]
+        self,
+        model: type[t.Any],
+        rows: t.Iterable[dict[str, t.Any]],
+        *,
+        batch_size: int = 1000,
+        return_keys: bool = False,
+    ) -> list[sa.Row[t.Any]] | None:
+        """Insert many rows for a model. See :meth:`.SQLAlchemy.bulk_insert`.
+
+        ``rows`` must be a regular iterable, not an async iterator.
+
+        This requires that a Flask application context is active.
+        """
+        return await greenlet_spawn(
+            _bulk_write,
+            self,
+            self.session().sync_session,
+            model,
+            rows,
+            _insert_statement,
+            batch_size,
+            return_keys,
+        )
+
+    async def bulk_upsert(  # type: ignore[override]
+        self,
+        model: type[t.Any],
+        rows: t.Iterable[dict[str, t.Any]],
+        *,
+        conflict_cols: t.Sequence[str],
+        update_cols: t.Sequence[str] | None = None,
+        batch_size: int = 1000,
+        return_keys: bool = False,
+    ) -> list[sa.Row[t.Any]] | None:
+        """Insert many rows for a model, updating rows that already exist. See
+        :meth:`.SQLAlchemy.bulk_upsert`.
+
+        ``rows`` must be a regular iterable, not an async iterator.
+
+        This requires that a Flask application context is active.
+        """
+        return await greenlet_spawn(
+            _bulk_write,
+            self,
+            self.session().sync_session,
+            model,
+            rows,
+            _upsert_statement(conflict_cols, update_cols),
+            batch_size,
+            return_keys,
+        )
+
+    async def check_health(self) -> list[EngineHealth]:  # type: ignore[override]
+        """Ping each engine for the current application now. See
+        :meth:`.SQLAlchemy.check_health`.
+
+        This requires that a Flask application context is active.
+        """
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        return await greenlet_spawn(self._app_health[app].check)
+
+    async def get_or_404(  # type: ignore[override]
+        self,
+        entity: type[_O],
+        ident: t.Any,
+        *,
+        description: str | None = None,
+        **kwargs: t.Any,
+    ) -> _O:
+        """Like :meth:`session.get() <sqlalchemy.ext.asyncio.AsyncSession.get>` but
+        aborts with a ``404 Not Found`` error instead of returning ``None``.
+
+        :param entity: The model class to query.
+        :param ident: The primary key to query.
+        :param description: A custom message to show on the error page.
+        :param kwargs: Extra arguments passed to ``session.get()``.
+        """
+        value = await self.session.get(entity, ident, **kwargs)
+
+        if value is None:
+            abort(404, description=description)
+
+        return value
+
+    async def get_many(  # type: ignore[override]
+        self, entity: type[_O], idents: t.Iterable[t.Any]
+    ) -> list[_O | None]:
+        """Get an instance for each primary key, with at most one query. See
+        :meth:`.SQLAlchemy.get_many`.
+
+        This requires that a Flask application context is active.
+
+        :param entity: The model class to query.
+        :param idents: The primary keys to query.
+        """
+        session = self.session().sync_session
+        return await greenlet_spawn(_get_many, session, entity, idents)
+
+    async def get_many_or_404(  # type: ignore[override]
+        self,
+        entity: type[_O],
+        idents: t.Iterable[t.Any],
+        *,
+        description: str | None = None,
+    ) -> list[_O]:
+        """Like :meth:`get_many` but aborts with a ``404 Not Found`` error if any of
+        the keys don't exist. See :meth:`.SQLAlchemy.get_many_or_404`.
+
+        This requires that a Flask application context is active.
+
+        :param entity: The model class to query.
+        :param idents: The primary keys to query.
+        :param description: A custom message to show on the error page.
+        """
+        idents = list(idents)
+        values = await self.get_many(entity, idents)
+        _abort_missing(entity, idents, values, description)
+        return t.cast("list[_O]", values)
+
+    async def cached(  # type: ignore[override]
+        self,
+        select: sa.sql.Select[t.Any],
+        *,
+        ttl: float | None = 60,
+        tags: t.Iterable[t.Any] | None = None,
+    ) -> list[sa.Row[t.Any]]:
+        """Execute a select and return its rows, or return the rows cached from a
+        previous call. See :meth:`.SQLAlchemy.cached`.
+
+        This requires that a Flask application context is active.
+
+        :param select: The ``select`` statement to execute.
+        :param ttl: The number of seconds to cache the rows.
+        :param tags: Models, tables, or table names to invalidate the rows for.
+        """
+        cache = self._query_cache
+
+        if cache is None:
+            raise RuntimeError(
+                "The query cache is not enabled. Set 'SQLALCHEMY_QUERY_CACHE' config."
+            )
+
+        session = self.session().sync_session
+        return await greenlet_spawn(_cached_query, session, cache, select, ttl, tags)
+
+    async def first_or_404(
+        self, statement: sa.sql.Select[t.Any], *, description: str | None = None
+    ) -> t.Any:
+        """Like :meth:`Result.scalar() <sqlalchemy.engine.Result.scalar>`, but aborts
+        with a ``404 Not Found`` error instead of returning ``None``.
+
+        :param statement: The ``select`` statement to execute.
+        :param description: A custom message to show on the error page.
+        """
+        value = (await self.session.execute(statement)).scalar()
+
+        if value is None:
+            abort(404, description=description)
+
+        return value
+
+    async def one_or_404(
+        self, statement: sa.sql.Select[t.Any], *, description: str | None = None
+    ) -> t.Any:
+        """Like :meth:`Result.scalar_one() <sqlalchemy.engine.Result.scalar_one>`,
+        but aborts with a ``404 Not Found`` error instead of raising ``NoResultFound``
+        or ``MultipleResultsFound``.
+
+        :param statement: The ``select`` statement to execute.
+        :param description: A custom message to show on the error page.
+        """
+        try:
+            return (await self.session.execute(statement)).scalar_one()
+        except (sa_exc.NoResultFound, sa_exc.MultipleResultsFound):
+            abort(404, description=description)
+
+    async def paginate(  # type: ignore[override]
+        self,
+        select: sa.sql.Select[t.Any],
+        *,
+        page: int | None = None,
+        per_page: int | None = None,
+        max_per_page: int | None = None,
+        error_out: bool = True,
+        count: bool | str | CountStrategy = True,
+    ) -> Pagination:
+        """Apply an offset and limit to a select statement based on the current page
+        and number of items per page, returning a :class:`.Pagination` object. See
+        :meth:`.SQLAlchemy.paginate`.
+
+        The items and total are loaded before returning. The pagination object's
+        :meth:`~.Pagination.prev` and :meth:`~.Pagination.next` methods would query
+        without awaiting, so call this again with ``page=pagination.next_num``
+        instead.
+
+        :param select: The ``select`` statement to paginate.
+        :param page: The current page. Defaults to the ``page`` query arg during a
+            request, or 1 otherwise.
+        :param per_page: The maximum number of items on a page. Defaults to the
+            ``per_page`` query arg during a request, or 20 otherwise.
+        :param max_per_page: The maximum allowed value for ``per_page``. Defaults to
+            100.
+        :param error_out: Abort with a ``404 Not Found`` error if the page is empty or
+            the arguments are invalid.
+        :param count: Calculate the total number of values. Can also be a
+            :class:`.CountStrategy` or the name of a built-in strategy.
+        """
+        return await greenlet_spawn(
+            SelectPagination,
+            select=select,
+            session=self.session().sync_session,
+            page=page,
+            per_page=per_page,
+            max_per_page=max_per_page,
+            error_out=error_out,
+            count=count,
+        )
+
+    async def keyset_paginate(  # type: ignore[override]
+        self,
+        select: sa.sql.Select[t.Any],
+        *,
+        cursor: str | None = None,
+        per_page: int | None = None,
+        max_per_page: int | None = None,
+        error_out: bool = True,
+    ) -> KeysetPagination:
+        """Filter an ordered select statement based on the sort key values of the last
+        item on the previous page, returning a :class:`.KeysetPagination` object. See
+        :meth:`.SQLAlchemy.keyset_paginate`.
+
+        The items are loaded before returning. The pagination object's
+        :meth:`~.KeysetPagination.prev` and :meth:`~.KeysetPagination.next` methods
+        would query without awaiting, so call this again with
+        ``cursor=pagination.next_cursor`` instead.
+
+        :param select: The ordered ``select`` statement to paginate.
+        :param cursor: The :attr:`~.KeysetPagination.next_cursor` or
+            :attr:`~.KeysetPagination.prev_cursor` value from another page. Defaults to
+            the ``cursor`` query arg during a request, or the first page otherwise.
+        :param per_page: The maximum number of items on a page. Defaults to the
+            ``per_page`` query arg during a request, or 20 otherwise.
+        :param max_per_page: The maximum allowed value for ``per_page``. Defaults to
+            100.
+        :param error_out: Abort with a ``404 Not Found`` error if the cursor is not
+            valid, or if ``per_page`` is less than 1 or not an int.
+        """
+        return await greenlet_spawn(
+            SelectKeysetPagination,
+            select=select,
+            session=self.session().sync_session,
+            cursor=cursor,
+            per_page=per_page,
+            max_per_page=max_per_page,
+            error_out=error_out,
+        )
+
+
+class _AsyncScopedSession(sa_async.async_scoped_session[sa_async.AsyncSession]):
+    """An :class:`~sqlalchemy.ext.asyncio.async_scoped_session` that also proxies
+    :meth:`.Session.using_primary` and :meth:`.Session.for_shard`.
+    """
+
+    def using_primary(self) -> t.ContextManager[None]:
+        """Proxy for :meth:`.Session.using_primary`."""
+        return t.cast(Session, self.registry().sync_session).using_primary()
+
+    def for_shard(self, shard_id: str) -> t.ContextManager[None]:
+        """Proxy for :meth:`.Session.for_shard`."""
+        return t.cast(Session, self.registry().sync_session).for_shard(shard_id)
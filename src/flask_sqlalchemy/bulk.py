@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import itertools
+import typing as t
+
+import sqlalchemy as sa
+import sqlalchemy.exc as sa_exc
+import sqlalchemy.orm as sa_orm
+
+from .session import _mapper_bind_key
+
+if t.TYPE_CHECKING:
+    from .extension import SQLAlchemy
+
+_MakeStatement = t.Callable[
+    [sa.engine.Dialect, sa_orm.Mapper[t.Any], t.Any, t.Sequence[str]], t.Any
+]
+
+
+def _bulk_write(
+    db: SQLAlchemy,
+    session: sa_orm.Session,
+    model: type[t.Any],
+    rows: t.Iterable[dict[str, t.Any]],
+    make_statement: _MakeStatement,
+    batch_size: int,
+    return_keys: bool,
+) -> list[sa.Row[t.Any]] | None:
+    """Execute an ``INSERT`` for each batch of rows using ORM bulk insert, which uses
+    "insertmanyvalues" to insert the batch with few statements. Rows for a sharded
+    model are grouped by shard within each batch, and inserted into the model's table
+    directly, since SQLAlchemy's ORM bulk insert doesn't support sharding.
+
+    :param db: The extension, used to find shards.
+    :param session: The session to execute with.
+    :param model: The model to insert.
+    :param rows: Dicts of attribute values. Consumed one batch at a time.
+    :param make_statement: Called with the dialect, the model's mapper, the mapper or
+        table to insert into, and the keys in the rows of the batch to create the
+        statement.
+    :param batch_size: The number of rows in each batch.
+    :param return_keys: Return the primary key of each row, in the order of the rows.
+    """
+    if batch_size < 1:
+        raise ValueError("'batch_size' must be at least 1.")
+
+    mapper: sa_orm.Mapper[t.Any] = sa.inspect(model)
+    bind_key = _mapper_bind_key(mapper)
+    shards = db._shards.get(bind_key)
+    shard_key = ""
+
+    if shards is not None:
+        shard_key = getattr(model, "__shard_key__", "")
+
+        if not shard_key:
+            raise sa_exc.InvalidRequestError(
+                f"Model '{model.__name__}' uses the sharded bind key '{bind_key}' but"
+                " does not set '__shard_key__'."
+            )
+
+    target = mapper if shards is None else mapper.local_table
+    statements: dict[tuple[str, tuple[str, ...]], t.Any] = {}
+    out: list[sa.Row[t.Any]] | None = [] if return_keys else None
+    iterator = iter(rows)
+
+    while batch := list(itertools.islice(iterator, batch_size)):
+        groups: dict[str | None, list[dict[str, t.Any]]]
+
+        if shards is None:
+            groups = {None: batch}
+        else:
+            groups = {}
+
+            for row in batch:
+                shard = db._shard_resolver(row[shard_key], shards)
+                groups.setdefault(shard, []).append(row)
+
+        for shard_id, group in groups.items():
+            bind_arguments: dict[str, t.Any] = {}
+
+            if shard_id is not None:
+                bind_arguments["shard_id"] = shard_id
+
+            engine = session.get_bind(mapper, **bind_arguments)
+            # The statement depends on the keys in the rows, such as the columns an
+            # upsert updates, so a batch with different keys uses another statement.
+            keys = tuple(dict.fromkeys(key for row in group for key in row))
+            cache_key = (engine.dialect.name, keys)
+
+            if cache_key not in statements:
+                statement = make_statement(engine.dialect, mapper, target, keys)
+
+                if return_keys:
+                    statement = statement.returning(
+                        *mapper.primary_key, sort_by_parameter_order=True
+                    )
+
+                statements[cache_key] = statement
+
+            statement = statements[cache_key]
+
+            if shards is None:
+                result = session.execute(
+                    statement, group, bind_arguments=bind_arguments
+                )
+            else:
+                conn = session.connection(
+                    bind_arguments={"mapper": mapper, **bind_arguments}
+                )
+                columns = mapper.columns
+                result = conn.execute(
+                    statement,
+                    [{columns[k].key: v for k, v in row.items()} for row in group],
+                )
+
+            if out is not None:
+                out.extend(result.all())
+
+    return out
+
+
+def _insert_statement(
+    dialect: sa.engine.Dialect,
+    mapper: sa_orm.Mapper[t.Any],
+    target: t.Any,
+    keys: t.Sequence[str],
+) -> sa.Insert:
+    return sa.insert(target)
+
+
+def _upsert_statement(
+    conflict_cols: t.Sequence[str], update_cols: t.Sequence[str] | None
+) -> _MakeStatement:
+    """Create a function that creates the dialect specific ``INSERT`` that updates
+    rows that conflict with an existing row.
+
+    :param conflict_cols: The attributes with a unique constraint that identifies an
+        existing row. Not used by MySQL, which checks every unique constraint.
+    :param update_cols: The attributes to update for an existing row. Defaults to
+        every attribute in the rows except the conflict attributes.
+    """
+
+    def make_statement(
+        dialect: sa.engine.Dialect,
+        mapper: sa_orm.Mapper[t.Any],
+        target: t.Any,
+        keys: t.Sequence[str],
+    ) -> t.Any:
+        name = dialect.name
+        update = update_cols
+
+        if update is None:
+            update = [key for key in keys if key not in conflict_cols]
+
+        columns = mapper.columns
+        statement: t.Any
+
+        if name in {"postgresql", "sqlite"}:
+            from sqlalchemy.dialects import postgresql
+            from sqlalchemy.dialects import sqlite
+
+            module: t.Any = postgresql if name == "postgresql" else sqlite
+            statement = module.insert(target)
+            index_elements = [columns[key] for key in conflict_cols]
+
+            if not update:
+                return statement.on_conflict_do_nothing(index_elements=index_elements)
+
+            return statement.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={
+                    columns[key].name: statement.excluded[columns[key].name]
+                    for key in update
+                },
+            )
+
+        if name in {"mysql", "mariadb"}:
+            from sqlalchemy.dialects import mysql
+
+            statement = mysql.insert(target)
+
+            if not update:
+                # Assigning the primary key its current value does nothing.
+                pk = mapper.primary_key[0]
+                return statement.on_duplicate_key_update({pk.name: pk})
+
+            return statement.on_duplicate_key_update(
+                {
+                    columns[key].name: statement.inserted[columns[key].name]
+                    for key in update
+                }
+            )
+
+        raise ValueError(
+            f"Upsert is not supported by the '{name}' dialect. Use PostgreSQL, SQLite,"
+            " MySQL, or MariaDB."
+        )
+
+    return make_statement
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
 import typing as t
 
+import click
 from flask import current_app
+from flask.cli import AppGroup
 
 
 def add_models_to_shell() -> dict[str, t.Any]:
@@ -14,3 +18,26 @@ def add_models_to_shell() -> dict[str, t.Any]:
     out = {m.class_.__name__: m.class_ for m in db.Model._sa_registry.mappers}
     out["db"] = db
     return out
+
+
+sqlalchemy_cli = AppGroup("sqlalchemy", help="Flask-SQLAlchemy commands.")
+"""Added to ``flask`` commands if :data:`.SQLALCHEMY_REFLECT_CACHE` is set."""
+
+
+@sqlalchemy_cli.command("reflect")
+def reflect_command() -> None:
+    """Reflect the tables from every bind and save them to the reflection cache."""
+    db = current_app.extensions["sqlalchemy"]
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    cache = db._app_reflect_cache[app]
+
+    for key in db.metadatas:
+        cache.clear(key)
+
+    result = db.reflect()
+
+    if inspect.iscoroutine(result):
+        # AsyncSQLAlchemy.reflect is a coroutine.
+        asyncio.run(result)
+
+    click.echo(f"Saved reflected tables to '{cache.path}'.")
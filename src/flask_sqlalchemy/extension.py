@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import contextvars
+import functools
 import os
+import threading
 import types
 import typing as t
 import warnings
+import weakref
+from collections import abc as cabc
+from concurrent.futures import ThreadPoolExecutor
 from weakref import WeakKeyDictionary
 
 import sqlalchemy as sa
@@ -15,18 +21,45 @@ from flask import current_app
 from flask import Flask
 from flask import has_app_context
 
+from .bulk import _bulk_write
+from .bulk import _insert_statement
+from .bulk import _upsert_statement
+from .health import _HealthChecker
+from .health import EngineHealth
+from .loading import _get_many
 from .model import _QueryProperty
 from .model import BindMixin
 from .model import DefaultMeta
 from .model import DefaultMetaNoName
 from .model import Model
 from .model import NameMixin
+from .model_cache import CacheBackend
+from .model_cache import MemoryCache
+from .overrides import _Override
+from .pagination import CountStrategy
+from .pagination import KeysetPagination
 from .pagination import Pagination
+from .pagination import SelectKeysetPagination
 from .pagination import SelectPagination
+from .pool_stats import _PoolTracker
+from .pool_stats import PoolStats
 from .query import Query
+from .query_cache import _cached_query
+from .record_queries import QueryStats
+from .reflection import _ReflectCache
+from .replicas import _check_strategy
+from .replicas import _ReplicaGroup
 from .session import _app_ctx_id
+from .session import _hash_shard
+from .session import _ScopedSession
 from .session import Session
+from .streaming import _iter_chunks
+from .streaming import _stream
 from .table import _Table
+from .timeouts import _StatementTimeout
+
+if t.TYPE_CHECKING:
+    from .track_modifications import _SignalQueue
 
 _O = t.TypeVar("_O", bound=object)  # Based on sqlalchemy.orm._typing.py
 
@@ -58,6 +91,79 @@ def _get_2x_declarative_bases(
     ]
 
 
+class BindOperationError(Exception):
+    """Raised by :meth:`.SQLAlchemy.create_all`, :meth:`~.SQLAlchemy.drop_all`, or
+    :meth:`~.SQLAlchemy.reflect` with ``parallel=True`` when the operation fails for
+    one or more binds. The operation has still run for every other bind.
+
+    :param errors: Map of bind keys, or shard ids for a sharded bind, to the error
+        raised for that bind.
+
+    .. versionadded:: 3.2
+    """
+
+    def __init__(self, errors: dict[str | None, Exception]) -> None:
+        message = "; ".join(f"{k!r}: {e!r}" for k, e in errors.items())
+        super().__init__(f"Failed for {len(errors)} bind(s). {message}")
+        self.errors = errors
+        """Map of bind keys to the error raised for that bind."""
+
+
+class _EngineMap(cabc.Mapping):  # type: ignore[type-arg]
+    """Map of bind keys to engines. Each engine is created the first time its key is
+    accessed. Creating an engine is thread safe.
+
+    :param options: Map of the configured bind keys to their engine options.
+    :param load: Called with a bind key to create its engine.
+    """
+
+    def __init__(
+        self,
+        options: t.Mapping[str | None, t.Mapping[str, t.Any]],
+        load: t.Callable[[str | None], sa.engine.Engine],
+    ) -> None:
+        self._keys = list(options)
+        self._options = options
+        self._load = load
+        self._lock = threading.Lock()
+        self.loaded: dict[str | None, sa.engine.Engine] = {}
+        """The engines that have been created."""
+
+    def __getitem__(self, key: str | None) -> sa.engine.Engine:
+        try:
+            return self.loaded[key]
+        except KeyError:
+            pass
+
+        if key not in self._keys:
+            raise KeyError(key)
+
+        with self._lock:
+            if key not in self.loaded:
+                self.loaded[key] = self._load(key)
+
+            return self.loaded[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> t.Iterator[str | None]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self._keys}>"
+
+    def url(self, key: str | None) -> sa.engine.URL:
+        """Get the URL of an engine without creating it."""
+        if key in self.loaded:
+            return self.loaded[key].url
+
+        return sa.engine.make_url(self._options[key]["url"])
+
+
 class SQLAlchemy:
     """Integrates SQLAlchemy with Flask. This handles setting up one or more engines,
     associating tables and models with specific engines, and cleaning up connections and
@@ -97,6 +203,13 @@ class SQLAlchemy:
         for a list of arguments.
     :param add_models_to_shell: Add the ``db`` instance and all model classes to
         ``flask shell``.
+    :param shard_resolver: A function that takes a sharded model's shard key value and
+        the list of shard bind keys from :data:`.SQLALCHEMY_SHARDS`, and returns the
+        bind key of the shard to use. By default, a stable hash of the value chooses the
+        shard.
+
+    .. versionchanged:: 3.2
+        Added the ``shard_resolver`` parameter.
 
     .. versionchanged:: 3.1.0
         The ``metadata`` parameter can still be used with SQLAlchemy 1.x classes,
@@ -172,6 +285,7 @@ class SQLAlchemy:
         engine_options: dict[str, t.Any] | None = None,
         add_models_to_shell: bool = True,
         disable_autonaming: bool = False,
+        shard_resolver: t.Callable[[t.Any, t.Sequence[str]], str] | None = None,
     ):
         if session_options is None:
             session_options = {}
@@ -269,10 +383,41 @@ class SQLAlchemy:
         if engine_options is None:
             engine_options = {}
 
+        self.query_stats = QueryStats()
+        """Cumulative statistics about the queries executed across all requests,
+        grouped by bind key and normalized statement, if :data:`.SQLALCHEMY_QUERY_STATS`
+        is enabled. This does not require an app context.
+
+        .. versionadded:: 3.2
+        """
+
         self._engine_options = engine_options
-        self._app_engines: WeakKeyDictionary[Flask, dict[str | None, sa.engine.Engine]]
+        self._app_engines: WeakKeyDictionary[Flask, _EngineMap]
         self._app_engines = WeakKeyDictionary()
+        self._app_replicas: WeakKeyDictionary[
+            Flask, dict[sa.engine.Engine, _ReplicaGroup]
+        ] = WeakKeyDictionary()
+        self._app_health: WeakKeyDictionary[Flask, _HealthChecker]
+        self._app_health = WeakKeyDictionary()
+        self._app_pools: WeakKeyDictionary[
+            Flask, dict[sa.engine.Engine, _PoolTracker]
+        ] = WeakKeyDictionary()
         self._add_models_to_shell = add_models_to_shell
+        self._shard_resolver = shard_resolver or _hash_shard
+        self._app_shards: WeakKeyDictionary[Flask, dict[str | None, list[str]]]
+        self._app_shards = WeakKeyDictionary()
+        self._app_reflect_cache: WeakKeyDictionary[Flask, _ReflectCache]
+        self._app_reflect_cache = WeakKeyDictionary()
+        self._app_model_cache: WeakKeyDictionary[Flask, CacheBackend]
+        self._app_model_cache = WeakKeyDictionary()
+        self._app_query_cache: WeakKeyDictionary[Flask, CacheBackend]
+        self._app_query_cache = WeakKeyDictionary()
+        self._app_track_modifications: WeakKeyDictionary[
+            Flask, bool | tuple[type[t.Any], ...]
+        ] = WeakKeyDictionary()
+        self._app_signal_queue: WeakKeyDictionary[Flask, _SignalQueue]
+        self._app_signal_queue = WeakKeyDictionary()
+        _fork_instances.add(self)
 
         if app is not None:
             self.init_app(app)
@@ -281,10 +426,17 @@ class SQLAlchemy:
         if not has_app_context():
             return f"<{type(self).__name__}>"
 
-        num_default_engines = 1 if self.engines.get(None) else 0
-        engine_str = self.engine.url if num_default_engines else "(No default engine)"
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        engines = self._app_engines.get(app)
+
+        if engines is None:
+            return f"<{type(self).__name__}>"
 
-        num_other_engines = len(self.engines) - num_default_engines
+        # Read the URL from the config, without creating a lazy engine.
+        num_default_engines = 1 if None in engines else 0
+        engine_str = engines.url(None) if num_default_engines else "(No default engine)"
+
+        num_other_engines = len(engines) - num_default_engines
         if num_other_engines >= 1:
             engine_str = f"{engine_str} +{num_other_engines} engines"
 
@@ -305,8 +457,29 @@ class SQLAlchemy:
         - :data:`.SQLALCHEMY_ENGINE_OPTIONS`
         - :data:`.SQLALCHEMY_ECHO`
         - :data:`.SQLALCHEMY_BINDS`
+        - :data:`.SQLALCHEMY_STATEMENT_TIMEOUT`
+        - :data:`.SQLALCHEMY_SHARDS`
+        - :data:`.SQLALCHEMY_LAZY_ENGINES`
+        - :data:`.SQLALCHEMY_CONNECT_AFTER_FORK`
+        - :data:`.SQLALCHEMY_HEALTH_CHECK_INTERVAL`
+        - :data:`.SQLALCHEMY_REPLICA_MAX_LAG`
+        - :data:`.SQLALCHEMY_REFLECT_CACHE`
+        - :data:`.SQLALCHEMY_REFLECT_CACHE_VERSION`
+        - :data:`.SQLALCHEMY_MODEL_CACHE`
+        - :data:`.SQLALCHEMY_QUERY_CACHE`
         - :data:`.SQLALCHEMY_RECORD_QUERIES`
+        - :data:`.SQLALCHEMY_RECORD_QUERIES_SAMPLE_RATE`
+        - :data:`.SQLALCHEMY_RECORD_QUERIES_MAX`
+        - :data:`.SQLALCHEMY_RECORD_QUERIES_LOCATION`
+        - :data:`.SQLALCHEMY_QUERY_STATS`
+        - :data:`.SQLALCHEMY_POOL_STATS`
+        - :data:`.SQLALCHEMY_N_PLUS_ONE_THRESHOLD`
+        - :data:`.SQLALCHEMY_N_PLUS_ONE_ACTION`
+        - :data:`.SQLALCHEMY_QUERY_BUDGET`
+        - :data:`.SQLALCHEMY_QUERY_BUDGET_ACTION`
         - :data:`.SQLALCHEMY_TRACK_MODIFICATIONS`
+        - :data:`.SQLALCHEMY_TRACK_MODIFICATIONS_QUEUE`
+        - :data:`.SQLALCHEMY_TRACK_MODIFICATIONS_QUEUE_FULL`
 
         :param app: The Flask application to initialize.
         """
@@ -358,37 +531,204 @@ class SQLAlchemy:
                 "Either 'SQLALCHEMY_DATABASE_URI' or 'SQLALCHEMY_BINDS' must be set."
             )
 
-        engines = self._app_engines.setdefault(app, {})
-
         # Dispose existing engines in case init_app is called again.
-        if engines:
-            for engine in engines.values():
-                engine.dispose()
+        if app in self._app_health:
+            self._app_health.pop(app).stop()
+
+        if app in self._app_signal_queue:
+            self._app_signal_queue.pop(app).stop()
 
-            engines.clear()
+        for _, engine in self._iter_engines(app):
+            engine.dispose()
 
-        # Create the metadata and engine for each bind key.
+        replica_config: dict[str | None, tuple[list[t.Any], str, dict[str, t.Any]]]
+        replica_config = {}
+        default_timeout = app.config.setdefault("SQLALCHEMY_STATEMENT_TIMEOUT", None)
+        timeouts: dict[str | None, _StatementTimeout] = {}
+
+        # Create the metadata and validate the engine config for each bind key.
         for key, options in engine_options.items():
             self._make_metadata(key)
+            replicas = options.pop("replicas", None)
+            strategy = options.pop("replica_strategy", "round_robin")
+            timeout = options.pop("statement_timeout", default_timeout)
             options.setdefault("echo", echo)
             options.setdefault("echo_pool", echo)
+
+            if timeout is not None:
+                timeouts[key] = _StatementTimeout(timeout)
+
+            if replicas:
+                _check_strategy(strategy)
+                replica_config[key] = (replicas, strategy, options.copy())
+
             self._apply_driver_defaults(options, app)
-            engines[key] = self._make_engine(key, options, app)
 
-        if app.config.setdefault("SQLALCHEMY_RECORD_QUERIES", False):
+        shards: dict[str | None, list[str]] = app.config.setdefault(
+            "SQLALCHEMY_SHARDS", {}
+        )
+
+        for key, shard_ids in shards.items():
+            if not shard_ids:
+                raise RuntimeError(
+                    f"Sharded bind key '{key}' must list at least one shard."
+                )
+
+            if key in engine_options:
+                raise RuntimeError(
+                    f"Sharded bind key '{key}' must not also be in 'SQLALCHEMY_BINDS'."
+                )
+
+            for shard_id in shard_ids:
+                if shard_id not in engine_options:
+                    raise RuntimeError(
+                        f"Shard '{shard_id}' for bind key '{key}' is not in"
+                        " 'SQLALCHEMY_BINDS' config."
+                    )
+
+            self._make_metadata(key)
+
+        self._app_shards[app] = {k: list(v) for k, v in shards.items()}
+        health = self._app_health[app] = _HealthChecker(
+            interval=app.config.setdefault("SQLALCHEMY_HEALTH_CHECK_INTERVAL", None),
+            max_lag=app.config.setdefault("SQLALCHEMY_REPLICA_MAX_LAG", None),
+        )
+
+        reflect_cache: str | None = app.config.setdefault(
+            "SQLALCHEMY_REFLECT_CACHE", None
+        )
+        reflect_version = app.config.setdefault(
+            "SQLALCHEMY_REFLECT_CACHE_VERSION", None
+        )
+
+        if reflect_cache:
+            self._app_reflect_cache[app] = _ReflectCache(
+                os.path.join(app.instance_path, reflect_cache), reflect_version
+            )
+            from .cli import sqlalchemy_cli
+
+            app.cli.add_command(sqlalchemy_cli)
+
+        model_cache: bool | CacheBackend = app.config.setdefault(
+            "SQLALCHEMY_MODEL_CACHE", False
+        )
+
+        if model_cache is True:
+            model_cache = MemoryCache()
+
+        if model_cache:
+            self._app_model_cache[app] = model_cache
+
+        query_cache: bool | CacheBackend = app.config.setdefault(
+            "SQLALCHEMY_QUERY_CACHE", False
+        )
+
+        if query_cache is True:
+            query_cache = MemoryCache()
+
+        if query_cache:
+            self._app_query_cache[app] = query_cache
+
+        app.config.setdefault("SQLALCHEMY_RECORD_QUERIES_SAMPLE_RATE", 1.0)
+        app.config.setdefault("SQLALCHEMY_RECORD_QUERIES_MAX", None)
+        app.config.setdefault("SQLALCHEMY_RECORD_QUERIES_LOCATION", True)
+
+        app.config.setdefault("SQLALCHEMY_N_PLUS_ONE_THRESHOLD", None)
+        app.config.setdefault("SQLALCHEMY_N_PLUS_ONE_ACTION", "warn")
+        app.config.setdefault("SQLALCHEMY_QUERY_BUDGET", None)
+        app.config.setdefault("SQLALCHEMY_QUERY_BUDGET_ACTION", "warn")
+        record = app.config.setdefault("SQLALCHEMY_RECORD_QUERIES", False)
+        listeners: dict[str | None, t.Callable[[sa.engine.Engine], None]] = {}
+
+        if (
+            app.config.setdefault("SQLALCHEMY_QUERY_STATS", record)
+            or record
+            or app.config["SQLALCHEMY_N_PLUS_ONE_THRESHOLD"]
+            or app.config["SQLALCHEMY_QUERY_BUDGET"] is not None
+        ):
             from . import record_queries
 
-            for engine in engines.values():
-                record_queries._listen(engine)
+            if app.config["SQLALCHEMY_QUERY_STATS"]:
+                stats: QueryStats | None = self.query_stats
+            else:
+                stats = None
+
+            for key in engine_options:
+                recorder = record_queries._Recorder(app, key, stats)
+                listeners[key] = functools.partial(
+                    record_queries._listen, recorder=recorder
+                )
+
+        replica_groups = self._app_replicas[app] = {}
+        pool_stats = app.config.setdefault("SQLALCHEMY_POOL_STATS", False)
+        pools = self._app_pools[app] = {}
+        app_ref = weakref.ref(app)
+
+        def load_engine(key: str | None) -> sa.engine.Engine:
+            app = t.cast(Flask, app_ref())
+            engine = self._make_engine(key, engine_options[key], app)
+            engines = [engine]
+
+            if key in replica_config:
+                replicas, strategy, replica_base = replica_config[key]
+                group = replica_groups[engine] = _ReplicaGroup(
+                    self._make_replica_engines(key, replica_base, replicas, app),
+                    strategy,
+                )
+                group.health = health
+                engines.extend(group.engines)
+
+            for item in engines:
+                health.add(key, item, item is not engine)
+
+                if pool_stats:
+                    pools[item] = _PoolTracker(key, item, item is not engine)
+
+                if key in listeners:
+                    listeners[key](item)
+
+                if key in timeouts:
+                    timeouts[key].listen(item)
 
-        if app.config.setdefault("SQLALCHEMY_TRACK_MODIFICATIONS", False):
+            return engine
+
+        engines = self._app_engines[app] = _EngineMap(engine_options, load_engine)
+        lazy = app.config.setdefault("SQLALCHEMY_LAZY_ENGINES", False)
+
+        if (
+            not app.config.setdefault("SQLALCHEMY_CONNECT_AFTER_FORK", False)
+            and not lazy
+        ):
+            for key in engines:
+                engines[key]
+
+        health.start()
+
+        track = app.config.setdefault("SQLALCHEMY_TRACK_MODIFICATIONS", False)
+
+        if track:
             from . import track_modifications
 
-            track_modifications._listen(self.session)
+            if isinstance(track, (list, tuple, set, frozenset)):
+                self._app_track_modifications[app] = tuple(track)
+            else:
+                self._app_track_modifications[app] = True
 
-    def _make_scoped_session(
-        self, options: dict[str, t.Any]
-    ) -> sa_orm.scoped_session[Session]:
+            queue_size = app.config.setdefault(
+                "SQLALCHEMY_TRACK_MODIFICATIONS_QUEUE", None
+            )
+            queue_full = app.config.setdefault(
+                "SQLALCHEMY_TRACK_MODIFICATIONS_QUEUE_FULL", "block"
+            )
+
+            if queue_size is not None:
+                self._app_signal_queue[app] = track_modifications._SignalQueue(
+                    queue_size, queue_full
+                )
+
+            track_modifications._listen(self._session_events_target)
+
+    def _make_scoped_session(self, options: dict[str, t.Any]) -> _ScopedSession:
         """Create a :class:`sqlalchemy.orm.scoping.scoped_session` around the factory
         from :meth:`_make_session_factory`. The result is available as :attr:`session`.
 
@@ -411,7 +751,7 @@ class SQLAlchemy:
         """
         scope = options.pop("scopefunc", _app_ctx_id)
         factory = self._make_session_factory(options)
-        return sa_orm.scoped_session(factory, scope)
+        return _ScopedSession(factory, scope)
 
     def _make_session_factory(
         self, options: dict[str, t.Any]
@@ -440,6 +780,14 @@ class SQLAlchemy:
         options.setdefault("query_cls", self.Query)
         return sa_orm.sessionmaker(db=self, **options)
 
+    @property
+    def _session_events_target(self) -> t.Any:
+        """The object to register session event listeners on.
+
+        :meta private:
+        """
+        return self.session
+
     def _teardown_session(self, exc: BaseException | None) -> None:
         """Remove the current session at the end of the request.
 
@@ -608,7 +956,7 @@ class SQLAlchemy:
         """
         url = sa.engine.make_url(options["url"])
 
-        if url.drivername in {"sqlite", "sqlite+pysqlite"}:
+        if url.drivername in {"sqlite", "sqlite+pysqlite", "sqlite+aiosqlite"}:
             if url.database is None or url.database in {"", ":memory:"}:
                 options["poolclass"] = sa.pool.StaticPool
 
@@ -666,6 +1014,107 @@ class SQLAlchemy:
         """
         return sa.engine_from_config(options, prefix="")
 
+    def _make_replica_engines(
+        self,
+        bind_key: str | None,
+        options: dict[str, t.Any],
+        replicas: list[str | sa.engine.URL | dict[str, t.Any]],
+        app: Flask,
+    ) -> list[sa.engine.Engine]:
+        """Create the read replica engines for a bind key. Each replica uses the same
+        options as the primary engine, with its own URL or options applied on top.
+
+        This method is used for internal setup. Its signature may change at any time.
+
+        :meta private:
+
+        :param bind_key: The name of the engine the replicas belong to.
+        :param options: Arguments passed to the primary engine.
+        :param replicas: The ``replicas`` list from the engine's config. Each item is a
+            URL or a dict of engine options.
+        :param app: The application that the engine configuration belongs to.
+
+        .. versionadded:: 3.2
+        """
+        engines = []
+
+        for value in replicas:
+            replica_options = options.copy()
+
+            if isinstance(value, (str, sa.engine.URL)):
+                replica_options["url"] = value
+            else:
+                replica_options.update(value)
+
+            self._apply_driver_defaults(replica_options, app)
+            engines.append(self._make_engine(bind_key, replica_options, app))
+
+        return engines
+
+    def _iter_engines(
+        self, app: Flask
+    ) -> t.Iterator[tuple[str | None, sa.engine.Engine]]:
+        """Iterate over the bind key and engine for every engine that has been created
+        for the app, including replicas.
+
+        :meta private:
+        """
+        replica_groups = self._app_replicas.get(app, {})
+
+        if app not in self._app_engines:
+            return
+
+        for key, engine in self._app_engines[app].loaded.items():
+            yield key, engine
+
+            if engine in replica_groups:
+                for replica in replica_groups[engine].engines:
+                    yield key, replica
+
+    def _before_fork(self) -> None:
+        """Close the pooled connections of every engine for apps that set
+        :data:`.SQLALCHEMY_CONNECT_AFTER_FORK`, so that the child process does not
+        inherit any open connections. Called in the parent process before
+        :func:`os.fork`.
+
+        :meta private:
+
+        .. versionadded:: 3.2
+        """
+        for app in list(self._app_engines):
+            if app.config.get("SQLALCHEMY_CONNECT_AFTER_FORK"):
+                for _, engine in self._iter_engines(app):
+                    engine.dispose()
+
+    def _after_fork_in_child(self) -> None:
+        """Replace the connection pool of every engine without closing the connections
+        inherited from the parent process, which the parent still uses. Threads don't
+        survive a fork, so engine and pool statistics locks are replaced, and health
+        checks are restarted. Called in the child process after :func:`os.fork`.
+
+        :meta private:
+
+        .. versionadded:: 3.2
+        """
+        for app, engines in list(self._app_engines.items()):
+            engines._lock = threading.Lock()
+            trackers = self._app_pools.get(app, {}).values()
+
+            for tracker in trackers:
+                tracker._lock = threading.Lock()
+
+            for _, engine in self._iter_engines(app):
+                engine.dispose(close=False)
+
+            for tracker in trackers:
+                tracker.reset()
+
+            if app in self._app_health:
+                self._app_health[app]._restart_after_fork()
+
+            if app in self._app_signal_queue:
+                self._app_signal_queue[app]._restart_after_fork()
+
     @property
     def metadata(self) -> sa.MetaData:
         """The default metadata used by :attr:`Model` and :attr:`Table` if no bind key
@@ -682,8 +1131,14 @@ class SQLAlchemy:
         To customize, set the :data:`.SQLALCHEMY_BINDS` config, and set defaults by
         passing the ``engine_options`` parameter to the extension.
 
+        If :data:`.SQLALCHEMY_LAZY_ENGINES` is enabled, each engine is created the first
+        time its key is accessed.
+
         This requires that a Flask application context is active.
 
+        .. versionchanged:: 3.2
+            Engines may be created lazily.
+
         .. versionadded:: 3.0
         """
         app = current_app._get_current_object()  # type: ignore[attr-defined]
@@ -697,6 +1152,252 @@ class SQLAlchemy:
 
         return self._app_engines[app]
 
+    @property
+    def replica_engines(self) -> t.Mapping[str | None, list[sa.engine.Engine]]:
+        """Map of bind keys to the read replica :class:`sqlalchemy.engine.Engine`
+        instances for the current application. Only bind keys that configure
+        ``replicas`` are present. If :data:`.SQLALCHEMY_LAZY_ENGINES` is enabled, only
+        bind keys whose engine has been created are present, this does not create them.
+
+        This requires that a Flask application context is active.
+
+        .. versionadded:: 3.2
+        """
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        groups = self._replica_groups
+        return {
+            key: list(groups[engine].engines)
+            for key, engine in self._app_engines[app].loaded.items()
+            if engine in groups
+        }
+
+    @property
+    def _shards(self) -> dict[str | None, list[str]]:
+        """Map of sharded bind keys to their shard bind keys for the current
+        application. Empty if there is no app context.
+
+        :meta private:
+        """
+        if not has_app_context():
+            return {}
+
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        return self._app_shards.get(app, {})
+
+    @property
+    def _model_cache(self) -> CacheBackend | None:
+        """The cache backend for :data:`.SQLALCHEMY_MODEL_CACHE` for the current
+        application, or ``None`` if it is not enabled or there is no app context.
+
+        :meta private:
+        """
+        if not has_app_context():
+            return None
+
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        return self._app_model_cache.get(app)
+
+    @property
+    def _track_modifications(self) -> bool | tuple[type[t.Any], ...]:
+        """``True`` if :data:`.SQLALCHEMY_TRACK_MODIFICATIONS` is enabled for all
+        models for the current application, a tuple of model classes if it is limited
+        to those, or ``False`` if it is not enabled or there is no app context.
+
+        :meta private:
+        """
+        if not has_app_context():
+            return False
+
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        return self._app_track_modifications.get(app, False)
+
+    @property
+    def _signal_queue(self) -> _SignalQueue | None:
+        """The queue that sends :data:`.models_committed` in a background thread for
+        the current application, or ``None`` if the signal is sent during the commit.
+
+        :meta private:
+        """
+        if not has_app_context():
+            return None
+
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        return self._app_signal_queue.get(app)
+
+    def wait_for_signals(self, timeout: float | None = None) -> bool:
+        """Wait until the :data:`.models_committed` signals queued by the current
+        application have been sent, if :data:`.SQLALCHEMY_TRACK_MODIFICATIONS_QUEUE`
+        is set. Returns ``False`` if the timeout passed first. This is useful in tests.
+
+        This requires that a Flask application context is active.
+
+        :param timeout: The maximum number of seconds to wait.
+
+        .. versionadded:: 3.2
+        """
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        signal_queue = self._app_signal_queue.get(app)
+
+        if signal_queue is None:
+            return True
+
+        return signal_queue.wait(timeout)
+
+    @property
+    def _query_cache(self) -> CacheBackend | None:
+        """The cache backend for :data:`.SQLALCHEMY_QUERY_CACHE` for the current
+        application, or ``None`` if it is not enabled or there is no app context.
+
+        :meta private:
+        """
+        if not has_app_context():
+            return None
+
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        return self._app_query_cache.get(app)
+
+    def get_shard(self, bind_key: str, value: t.Any) -> str:
+        """Get the shard that a shard key value belongs to, using the
+        ``shard_resolver`` passed to the extension. The result can be passed to
+        :meth:`db.session.for_shard() <.Session.for_shard>`.
+
+        This requires that a Flask application context is active.
+
+        :param bind_key: A sharded bind key in :data:`.SQLALCHEMY_SHARDS`.
+        :param value: A shard key value.
+
+        .. versionadded:: 3.2
+        """
+        try:
+            shards = self._shards[bind_key]
+        except KeyError:
+            raise sa_exc.UnboundExecutionError(
+                f"Bind key '{bind_key}' is not in 'SQLALCHEMY_SHARDS' config."
+            ) from None
+
+        return self._shard_resolver(value, shards)
+
+    @property
+    def engine_health(self) -> list[EngineHealth]:
+        """The result of the most recent health check of each engine for the current
+        application, including replicas. Checks run in the background if
+        :data:`.SQLALCHEMY_HEALTH_CHECK_INTERVAL` is set, or when
+        :meth:`check_health` is called.
+
+        This requires that a Flask application context is active.
+
+        .. versionadded:: 3.2
+        """
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        return list(self._app_health[app].status.values())
+
+    def check_health(self) -> list[EngineHealth]:
+        """Ping each engine for the current application now, including replicas, and
+        return the result for each. Replicas that fail, or that lag behind by more than
+        :data:`.SQLALCHEMY_REPLICA_MAX_LAG`, are skipped when choosing a replica until a
+        later check succeeds.
+
+        This requires that a Flask application context is active.
+
+        .. versionadded:: 3.2
+        """
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        return self._app_health[app].check()
+
+    def query_budget(
+        self, queries: int | None = None, time: float | None = None
+    ) -> _Override:
+        """Override :data:`.SQLALCHEMY_QUERY_BUDGET` for a view, or for a block of
+        code. The limits replace the configured budget, a limit of ``None`` is not
+        enforced. Queries executed earlier in the app context still count against the
+        budget.
+
+        .. code-block:: python
+
+            @app.get("/report")
+            @db.query_budget(queries=200, time=2.0)
+            def report():
+                ...
+
+        Budgets are only checked if :data:`.SQLALCHEMY_QUERY_BUDGET` is set. Set it to
+        an empty dict to only check budgets given by this decorator.
+
+        This requires that a Flask application context is active when the view or
+        block runs.
+
+        :param queries: The maximum number of queries.
+        :param time: The maximum total time spent executing queries, in seconds.
+
+        .. versionadded:: 3.2
+        """
+        return _Override("_sqlalchemy_query_budget", (queries, time))
+
+    def statement_timeout(self, timeout: float | None) -> _Override:
+        """Override :data:`.SQLALCHEMY_STATEMENT_TIMEOUT` for a view, or for a block of
+        code. The timeout is applied to connections checked out from the pool while it
+        is active, so the session must not already be using a connection.
+
+        .. code-block:: python
+
+            @app.get("/report")
+            @db.statement_timeout(30)
+            def report():
+                ...
+
+        Only binds that have a statement timeout configured are affected.
+
+        This requires that a Flask application context is active when the view or
+        block runs.
+
+        :param timeout: The timeout in seconds, or ``None`` for no timeout.
+
+        .. versionadded:: 3.2
+        """
+        return _Override("_sqlalchemy_statement_timeout", timeout)
+
+    def pool_stats(self) -> dict[str | None, PoolStats]:
+        """Statistics about the connection pool of each engine for the current
+        application, such as how many connections are checked out and how long getting
+        a connection has taken. Use this to choose ``pool_size`` and ``max_overflow``,
+        and to see if requests are waiting for connections.
+
+        :data:`.SQLALCHEMY_POOL_STATS` must be enabled. Engines that have not been
+        created yet, if :data:`.SQLALCHEMY_LAZY_ENGINES` is
+        enabled, are not included. The stats for replicas are in each engine's
+        :attr:`~.PoolStats.replicas` list.
+
+        This requires that a Flask application context is active.
+
+        .. versionadded:: 3.2
+        """
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+
+        if not app.config["SQLALCHEMY_POOL_STATS"]:
+            raise RuntimeError("'SQLALCHEMY_POOL_STATS' must be enabled.")
+
+        pools = self._app_pools[app]
+        replica_groups = self._app_replicas[app]
+        out = {}
+
+        for key, engine in self._app_engines[app].loaded.items():
+            stats = out[key] = pools[engine].stats()
+
+            if engine in replica_groups:
+                stats.replicas = [
+                    pools[replica].stats() for replica in replica_groups[engine].engines
+                ]
+
+        return out
+
+    @property
+    def _replica_groups(self) -> dict[sa.engine.Engine, _ReplicaGroup]:
+        """Map of primary engines to their replicas for the current application.
+
+        :meta private:
+        """
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        return self._app_replicas.get(app, {})
+
     @property
     def engine(self) -> sa.engine.Engine:
         """The default :class:`~sqlalchemy.engine.Engine` for the current application,
@@ -766,6 +1467,96 @@ class SQLAlchemy:
 
         return value
 
+    def get_many(self, entity: type[_O], idents: t.Iterable[t.Any]) -> list[_O | None]:
+        """Get an instance for each primary key, like calling :meth:`session.get()
+        <sqlalchemy.orm.Session.get>` for each, but with at most one query. The result
+        has the same order as the keys, with ``None`` for keys that don't exist.
+
+        Instances that are already loaded in the session are used without querying.
+        The rest are selected with ``WHERE pk IN (...)``, split into multiple queries
+        if there are more keys than the database allows parameters in a statement.
+        Keys must have the same types as the column values, such as ``int`` rather
+        than ``str``.
+
+        This requires that a Flask application context is active.
+
+        :param entity: The model class to query.
+        :param idents: The primary keys to query. A model with a composite primary key
+            takes tuples or dicts, like ``session.get()``. Values are converted to the
+            primary key column's type, so strings from a request can be passed.
+
+        .. versionadded:: 3.2
+        """
+        return _get_many(self.session(), entity, idents)
+
+    def get_many_or_404(
+        self,
+        entity: type[_O],
+        idents: t.Iterable[t.Any],
+        *,
+        description: str | None = None,
+    ) -> list[_O]:
+        """Like :meth:`get_many` but aborts with a ``404 Not Found`` error if any of
+        the keys don't exist. By default, the error lists the missing keys.
+
+        This requires that a Flask application context is active.
+
+        :param entity: The model class to query.
+        :param idents: The primary keys to query.
+        :param description: A custom message to show on the error page.
+
+        .. versionadded:: 3.2
+        """
+        idents = list(idents)
+        values = self.get_many(entity, idents)
+        _abort_missing(entity, idents, values, description)
+        return t.cast("list[_O]", values)
+
+    def cached(
+        self,
+        select: sa.sql.Select[t.Any],
+        *,
+        ttl: float | None = 60,
+        tags: t.Iterable[t.Any] | None = None,
+    ) -> list[sa.Row[t.Any]]:
+        """Execute a select and return its rows, or return the rows cached from a
+        previous call with the same SQL and parameters. Uses the cache configured by
+        :data:`.SQLALCHEMY_QUERY_CACHE`.
+
+        The cached rows are invalidated when any session commits a change to one of
+        the tables in ``tags``. This includes instances that were flushed and
+        ``insert``, ``update``, or ``delete`` statements executed by the session.
+
+        The select must return columns rather than ORM instances, since instances
+        can't be shared between sessions.
+
+        .. code-block:: python
+
+            totals = db.cached(
+                db.select(Order.status, db.func.count()).group_by(Order.status),
+                ttl=300,
+            )
+
+        This requires that a Flask application context is active.
+
+        :param select: The ``select`` statement to execute.
+        :param ttl: The number of seconds to cache the rows, or ``None`` to cache them
+            until they are invalidated.
+        :param tags: Models, tables, or table names to invalidate the rows for. A name
+            is a table in the same database as the select. Defaults to the tables that
+            the select reads from.
+
+        .. versionadded:: 3.2
+        """
+        cache = self._query_cache
+
+        if cache is None:
+            raise RuntimeError(
+                "The query cache is not enabled. Set 'SQLALCHEMY_QUERY_CACHE' config."
+            )
+
+        return _cached_query(self.session(), cache, select, ttl, tags)
+
     def first_or_404(
         self, statement: sa.sql.Select[t.Any], *, description: str | None = None
     ) -> t.Any:
@@ -809,7 +1600,8 @@ class SQLAlchemy:
         per_page: int | None = None,
         max_per_page: int | None = None,
         error_out: bool = True,
-        count: bool = True,
+        count: bool | str | CountStrategy = True,
+        concurrent: bool = False,
     ) -> Pagination:
         """Apply an offset and limit to a select statment based on the current page and
         number of items per page, returning a :class:`.Pagination` object.
@@ -831,7 +1623,19 @@ class SQLAlchemy:
             either are not ints.
         :param count: Calculate the total number of values by issuing an extra count
             query. For very complex queries this may be inaccurate or slow, so it can be
-            disabled and set manually if necessary.
+            disabled and set manually if necessary. Can also be a
+            :class:`.CountStrategy`, or one of the strings ``"exact"``,
+            ``"estimate"``, or ``"has_more"``.
+        :param concurrent: Count the total in a worker thread using a separate
+            connection, at the same time as querying the items. The count will not see
+            uncommitted changes in the session, so only use this for read-only views.
+
+        .. versionchanged:: 3.2
+            Added the ``concurrent`` parameter.
+
+        .. versionchanged:: 3.2
+            ``count`` can be a :class:`.CountStrategy` or the name of a built-in
+            strategy.
 
         .. versionchanged:: 3.0
             The ``count`` query is more efficient.
@@ -846,10 +1650,250 @@ class SQLAlchemy:
             max_per_page=max_per_page,
             error_out=error_out,
             count=count,
+            concurrent=concurrent,
+        )
+
+    def keyset_paginate(
+        self,
+        select: sa.sql.Select[t.Any],
+        *,
+        cursor: str | None = None,
+        per_page: int | None = None,
+        max_per_page: int | None = None,
+        error_out: bool = True,
+    ) -> KeysetPagination:
+        """Filter an ordered select statement based on the sort key values of the last
+        item on the previous page, returning a :class:`.KeysetPagination` object.
+
+        Unlike :meth:`paginate`, this does not use an offset, so the database does not
+        need to scan and discard all the rows before the requested page. The cost of
+        each page stays the same no matter how deep it is. Pages are selected with an
+        opaque cursor rather than a page number, and the total is not counted.
+
+        The statement must select a model class and be ordered by columns that
+        uniquely identify each row, like
+        ``select(User).order_by(User.created, User.id)``. All the sort columns must
+        be in the same direction.
+
+        :param select: The ordered ``select`` statement to paginate.
+        :param cursor: The :attr:`~.KeysetPagination.next_cursor` or
+            :attr:`~.KeysetPagination.prev_cursor` value from another page. Defaults to
+            the ``cursor`` query arg during a request, or the first page otherwise.
+        :param per_page: The maximum number of items on a page. Defaults to the
+            ``per_page`` query arg during a request, or 20 otherwise.
+        :param max_per_page: The maximum allowed value for ``per_page``, to limit a
+            user-provided value. Use ``None`` for no limit. Defaults to 100.
+        :param error_out: Abort with a ``404 Not Found`` error if the cursor is not
+            valid, or if ``per_page`` is less than 1 or not an int.
+
+        .. versionadded:: 3.2
+        """
+        return SelectKeysetPagination(
+            select=select,
+            session=self.session(),
+            cursor=cursor,
+            per_page=per_page,
+            max_per_page=max_per_page,
+            error_out=error_out,
+        )
+
+    def stream(
+        self,
+        select: sa.sql.Select[t.Any],
+        *,
+        chunk_size: int = 1000,
+        scalars: bool = True,
+    ) -> t.Generator[t.Any, None, None]:
+        """Iterate over the results of a select statement without loading them all
+        into memory. Rows are fetched ``chunk_size`` at a time using
+        :ref:`yield_per <sqlalchemy:orm_queryguide_yield_per>`, which uses a server side
+        cursor if the database driver supports it. Once a chunk has been processed,
+        its ORM objects are removed from the session so that they can be freed.
+
+        .. code-block:: python
+
+            for user in db.stream(db.select(User).order_by(User.id)):
+                writer.writerow([user.id, user.username])
+
+        Objects are detached from the session after the next chunk is requested, so
+        changes to them are not saved unless they are added to the session again.
+        Loader options that load collections with a join are not supported, use
+        :func:`~sqlalchemy.orm.selectinload` instead.
+
+        The connection stays checked out until the iterator is exhausted or closed.
+
+        This requires that a Flask application context is active.
+
+        :param select: The ``select`` statement to execute.
+        :param chunk_size: The number of rows to fetch at a time.
+        :param scalars: Yield the first column of each row, such as a model object.
+            Set to ``False`` to yield each :class:`~sqlalchemy.engine.Row` instead.
+
+        .. versionadded:: 3.2
+        """
+        return _stream(self.session(), select, chunk_size, scalars)
+
+    def iter_chunks(
+        self,
+        model: type[t.Any],
+        *,
+        chunk_size: int = 1000,
+        where: sa.ColumnElement[bool] | None = None,
+        process: t.Callable[[list[t.Any]], t.Any] | None = None,
+        workers: int | None = None,
+    ) -> t.Generator[t.Any, None, None]:
+        """Walk every row of a model's table in chunks, for batch jobs that load or
+        modify a whole table. Chunks are selected in primary key order using
+        ``WHERE pk > last ORDER BY pk LIMIT chunk_size``, which stays fast for later
+        chunks, unlike an offset.
+
+        Each chunk is loaded in its own new session, not :attr:`session`, which is
+        committed once the chunk has been processed and then closed. This keeps the
+        identity map small and avoids holding locks or a cursor open for the whole
+        job. Chunks are read from the primary engine, not a replica.
+
+        .. code-block:: python
+
+            for users in db.iter_chunks(User, where=User.active == False):
+                for user in users:
+                    user.archived = True
+
+        Pass a ``process`` function to call with each chunk instead, the iterator
+        yields its return values. With ``workers``, chunks are processed that many at a
+        time in worker threads, each using its own session.
+
+        .. code-block:: python
+
+            def archive(users):
+                for user in users:
+                    user.archived = True
+
+                return len(users)
+
+            total = sum(db.iter_chunks(User, process=archive, workers=4))
+
+        If iteration stops early, or an error is raised, the current chunk's session
+        is rolled back. Chunks that were already committed are not. Don't change the
+        primary key of rows while iterating, or they may be visited again.
+
+        This requires that a Flask application context is active.
+
+        :param model: The model class to iterate over.
+        :param chunk_size: The number of rows in each chunk.
+        :param where: A condition to filter rows by.
+        :param process: Called with each chunk, a list of model objects, before the
+            chunk is committed. The iterator yields the return values, in order.
+        :param workers: Process this many chunks at a time in worker threads.
+            Requires ``process``.
+
+        .. versionadded:: 3.2
+        """
+        return _iter_chunks(
+            self.session.session_factory,
+            model,
+            chunk_size,
+            where,
+            process,
+            workers,
+        )
+
+    def bulk_insert(
+        self,
+        model: type[t.Any],
+        rows: t.Iterable[dict[str, t.Any]],
+        *,
+        batch_size: int = 1000,
+        return_keys: bool = False,
+    ) -> list[sa.Row[t.Any]] | None:
+        """Insert many rows for a model, much faster than adding model instances to
+        the session. Each batch of rows is inserted with SQLAlchemy's ORM bulk insert,
+        which uses as few ``INSERT`` statements as the database allows. The rows are
+        not added to the session as instances.
+
+        The model's bind key chooses the engine. Rows for a sharded model are inserted
+        into the shard chosen by each row's shard key.
+
+        .. code-block:: python
+
+            db.bulk_insert(User, ({"name": name} for name in names))
+            db.session.commit()
+
+        The rows are inserted in the current transaction. Commit the session after.
+
+        This requires that a Flask application context is active.
+
+        :param model: The model class to insert rows for.
+        :param rows: Dicts of model attribute names and values. This can be an
+            iterator, which is consumed one batch at a time.
+        :param batch_size: The number of rows to insert at a time.
+        :param return_keys: Return the primary key of each inserted row, in the same
+            order as ``rows``, as a list of :class:`~sqlalchemy.engine.Row`. The
+            database must support ``RETURNING``.
+
+        .. versionadded:: 3.2
+        """
+        return _bulk_write(
+            self,
+            self.session(),
+            model,
+            rows,
+            _insert_statement,
+            batch_size,
+            return_keys,
+        )
+
+    def bulk_upsert(
+        self,
+        model: type[t.Any],
+        rows: t.Iterable[dict[str, t.Any]],
+        *,
+        conflict_cols: t.Sequence[str],
+        update_cols: t.Sequence[str] | None = None,
+        batch_size: int = 1000,
+        return_keys: bool = False,
+    ) -> list[sa.Row[t.Any]] | None:
+        """Insert many rows for a model, updating rows that already exist. This works
+        like :meth:`bulk_insert`, but uses ``INSERT ... ON CONFLICT DO UPDATE`` for
+        PostgreSQL and SQLite, and ``INSERT ... ON DUPLICATE KEY UPDATE`` for MySQL and
+        MariaDB. Other databases are not supported.
+
+        .. code-block:: python
+
+            db.bulk_upsert(Product, rows, conflict_cols=["sku"])
+            db.session.commit()
+
+        This requires that a Flask application context is active.
+
+        :param model: The model class to insert rows for.
+        :param rows: Dicts of model attribute names and values. This can be an
+            iterator, which is consumed one batch at a time.
+        :param conflict_cols: The attributes of a primary key or unique constraint that
+            identify an existing row. MySQL ignores this and checks every unique
+            constraint.
+        :param update_cols: The attributes to update for an existing row. Defaults to
+            every attribute in the rows except ``conflict_cols``. If empty, existing
+            rows are left unchanged.
+        :param batch_size: The number of rows to insert at a time.
+        :param return_keys: Return the primary key of each inserted or updated row, in
+            the same order as ``rows``. The database must support ``RETURNING``.
+
+        .. versionadded:: 3.2
+        """
+        return _bulk_write(
+            self,
+            self.session(),
+            model,
+            rows,
+            _upsert_statement(conflict_cols, update_cols),
+            batch_size,
+            return_keys,
         )
 
     def _call_for_binds(
-        self, bind_key: str | None | list[str | None], op_name: str
+        self,
+        bind_key: str | None | list[str | None],
+        op_name: str,
+        parallel: bool = False,
     ) -> None:
         """Call a method on each metadata.
 
@@ -857,10 +1901,62 @@ class SQLAlchemy:
 
         :param bind_key: A bind key or list of keys. Defaults to all binds.
         :param op_name: The name of the method to call.
+        :param parallel: Call the method for each bind in a separate thread, and
+            raise a :exc:`.BindOperationError` with every error after all binds are
+            done.
+
+        .. versionchanged:: 3.2
+            Added the ``parallel`` parameter.
 
         .. versionchanged:: 3.0
             Renamed from ``_execute_for_all_tables``.
         """
+        ops = self._bind_operations(bind_key, op_name)
+
+        if not parallel or len(ops) < 2:
+            for op in ops.values():
+                op()
+
+            return
+
+        errors: dict[str | None, Exception] = {}
+
+        with ThreadPoolExecutor(
+            len(ops), thread_name_prefix="flask_sqlalchemy"
+        ) as executor:
+            futures = {
+                key: executor.submit(contextvars.copy_context().run, op)
+                for key, op in ops.items()
+            }
+
+            for key, future in futures.items():
+                error = future.exception()
+
+                if isinstance(error, Exception):
+                    errors[key] = error
+                elif error is not None:
+                    raise error
+
+        if errors:
+            raise BindOperationError(errors)
+
+    def _bind_operations(
+        self, bind_key: str | None | list[str | None], op_name: str
+    ) -> dict[str | None, t.Callable[[], t.Any]]:
+        """Get the metadata method to call for each bind, with the engine already
+        chosen, or the reflection cache's method for ``reflect``. Engines are created
+        and bind keys are validated here, before any operation runs.
+
+        A shard's bind can have its own models as well as the sharded tables, so each
+        key maps to one callable that calls every operation for that engine in order.
+
+        :meta private:
+
+        :param bind_key: A bind key or list of keys. Defaults to all binds.
+        :param op_name: The name of the method to call.
+
+        .. versionadded:: 3.2
+        """
         if bind_key == "__all__":
             keys: list[str | None] = list(self.metadatas)
         elif bind_key is None or isinstance(bind_key, str):
@@ -868,7 +1964,42 @@ class SQLAlchemy:
         else:
             keys = bind_key
 
+        shards = self._shards
+        reflect_cache = None
+
+        if op_name == "reflect":
+            app = current_app._get_current_object()  # type: ignore[attr-defined]
+            reflect_cache = self._app_reflect_cache.get(app)
+
+        ops: dict[str | None, list[t.Callable[[], t.Any]]] = {}
+
         for key in keys:
+            if key in shards:
+                method = getattr(self.metadatas[key], op_name)
+
+                if reflect_cache is not None:
+                    # Every shard has the same tables, only the first is reflected.
+                    op = functools.partial(
+                        reflect_cache.reflect,
+                        self.metadatas[key],
+                        key,
+                        self.engines[shards[key][0]],
+                    )
+                    ops.setdefault(key, []).append(op)
+                elif op_name == "reflect":
+                    # Reflecting modifies the metadata, which is shared by every
+                    # shard, so the shards are reflected one after another.
+                    engines = [self.engines[shard_id] for shard_id in shards[key]]
+                    op = functools.partial(_call_each, method, engines)
+                    ops.setdefault(key, []).append(op)
+                else:
+                    # Sharded tables are created in every shard.
+                    for shard_id in shards[key]:
+                        op = functools.partial(method, bind=self.engines[shard_id])
+                        ops.setdefault(shard_id, []).append(op)
+
+                continue
+
             try:
                 engine = self.engines[key]
             except KeyError:
@@ -879,10 +2010,25 @@ class SQLAlchemy:
 
                 raise sa_exc.UnboundExecutionError(message) from None
 
-            metadata = self.metadatas[key]
-            getattr(metadata, op_name)(bind=engine)
+            if reflect_cache is not None:
+                op = functools.partial(
+                    reflect_cache.reflect, self.metadatas[key], key, engine
+                )
+            else:
+                method = getattr(self.metadatas[key], op_name)
+                op = functools.partial(method, bind=engine)
+
+            ops.setdefault(key, []).append(op)
 
-    def create_all(self, bind_key: str | None | list[str | None] = "__all__") -> None:
+        return {
+            key: functools.partial(_call_all, key_ops) for key, key_ops in ops.items()
+        }
+
+    def create_all(
+        self,
+        bind_key: str | None | list[str | None] = "__all__",
+        parallel: bool = False,
+    ) -> None:
         """Create tables that do not exist in the database by calling
         ``metadata.create_all()`` for all or some bind keys. This does not
         update existing tables, use a migration library for that.
@@ -891,6 +2037,12 @@ class SQLAlchemy:
 
         :param bind_key: A bind key or list of keys to create the tables for. Defaults
             to all binds.
+        :param parallel: Run the operation for each bind at the same time in separate
+            threads. If any fail, a :exc:`.BindOperationError` is raised with each
+            bind's error after every bind is done.
+
+        .. versionchanged:: 3.2
+            Added the ``parallel`` parameter.
 
         .. versionchanged:: 3.0
             Renamed the ``bind`` parameter to ``bind_key``. Removed the ``app``
@@ -899,15 +2051,25 @@ class SQLAlchemy:
         .. versionchanged:: 0.12
             Added the ``bind`` and ``app`` parameters.
         """
-        self._call_for_binds(bind_key, "create_all")
+        self._call_for_binds(bind_key, "create_all", parallel)
 
-    def drop_all(self, bind_key: str | None | list[str | None] = "__all__") -> None:
+    def drop_all(
+        self,
+        bind_key: str | None | list[str | None] = "__all__",
+        parallel: bool = False,
+    ) -> None:
         """Drop tables by calling ``metadata.drop_all()`` for all or some bind keys.
 
         This requires that a Flask application context is active.
 
         :param bind_key: A bind key or list of keys to drop the tables from. Defaults to
             all binds.
+        :param parallel: Run the operation for each bind at the same time in separate
+            threads. If any fail, a :exc:`.BindOperationError` is raised with each
+            bind's error after every bind is done.
+
+        .. versionchanged:: 3.2
+            Added the ``parallel`` parameter.
 
         .. versionchanged:: 3.0
             Renamed the ``bind`` parameter to ``bind_key``. Removed the ``app``
@@ -916,16 +2078,31 @@ class SQLAlchemy:
         .. versionchanged:: 0.12
             Added the ``bind`` and ``app`` parameters.
         """
-        self._call_for_binds(bind_key, "drop_all")
+        self._call_for_binds(bind_key, "drop_all", parallel)
 
-    def reflect(self, bind_key: str | None | list[str | None] = "__all__") -> None:
+    def reflect(
+        self,
+        bind_key: str | None | list[str | None] = "__all__",
+        parallel: bool = False,
+    ) -> None:
         """Load table definitions from the database by calling ``metadata.reflect()``
         for all or some bind keys.
 
+        If :data:`.SQLALCHEMY_REFLECT_CACHE` is set, the tables are loaded from a file
+        saved by a previous reflection instead, if it is still valid. Run
+        ``flask sqlalchemy reflect`` to refresh the files.
+
         This requires that a Flask application context is active.
 
         :param bind_key: A bind key or list of keys to reflect the tables from. Defaults
             to all binds.
+        :param parallel: Run the operation for each bind at the same time in separate
+            threads. If any fail, a :exc:`.BindOperationError` is raised with each
+            bind's error after every bind is done.
+
+        .. versionchanged:: 3.2
+            Added the ``parallel`` parameter, and support for
+            :data:`.SQLALCHEMY_REFLECT_CACHE`.
 
         .. versionchanged:: 3.0
             Renamed the ``bind`` parameter to ``bind_key``. Removed the ``app``
@@ -934,7 +2111,7 @@ class SQLAlchemy:
         .. versionchanged:: 0.12
             Added the ``bind`` and ``app`` parameters.
         """
-        self._call_for_binds(bind_key, "reflect")
+        self._call_for_binds(bind_key, "reflect", parallel)
 
     def _set_rel_query(self, kwargs: dict[str, t.Any]) -> None:
         """Apply the extension's :attr:`Query` class as the default for relationships
@@ -1008,3 +2185,50 @@ class SQLAlchemy:
                 return getattr(mod, name)
 
         raise AttributeError(name)
+
+
+def _abort_missing(
+    entity: type[t.Any],
+    idents: list[t.Any],
+    values: list[t.Any],
+    description: str | None,
+) -> None:
+    """Abort with a 404 error that lists the keys that did not find an instance."""
+    missing = [ident for ident, value in zip(idents, values) if value is None]
+
+    if not missing:
+        return
+
+    if description is None:
+        keys = ", ".join(repr(ident) for ident in missing)
+        description = f"No '{entity.__name__}' with primary key {keys}."
+
+    abort(404, description=description)
+
+
+def _call_all(ops: list[t.Callable[[], t.Any]]) -> None:
+    for op in ops:
+        op()
+
+
+def _call_each(method: t.Callable[..., t.Any], engines: list[sa.engine.Engine]) -> None:
+    for engine in engines:
+        method(bind=engine)
+
+
+_fork_instances: weakref.WeakSet[SQLAlchemy] = weakref.WeakSet()
+"""Every extension instance, so that engines can be reset when the process forks."""
+
+
+def _before_fork() -> None:
+    for db in list(_fork_instances):
+        db._before_fork()
+
+
+def _after_fork_in_child() -> None:
+    for db in list(_fork_instances):
+        db._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_before_fork, after_in_child=_after_fork_in_child)
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+import typing as t
+from time import perf_counter
+
+import sqlalchemy as sa
+import sqlalchemy.event as sa_event
+
+
+@dataclasses.dataclass
+class EngineHealth:
+    """The result of the most recent health check of an engine. Returned by
+    :attr:`.SQLAlchemy.engine_health` and :meth:`.SQLAlchemy.check_health`. Times are
+    in seconds.
+
+    .. versionadded:: 3.2
+    """
+
+    bind_key: str | None
+    """The bind key of the engine."""
+
+    engine: sa.engine.Engine
+    """The engine that was checked."""
+
+    replica: bool
+    """Whether the engine is a read replica."""
+
+    healthy: bool = True
+    """Whether the engine can be used. Unhealthy replicas are skipped when choosing a
+    replica for a session.
+    """
+
+    latency: float | None = None
+    """How long the ping took, or ``None`` if it failed or has not run yet."""
+
+    lag: float | None = None
+    """How far the replica is behind the primary, if it could be determined. Only
+    checked for PostgreSQL and MySQL replicas.
+    """
+
+    error: BaseException | None = None
+    """The error that made the engine unhealthy, if any."""
+
+    checked: float | None = None
+    """The time of the check, from :func:`time.time`, or ``None`` if it has not run
+    yet.
+    """
+
+
+class _HealthChecker:
+    """Pings engines, tracking which are healthy. If an interval is given, a daemon
+    thread checks them repeatedly, and a disconnect error while executing a query marks
+    the engine unhealthy until the next check. Engines are registered with :meth:`add`
+    as they are created.
+
+    :param interval: Seconds between checks, or ``None`` to only check on demand.
+    :param max_lag: Replicas behind the primary by more than this many seconds are
+        unhealthy.
+    """
+
+    def __init__(
+        self, interval: float | None = None, max_lag: float | None = None
+    ) -> None:
+        self.interval = interval
+        self.max_lag = max_lag
+        self.status: dict[sa.engine.Engine, EngineHealth] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def add(
+        self, bind_key: str | None, engine: sa.engine.Engine, replica: bool
+    ) -> None:
+        """Start tracking an engine.
+
+        :param bind_key: The bind key of the engine.
+        :param engine: The engine to check.
+        :param replica: Whether the engine is a read replica.
+        """
+        self.status[engine] = EngineHealth(bind_key, engine, replica)
+
+        if self.interval is not None:
+            sa_event.listen(engine, "handle_error", self._handle_error)
+
+    def is_healthy(self, engine: sa.engine.Engine) -> bool:
+        """Whether the engine is healthy. Engines that are not tracked are treated as
+        healthy.
+        """
+        health = self.status.get(engine)
+        return health is None or health.healthy
+
+    def check(self) -> list[EngineHealth]:
+        """Check every engine now, and return the new status of each."""
+        out = []
+
+        for engine, health in list(self.status.items()):
+            health = self.status[engine] = self._check_engine(health)
+            out.append(health)
+
+        return out
+
+    def _check_engine(self, previous: EngineHealth) -> EngineHealth:
+        engine = previous.engine
+        health = EngineHealth(previous.bind_key, engine, previous.replica)
+        health.checked = time.time()
+        start = perf_counter()
+
+        try:
+            with engine.connect() as conn:
+                try:
+                    dbapi_connection = conn.connection.dbapi_connection
+                    engine.dialect.do_ping(dbapi_connection)  # type: ignore[arg-type]
+                except Exception:
+                    # Discard the connection so the pool doesn't reuse it.
+                    conn.invalidate()
+                    raise
+
+                health.latency = perf_counter() - start
+
+                if health.replica:
+                    health.lag = _replication_lag(conn)
+        except Exception as e:
+            health.healthy = False
+            health.latency = None
+            health.error = e
+            return health
+
+        if (
+            self.max_lag is not None
+            and health.lag is not None
+            and health.lag > self.max_lag
+        ):
+            health.healthy = False
+
+        return health
+
+    def _handle_error(self, context: sa.engine.ExceptionContext) -> None:
+        """Mark the engine unhealthy as soon as a query sees that it is disconnected,
+        rather than waiting for the next check.
+        """
+        if not context.is_disconnect:
+            return
+
+        engine = context.engine
+
+        if engine is None or engine not in self.status:
+            return
+
+        previous = self.status[engine]
+        self.status[engine] = dataclasses.replace(
+            previous,
+            healthy=False,
+            latency=None,
+            error=context.original_exception,
+            checked=time.time(),
+        )
+
+    def start(self) -> None:
+        """Start checking engines in a daemon thread, if an interval is set."""
+        if self.interval is None or self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="flask-sqlalchemy-health-check", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread, if it is running."""
+        thread = self._thread
+
+        if thread is None:
+            return
+
+        self._stop.set()
+        thread.join()
+        self._thread = None
+
+        for engine in list(self.status):
+            sa_event.remove(engine, "handle_error", self._handle_error)
+
+    def _restart_after_fork(self) -> None:
+        """Start a new background thread in a forked child process, since the parent's
+        thread does not exist in the child.
+        """
+        if self._thread is None:
+            return
+
+        self._thread = None
+        self._stop = threading.Event()
+        self.start()
+
+    def _run(self) -> None:
+        interval = t.cast(float, self.interval)
+
+        while True:
+            self.check()
+
+            if self._stop.wait(interval):
+                break
+
+
+def _replication_lag(conn: sa.engine.Connection) -> float | None:
+    """Query how far a PostgreSQL or MySQL replica is behind its primary, in seconds.
+    Returns ``None`` for other databases, or if the server is not a replica.
+    """
+    name = conn.dialect.name
+
+    if name == "postgresql":
+        value = conn.exec_driver_sql(
+            "SELECT CASE WHEN pg_is_in_recovery() THEN"
+            " EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+        ).scalar()
+    elif name in {"mysql", "mariadb"}:
+        row = conn.exec_driver_sql("SHOW REPLICA STATUS").mappings().first()
+
+        if row is None:
+            return None
+
+        value = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+    else:
+        return None
+
+    if value is None:
+        return None
+
+    return float(value)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import typing as t
+
+import sqlalchemy as sa
+import sqlalchemy.exc as sa_exc
+import sqlalchemy.orm as sa_orm
+
+# The most bound parameters to use in one statement for each dialect. Other dialects
+# use the lowest common limit.
+_max_params = {
+    "postgresql": 30000,
+    "mysql": 30000,
+    "mariadb": 30000,
+    "mssql": 2000,
+    "oracle": 1000,
+}
+
+
+def _get_many(
+    session: sa_orm.Session, entity: type[t.Any], idents: t.Iterable[t.Any]
+) -> list[t.Any]:
+    """Get an instance for each primary key, in the same order, or ``None`` if it
+    doesn't exist. Instances already in the session's identity map are used without a
+    query. The rest are selected with ``WHERE pk IN (...)``, split into multiple
+    queries if there are more keys than the dialect allows parameters.
+
+    :param session: The session to query with.
+    :param entity: The model class to query.
+    :param idents: Primary keys in any format accepted by ``session.get``.
+    """
+    mapper: sa_orm.Mapper[t.Any] = sa.inspect(entity)
+    keys = [_coerce_key(mapper, _identity_tuple(mapper, ident)) for ident in idents]
+    found: dict[tuple[t.Any, ...] | None, t.Any] = {}
+    missing = []
+    deleted = session.deleted
+
+    for key in dict.fromkeys(keys):
+        if key is None:
+            continue
+
+        obj = session.identity_map.get(mapper.identity_key_from_primary_key(key))
+
+        if (
+            obj is not None
+            and isinstance(obj, entity)
+            and not sa.inspect(obj).expired
+            and obj not in deleted
+        ):
+            found[key] = obj
+        else:
+            missing.append(key)
+
+    if missing:
+        pk = mapper.primary_key
+        column = pk[0] if len(pk) == 1 else sa.tuple_(*pk)
+
+        try:
+            name = session.get_bind(mapper).dialect.name
+        except sa_exc.UnboundExecutionError:
+            # A sharded model is queried on every shard.
+            name = ""
+
+        size = max(_max_params.get(name, 999) // len(pk), 1)
+
+        for i in range(0, len(missing), size):
+            chunk = missing[i : i + size]
+            values = [key[0] for key in chunk] if len(pk) == 1 else chunk
+            select = sa.select(entity).where(column.in_(values))
+
+            for obj in session.scalars(select):
+                found[tuple(mapper.primary_key_from_instance(obj))] = obj
+
+    return [found.get(key) for key in keys]
+
+
+def _coerce_key(
+    mapper: sa_orm.Mapper[t.Any], key: tuple[t.Any, ...]
+) -> tuple[t.Any, ...] | None:
+    """Convert each value of a primary key to its column's Python type, so that a
+    value such as ``"1"`` from a request matches the loaded instance's ``1``. Returns
+    ``None`` if a value can't be converted, since no row can have that key.
+    """
+    out = []
+
+    for column, value in zip(mapper.primary_key, key):
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            python_type = None
+
+        if python_type is not None and not isinstance(value, python_type):
+            try:
+                value = python_type(value)
+            except (TypeError, ValueError):
+                return None
+
+        out.append(value)
+
+    return tuple(out)
+
+
+def _identity_tuple(mapper: sa_orm.Mapper[t.Any], ident: t.Any) -> tuple[t.Any, ...]:
+    """Convert a primary key given as a single value, a tuple, or a dict of attribute
+    names to a tuple in the order of the mapper's primary key columns.
+    """
+    pk = mapper.primary_key
+
+    if isinstance(ident, dict):
+        props = [mapper.get_property_by_column(c) for c in pk]
+
+        try:
+            return tuple(ident[prop.key] for prop in props)
+        except KeyError as e:
+            raise sa_exc.InvalidRequestError(
+                f"Missing primary key attribute '{e.args[0]}' in {ident!r}."
+            ) from None
+
+    if isinstance(ident, (tuple, list)):
+        key = tuple(ident)
+    else:
+        key = (ident,)
+
+    if len(key) != len(pk):
+        raise sa_exc.InvalidRequestError(
+            f"Incorrect number of values in primary key {ident!r}. Expected"
+            f" {len(pk)}, got {len(key)}."
+        )
+
+    return key
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import copy
+import threading
+import typing as t
+import uuid
+from collections import OrderedDict
+from time import monotonic
+
+import sqlalchemy as sa
+import sqlalchemy.orm as sa_orm
+
+from .loading import _identity_tuple
+
+if t.TYPE_CHECKING:
+    from .session import Session
+
+_keys_info = "_fsa_model_cache_keys"
+_tables_info = "_fsa_model_cache_tables"
+
+
+class CacheBackend:
+    """The interface for storing cached values, used by
+    :data:`.SQLALCHEMY_MODEL_CACHE` and :data:`.SQLALCHEMY_QUERY_CACHE`. Subclass this
+    and implement each method to use a store that is shared between processes, such as
+    Redis or Memcached.
+
+    Keys are strings. Values are dicts of column values, lists of rows, or strings,
+    which a shared store will need to serialize, for example with :mod:`pickle`.
+
+    .. versionadded:: 3.2
+    """
+
+    def get(self, key: str) -> t.Any | None:
+        """Get the value for a key, or ``None`` if it is not cached or has expired.
+
+        :param key: The key to get.
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: t.Any, ttl: float | None) -> None:
+        """Store a value for a key.
+
+        :param key: The key to set.
+        :param value: The value to store.
+        :param ttl: The number of seconds until the value expires, or ``None`` for no
+            expiration.
+        """
+        raise NotImplementedError
+
+    def delete(self, keys: t.Collection[str]) -> None:
+        """Remove the values for some keys, if they are cached.
+
+        :param keys: The keys to remove.
+        """
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """Cache values in memory for the current process. Used if
+    :data:`.SQLALCHEMY_MODEL_CACHE` or :data:`.SQLALCHEMY_QUERY_CACHE` is ``True``.
+
+    Changes are only invalidated in the process that made them. With multiple
+    processes, others may see an old value until it expires.
+
+    :param maxsize: The maximum number of values to cache. The least recently used
+        value is discarded when the cache is full.
+
+    .. versionadded:: 3.2
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._cache: OrderedDict[str, tuple[float | None, t.Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> t.Any | None:
+        with self._lock:
+            entry = self._cache.get(key)
+
+            if entry is None:
+                return None
+
+            if entry[0] is not None and entry[0] <= monotonic():
+                del self._cache[key]
+                return None
+
+            self._cache.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: t.Any, ttl: float | None) -> None:
+        expires = None if ttl is None else monotonic() + ttl
+
+        with self._lock:
+            self._cache[key] = (expires, value)
+            self._cache.move_to_end(key)
+
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+    def delete(self, keys: t.Collection[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        with self._lock:
+            self._cache.clear()
+
+
+def _cached_get(
+    session: Session,
+    cache: CacheBackend,
+    mapper: sa_orm.Mapper[t.Any],
+    ident: t.Any,
+    get: t.Callable[[t.Any, t.Any], t.Any],
+) -> t.Any:
+    """Get an instance of a model with ``__cache__`` from the identity map, then the
+    cache, then the database. An instance loaded from the database is cached, unless
+    the session has written changes that may not be committed.
+
+    :param session: The session to get the instance in.
+    :param cache: The cache backend.
+    :param mapper: The mapper of the model to get.
+    :param ident: The primary key to get.
+    :param get: The session's original ``get`` method.
+    """
+    key = _identity_tuple(mapper, ident)
+
+    if session.identity_map.get(mapper.identity_key_from_primary_key(key)) is not None:
+        return get(mapper.class_, ident)
+
+    cache_key = _cache_key(cache, mapper, key)
+    values = cache.get(cache_key)
+
+    if values is not None:
+        obj = mapper.class_manager.new_instance()
+
+        # Copy the values so that changing a mutable value, such as JSON, in place
+        # doesn't change the cached value for other sessions.
+        for name, value in copy.deepcopy(values).items():
+            sa_orm.attributes.set_committed_value(  # type: ignore[no-untyped-call]
+                obj, name, value
+            )
+
+        sa_orm.make_transient_to_detached(obj)
+        return session.merge(obj, load=False)
+
+    obj = get(mapper.class_, ident)
+
+    # Subclasses with polymorphic loading are not cached, since their values would
+    # be restored as the base class.
+    if obj is not None and type(obj) is mapper.class_ and not session._fsa_wrote:
+        state = sa.inspect(obj)
+        values = copy.deepcopy(
+            {
+                attr.key: state.dict[attr.key]
+                for attr in mapper.column_attrs
+                if attr.key in state.dict
+            }
+        )
+        cache.set(cache_key, values, mapper.class_.__cache__.get("ttl"))
+
+    return obj
+
+
+def _cache_key(
+    cache: CacheBackend, mapper: sa_orm.Mapper[t.Any], key: tuple[t.Any, ...]
+) -> str:
+    """The key for an instance's values. It includes the current version of each of
+    the model's tables. Executing an ``insert``, ``update``, or ``delete`` replaces the
+    table's version, so values cached with the previous version are never used again,
+    and expire on their own.
+    """
+    table = t.cast(sa.Table, mapper.local_table)
+    bind_key = table.metadata.info.get("bind_key")
+    versions = []
+
+    for name in sorted({tbl.fullname for tbl in mapper.tables}):
+        version_key = _version_key(bind_key, name)
+        version = cache.get(version_key)
+
+        if version is None:
+            # The version was never set or was evicted. Start a new one, so that
+            # values cached with an old version are not used.
+            version = uuid.uuid4().hex
+            cache.set(version_key, version, None)
+
+        versions.append(version)
+
+    return f"flask_sqlalchemy:{bind_key}:{table.fullname}:{key!r}:{':'.join(versions)}"
+
+
+def _version_key(bind_key: str | None, name: str) -> str:
+    return f"flask_sqlalchemy:version:{bind_key}:{name}"
+
+
+def _invalidate_tables(
+    cache: CacheBackend, tables: t.Iterable[tuple[str | None, str]]
+) -> None:
+    for bind_key, name in tables:
+        cache.set(_version_key(bind_key, name), uuid.uuid4().hex, None)
+
+
+def _invalidate_flushed(session: Session, flush_context: t.Any) -> None:
+    """Remove cached values for instances of models with ``__cache__`` that were
+    inserted, updated, or deleted. The keys are removed again after the commit, in case
+    another session cached the old value in between.
+    """
+    cache = session._fsa_model_cache
+
+    if cache is None:
+        return
+
+    keys = set()
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        mapper = sa.inspect(obj).mapper
+
+        if getattr(mapper.class_, "__cache__", None) is None:
+            continue
+
+        key = tuple(mapper.primary_key_from_instance(obj))
+        keys.add(_cache_key(cache, mapper, key))
+
+    if keys:
+        cache.delete(keys)
+        session.info.setdefault(_keys_info, set()).update(keys)
+
+
+def _invalidate_executed(orm_context: sa_orm.ORMExecuteState) -> None:
+    """Invalidate every cached value for the table of an ``insert``, ``update``, or
+    ``delete`` statement executed by the session, such as a bulk insert or upsert. It is
+    invalidated again after the commit, in case another session cached the old value in
+    between.
+    """
+    statement = orm_context.statement
+
+    if not isinstance(statement, sa.sql.dml.UpdateBase):
+        return
+
+    session = t.cast("Session", orm_context.session)
+    cache = session._fsa_model_cache
+
+    if cache is None or not isinstance(statement.table, sa.Table):
+        return
+
+    table = (statement.table.metadata.info.get("bind_key"), statement.table.fullname)
+    _invalidate_tables(cache, [table])
+    session.info.setdefault(_tables_info, set()).add(table)
+
+
+def _invalidate_committed(session: Session) -> None:
+    keys = session.info.pop(_keys_info, None)
+    tables = session.info.pop(_tables_info, None)
+    cache = session._fsa_model_cache
+
+    if cache is None:
+        return
+
+    if keys:
+        cache.delete(keys)
+
+    if tables:
+        _invalidate_tables(cache, tables)
+
+
+def _discard_keys(session: Session, *args: t.Any) -> None:
+    session.info.pop(_keys_info, None)
+    session.info.pop(_tables_info, None)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+import inspect
+import typing as t
+
+from flask import g
+
+
+class _Override:
+    """Set a value in :data:`flask.g` for the current app context, restoring the
+    previous value afterwards. Can be used as a decorator, including on async views,
+    or a ``with`` block. Returned by methods such as :meth:`.SQLAlchemy.query_budget`.
+
+    :param name: The attribute to set on ``g``.
+    :param value: The value to set.
+    """
+
+    def __init__(self, name: str, value: t.Any) -> None:
+        self.name = name
+        self.value = value
+
+    @contextlib.contextmanager
+    def _activate(self) -> t.Iterator[None]:
+        """Set the value, and restore the previous value on exit. The previous value
+        is saved for each activation, since a decorated view is shared by concurrent
+        requests.
+        """
+        previous = g.get(self.name, _missing)
+        setattr(g, self.name, self.value)
+
+        try:
+            yield
+        finally:
+            if previous is _missing:
+                g.pop(self.name, None)
+            else:
+                setattr(g, self.name, previous)
+
+    def __enter__(self) -> None:
+        # Active blocks are kept in g, which is separate for each app context, rather
+        # than on this object, which may be shared.
+        cm = self._activate()
+        cm.__enter__()
+        g.setdefault(_active_key, []).append(cm)
+
+    def __exit__(self, *args: t.Any) -> None:
+        g.get(_active_key).pop().__exit__(*args)
+
+    def __call__(self, f: t.Callable[..., t.Any]) -> t.Callable[..., t.Any]:
+        if inspect.iscoroutinefunction(f):
+
+            @functools.wraps(f)
+            async def async_wrapper(*args: t.Any, **kwargs: t.Any) -> t.Any:
+                with self._activate():
+                    return await f(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(f)
+        def wrapper(*args: t.Any, **kwargs: t.Any) -> t.Any:
+            with self._activate():
+                return f(*args, **kwargs)
+
+        return wrapper
+
+
+_missing = object()
+_active_key = "_sqlalchemy_active_overrides"
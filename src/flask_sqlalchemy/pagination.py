@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+import base64
+import binascii
+import contextvars
+import datetime
+import decimal
+import json
+import threading
 import typing as t
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from math import ceil
+from time import monotonic
 
 import sqlalchemy as sa
+import sqlalchemy.exc as sa_exc
 import sqlalchemy.orm as sa_orm
 from flask import abort
 from flask import request
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import operators
 
 
 class Pagination:
@@ -32,10 +48,14 @@ class Pagination:
         either are not ints.
     :param count: Calculate the total number of values by issuing an extra count
         query. For very complex queries this may be inaccurate or slow, so it can be
-        disabled and set manually if necessary.
+        disabled and set manually if necessary. Can also be a :class:`CountStrategy`,
+        or one of the strings ``"exact"``, ``"estimate"``, or ``"has_more"``.
     :param kwargs: Information about the query to paginate. Different subclasses will
         require different arguments.
 
+    .. versionchanged:: 3.2
+        ``count`` can be a :class:`CountStrategy` or the name of a built-in strategy.
+
     .. versionchanged:: 3.0
         Iterating over a pagination object iterates over its items.
 
@@ -49,10 +69,11 @@ class Pagination:
         per_page: int | None = None,
         max_per_page: int | None = 100,
         error_out: bool = True,
-        count: bool = True,
+        count: bool | str | CountStrategy = True,
         **kwargs: t.Any,
     ) -> None:
         self._query_args = kwargs
+        self._count_strategy = _get_count_strategy(count)
         page, per_page = self._prepare_page_args(
             page=page,
             per_page=per_page,
@@ -69,18 +90,39 @@ class Pagination:
         self.max_per_page: int | None = max_per_page
         """The maximum allowed value for ``per_page``."""
 
-        items = self._query_items()
+        total_future: Future[int | None] | None = None
+
+        if self._count_strategy is not None and self._count_concurrently():
+            total_future = _submit(self._count_strategy.count, self)
+
+        try:
+            items = self._query_items()
+
+            if not items and page != 1 and error_out:
+                abort(404)
+        except BaseException:
+            # Don't leave the count running on a connection the request is about to
+            # clean up. Wait for it if it already started, ignoring its result.
+            if total_future is not None and not total_future.cancel():
+                wait([total_future])
+
+            raise
+
+        self._has_more: bool | None = None
 
-        if not items and page != 1 and error_out:
-            abort(404)
+        if self._count_strategy is not None and self._count_strategy.fetch_extra:
+            self._has_more = len(items) > per_page
+            items = items[:per_page]
 
         self.items: list[t.Any] = items
         """The items on the current page. Iterating over the pagination object is
         equivalent to iterating over the items.
         """
 
-        if count:
-            total = self._query_count()
+        if total_future is not None:
+            total = total_future.result()
+        elif self._count_strategy is not None:
+            total = self._count_strategy.count(self)
         else:
             total = None
 
@@ -147,6 +189,20 @@ class Pagination:
         """
         return (self.page - 1) * self.per_page
 
+    @property
+    def _query_limit(self) -> int:
+        """The number of items to query, passed to ``limit()``. This is one more than
+        :attr:`per_page` if the count strategy needs to know if there are more items.
+
+        :meta private:
+
+        .. versionadded:: 3.2
+        """
+        if self._count_strategy is not None and self._count_strategy.fetch_extra:
+            return self.per_page + 1
+
+        return self.per_page
+
     def _query_items(self) -> list[t.Any]:
         """Execute the query to get the items on the current page.
 
@@ -169,6 +225,53 @@ class Pagination:
         """
         raise NotImplementedError
 
+    def _query_estimate(self) -> int | None:
+        """Get the database's estimate of the total number of items, or ``None`` if an
+        estimate is not available.
+
+        Uses init arguments stored in :attr:`_query_args`.
+
+        :meta private:
+
+        .. versionadded:: 3.2
+        """
+        return None
+
+    def _count_cache_key(self) -> t.Hashable:
+        """Get a key that identifies the count query and its parameters, used by
+        :class:`CachedCount`.
+
+        Uses init arguments stored in :attr:`_query_args`.
+
+        :meta private:
+
+        .. versionadded:: 3.2
+        """
+        raise NotImplementedError
+
+    def _count_concurrently(self) -> bool:
+        """Whether the count strategy should run in a worker thread while the items
+        are queried. If so, :meth:`_query_count` and :meth:`_query_estimate` must be
+        safe to call from another thread.
+
+        :meta private:
+
+        .. versionadded:: 3.2
+        """
+        return False
+
+    def _next_count(self) -> bool | CountStrategy:
+        """The ``count`` argument to use for the previous or next page. The total is
+        copied rather than counted again, unless the strategy needs to query an extra
+        item for each page.
+
+        :meta private:
+        """
+        if self._count_strategy is not None and self._count_strategy.fetch_extra:
+            return self._count_strategy
+
+        return False
+
     @property
     def first(self) -> int:
         """The number of the first item on the page, starting from 1, or 0 if there are
@@ -223,7 +326,7 @@ class Pagination:
             page=self.page - 1,
             per_page=self.per_page,
             error_out=error_out,
-            count=False,
+            count=self._next_count(),
             **self._query_args,
         )
         p.total = self.total
@@ -231,7 +334,14 @@ class Pagination:
 
     @property
     def has_next(self) -> bool:
-        """``True`` if this is not the last page."""
+        """``True`` if this is not the last page.
+
+        .. versionchanged:: 3.2
+            Uses the extra item queried by the ``"has_more"`` count strategy.
+        """
+        if self._has_more is not None:
+            return self._has_more
+
         return self.page < self.pages
 
     @property
@@ -254,7 +364,7 @@ class Pagination:
             per_page=self.per_page,
             max_per_page=self.max_per_page,
             error_out=error_out,
-            count=False,
+            count=self._next_count(),
             **self._query_args,
         )
         p.total = self.total
@@ -329,22 +439,83 @@ class SelectPagination(Pagination):
     """Returned by :meth:`.SQLAlchemy.paginate`. Takes ``select`` and ``session``
     arguments in addition to the :class:`Pagination` arguments.
 
+    If the ``concurrent`` argument is true, the total is counted in a worker thread
+    using a separate connection from the engine's pool, at the same time as the items
+    are queried. The separate connection will not see uncommitted changes in the
+    session. This is not done if the session is bound to a connection, or the engine
+    uses a ``StaticPool``, since there is only one connection to use.
+
+    .. versionchanged:: 3.2
+        Added the ``concurrent`` argument.
+
     .. versionadded:: 3.0
     """
 
+    _count_engine: sa.engine.Engine | None = None
+
+    def _bind(self) -> sa.engine.Engine | sa.engine.Connection:
+        # The worker thread must not use the session, which the items query is using,
+        # so the engine is chosen before the count starts.
+        if self._count_engine is not None:
+            return self._count_engine
+
+        session = self._query_args["session"]
+        select = self._query_args["select"]
+        return session.get_bind(  # type: ignore[no-any-return]
+            mapper=_select_entity(select), clause=select
+        )
+
+    def _count_concurrently(self) -> bool:
+        if not self._query_args.get("concurrent"):
+            return False
+
+        bind = self._bind()
+
+        if not isinstance(bind, sa.engine.Engine) or isinstance(
+            bind.pool, sa.pool.StaticPool
+        ):
+            return False
+
+        self._count_engine = bind
+        return True
+
+    def _scalar(
+        self, statement: sa.Executable, params: dict[str, t.Any] | None = None
+    ) -> t.Any:
+        """Execute a statement for counting and return the scalar result. Uses a
+        separate connection if counting concurrently, otherwise the session.
+        """
+        if self._count_engine is not None:
+            with self._count_engine.connect() as conn:
+                return conn.execute(statement, params).scalar()
+
+        select = self._query_args["select"]
+        session = self._query_args["session"]
+        bind_args = {"mapper": _select_entity(select)}
+        return session.execute(statement, params, bind_arguments=bind_args).scalar()
+
     def _query_items(self) -> list[t.Any]:
         select = self._query_args["select"]
-        select = select.limit(self.per_page).offset(self._query_offset)
+        select = select.limit(self._query_limit).offset(self._query_offset)
         session = self._query_args["session"]
         return list(session.execute(select).unique().scalars())
 
-    def _query_count(self) -> int:
+    def _count_select(self) -> sa.Select[t.Any]:
         select = self._query_args["select"]
         sub = select.options(sa_orm.lazyload("*")).order_by(None).subquery()
-        session = self._query_args["session"]
-        out = session.execute(sa.select(sa.func.count()).select_from(sub)).scalar()
+        return sa.select(sa.func.count()).select_from(sub)
+
+    def _query_count(self) -> int:
+        out = self._scalar(self._count_select())
         return out  # type: ignore[no-any-return]
 
+    def _query_estimate(self) -> int | None:
+        select = self._query_args["select"].order_by(None)
+        return _estimate_count(self._bind(), self._scalar, select)
+
+    def _count_cache_key(self) -> t.Hashable:
+        return _statement_key(self._bind(), self._count_select())
+
 
 class QueryPagination(Pagination):
     """Returned by :meth:`.Query.paginate`. Takes a ``query`` argument in addition to
@@ -355,10 +526,664 @@ class QueryPagination(Pagination):
 
     def _query_items(self) -> list[t.Any]:
         query = self._query_args["query"]
-        out = query.limit(self.per_page).offset(self._query_offset).all()
+        out = query.limit(self._query_limit).offset(self._query_offset).all()
         return out  # type: ignore[no-any-return]
 
     def _query_count(self) -> int:
         # Query.count automatically disables eager loads
         out = self._query_args["query"].order_by(None).count()
         return out  # type: ignore[no-any-return]
+
+    def _query_estimate(self) -> int | None:
+        query = self._query_args["query"].order_by(None)
+        select = query.statement
+        bind_args = {"mapper": _select_entity(select)}
+
+        def scalar(
+            statement: sa.Executable, params: dict[str, t.Any] | None = None
+        ) -> t.Any:
+            return query.session.execute(
+                statement, params, bind_arguments=bind_args
+            ).scalar()
+
+        bind = query.session.get_bind(**bind_args)
+        return _estimate_count(bind, scalar, select)
+
+    def _count_cache_key(self) -> t.Hashable:
+        query = self._query_args["query"].order_by(None)
+        bind = query.session.get_bind(mapper=_select_entity(query.statement))
+        return _statement_key(bind, query.statement)
+
+
+class CountStrategy:
+    """Determines how :attr:`Pagination.total` is calculated. Pass an instance as the
+    ``count`` argument to :meth:`.SQLAlchemy.paginate` or :meth:`.Query.paginate`.
+
+    Subclass this and implement :meth:`count` to customize counting.
+
+    .. versionadded:: 3.2
+    """
+
+    fetch_extra: bool = False
+    """Query one more item than ``per_page`` so that :attr:`Pagination.has_next` can
+    be determined without a total.
+    """
+
+    def count(self, pagination: Pagination) -> int | None:
+        """Calculate the total number of items for the pagination object, or return
+        ``None`` to leave the total unknown.
+
+        :param pagination: The pagination object being created. Its ``items`` have
+            already been queried.
+        """
+        raise NotImplementedError
+
+
+class ExactCount(CountStrategy):
+    """Issue a ``count()`` query for the total. This is the default strategy.
+
+    .. versionadded:: 3.2
+    """
+
+    def count(self, pagination: Pagination) -> int | None:
+        return pagination._query_count()
+
+
+class EstimatedCount(CountStrategy):
+    """Use the database query planner's estimate of the number of rows, which is
+    much faster than counting on large tables but may be inaccurate.
+
+    PostgreSQL uses the plan from ``EXPLAIN``. SQLite uses the table statistics in
+    ``sqlite_stat1`` collected by ``ANALYZE``, and only if the query does not filter,
+    join, or group the table. If an estimate is not available, an exact count is used.
+
+    .. versionadded:: 3.2
+    """
+
+    def count(self, pagination: Pagination) -> int | None:
+        out = pagination._query_estimate()
+
+        if out is None:
+            return pagination._query_count()
+
+        return out
+
+
+class HasMoreCount(CountStrategy):
+    """Don't calculate the total. Instead, query one extra item to determine if there
+    is a next page. :attr:`Pagination.total` and :attr:`Pagination.pages` are not
+    known, but :attr:`Pagination.has_next` is accurate.
+
+    .. versionadded:: 3.2
+    """
+
+    fetch_extra = True
+
+    def count(self, pagination: Pagination) -> int | None:
+        return None
+
+
+class CachedCount(CountStrategy):
+    """Cache the total calculated by another strategy for a period of time. Results
+    are keyed by the compiled count query and its parameters.
+
+    Create a single instance and reuse it for each call to ``paginate``. The cache is
+    stored in the instance, in memory for the current process.
+
+    :param ttl: The number of seconds to cache each total.
+    :param strategy: The strategy used to calculate the total if it is not cached.
+        Defaults to :class:`ExactCount`.
+    :param maxsize: The maximum number of totals to cache. The least recently used
+        entry is discarded when the cache is full.
+
+    .. versionadded:: 3.2
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60,
+        *,
+        strategy: CountStrategy | None = None,
+        maxsize: int = 1024,
+    ) -> None:
+        if strategy is None:
+            strategy = ExactCount()
+
+        self.ttl = ttl
+        self.strategy = strategy
+        self.maxsize = maxsize
+        self.fetch_extra = strategy.fetch_extra
+        self._cache: OrderedDict[t.Hashable, tuple[float, int | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def count(self, pagination: Pagination) -> int | None:
+        key = pagination._count_cache_key()
+        now = monotonic()
+
+        with self._lock:
+            entry = self._cache.get(key)
+
+            if entry is not None and entry[0] > now:
+                self._cache.move_to_end(key)
+                return entry[1]
+
+        out = self.strategy.count(pagination)
+
+        with self._lock:
+            self._cache[key] = (now + self.ttl, out)
+            self._cache.move_to_end(key)
+
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+
+        return out
+
+    def clear(self) -> None:
+        """Remove all cached totals."""
+        with self._lock:
+            self._cache.clear()
+
+
+_count_strategies: dict[str, type[CountStrategy]] = {
+    "exact": ExactCount,
+    "estimate": EstimatedCount,
+    "has_more": HasMoreCount,
+}
+
+
+def _get_count_strategy(count: bool | str | CountStrategy) -> CountStrategy | None:
+    """Convert the ``count`` argument to a strategy instance, or ``None`` if the total
+    should not be calculated.
+    """
+    if isinstance(count, CountStrategy):
+        return count
+
+    if isinstance(count, str):
+        try:
+            return _count_strategies[count]()
+        except KeyError:
+            raise ValueError(f"Unknown count strategy {count!r}.") from None
+
+    if count:
+        return ExactCount()
+
+    return None
+
+
+def _select_entity(select: sa.Select[t.Any]) -> t.Any:
+    """Get the first entity selected by an ORM select, to find its bind."""
+    descriptions = select.column_descriptions
+    return descriptions[0].get("entity") if descriptions else None
+
+
+def _statement_key(bind: t.Any, statement: sa.Select[t.Any]) -> t.Hashable:
+    """Get a key for the statement compiled for the bind's dialect, along with its
+    bound parameters.
+    """
+    compiled = statement.compile(bind)
+    params = tuple(sorted((k, repr(v)) for k, v in compiled.params.items()))
+    return str(bind.url), str(compiled), params
+
+
+class _Explain(sa.sql.expression.Executable, sa.sql.expression.ClauseElement):
+    """Render ``EXPLAIN`` for a select statement, so that it is compiled with the
+    parameters for the target dialect.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: sa.Select[t.Any]) -> None:
+        self.statement = statement
+
+
+def _compile_explain_pg(element: _Explain, compiler: t.Any, **kw: t.Any) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+compiles(_Explain, "postgresql")(_compile_explain_pg)  # type: ignore[no-untyped-call]
+
+
+def _estimate_count(
+    bind: sa.engine.Engine | sa.engine.Connection,
+    scalar: t.Callable[..., t.Any],
+    select: sa.Select[t.Any],
+) -> int | None:
+    """Get the planner's estimate of the number of rows a select will return, or
+    ``None`` if the dialect isn't supported or no estimate is available.
+
+    :param bind: The engine or connection the select will be executed with.
+    :param scalar: Executes a statement with optional parameters and returns the
+        scalar result.
+    :param select: The select to estimate.
+    """
+    name = bind.dialect.name
+
+    if name == "postgresql":
+        plan = scalar(_Explain(select))
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    if name == "sqlite":
+        froms = select.get_final_froms()
+
+        if (
+            len(froms) != 1
+            or not isinstance(froms[0], sa.Table)
+            or select.whereclause is not None
+            or select._group_by_clauses
+            or select._having_criteria
+            or select._distinct
+        ):
+            return None
+
+        try:
+            stat = scalar(
+                sa.text("SELECT stat FROM sqlite_stat1 WHERE tbl = :name LIMIT 1"),
+                {"name": froms[0].name},
+            )
+        except sa_exc.OperationalError:
+            # ANALYZE has never been run, so the stat table doesn't exist.
+            return None
+
+        if stat is None:
+            return None
+
+        return int(stat.split()[0])
+
+    return None
+
+
+class KeysetPagination:
+    """Filter the query based on the sort key values of the last item seen, rather than
+    applying an offset. The database can seek directly to the start of each page using
+    an index, so a deep page costs the same as the first page.
+
+    Don't create pagination objects manually. They are created by
+    :meth:`.SQLAlchemy.keyset_paginate` and :meth:`.Query.keyset_paginate`.
+
+    The query must be ordered by one or more columns that are all ascending or all
+    descending, and that together uniquely identify each row, such as
+    ``order_by(User.name, User.id)``. The columns must not be nullable.
+
+    This is a base class, a subclass must implement :meth:`_query_rows`.
+
+    :param cursor: An opaque string returned by :attr:`next_cursor` or
+        :attr:`prev_cursor` on a previous page. Defaults to the ``cursor`` query arg
+        during a request, or the first page otherwise.
+    :param per_page: The maximum number of items on a page. Defaults to the
+        ``per_page`` query arg during a request, or 20 otherwise.
+    :param max_per_page: The maximum allowed value for ``per_page``, to limit a
+        user-provided value. Use ``None`` for no limit. Defaults to 100.
+    :param error_out: Abort with a ``404 Not Found`` error if the cursor is not valid,
+        or if ``per_page`` is less than 1 or not an int.
+    :param kwargs: Information about the query to paginate. Different subclasses will
+        require different arguments.
+
+    .. versionadded:: 3.2
+    """
+
+    def __init__(
+        self,
+        cursor: str | None = None,
+        per_page: int | None = None,
+        max_per_page: int | None = 100,
+        error_out: bool = True,
+        **kwargs: t.Any,
+    ) -> None:
+        self._query_args = kwargs
+        _, per_page = Pagination._prepare_page_args(
+            page=1,
+            per_page=per_page,
+            max_per_page=max_per_page,
+            error_out=error_out,
+        )
+
+        if cursor is None and request:
+            cursor = request.args.get("cursor") or None
+
+        self.per_page: int = per_page
+        """The maximum number of items on a page."""
+
+        self.max_per_page: int | None = max_per_page
+        """The maximum allowed value for ``per_page``."""
+
+        self.cursor: str | None = cursor
+        """The cursor used to select this page, or ``None`` for the first page."""
+
+        forward = True
+        values: tuple[t.Any, ...] | None = None
+
+        if cursor is not None:
+            try:
+                forward, values = _decode_cursor(cursor)
+            except ValueError:
+                if error_out:
+                    abort(404)
+
+                self.cursor = None
+
+        sort_keys = self._sort_keys()
+
+        if values is not None and len(values) != len(sort_keys):
+            if error_out:
+                abort(404)
+
+            self.cursor = None
+            forward = True
+            values = None
+
+        descending = sort_keys[0][1]
+        columns = [c for c, _ in sort_keys]
+        where = None
+
+        if values is not None:
+            if len(columns) == 1:
+                lhs: t.Any = columns[0]
+                rhs: t.Any = values[0]
+            else:
+                lhs = sa.tuple_(*columns)
+                rhs = sa.tuple_(*values)
+
+            where = lhs > rhs if forward != descending else lhs < rhs
+
+        order_by: list[sa.ColumnElement[t.Any]]
+
+        if forward == descending:
+            order_by = [c.desc() for c in columns]
+        else:
+            order_by = [c.asc() for c in columns]
+
+        rows = self._query_rows(
+            columns=columns, order_by=order_by, where=where, limit=per_page + 1
+        )
+        more = len(rows) > per_page
+        rows = rows[:per_page]
+
+        if not forward:
+            rows.reverse()
+
+        self.items: list[t.Any] = [item for item, _ in rows]
+        """The items on the current page. Iterating over the pagination object is
+        equivalent to iterating over the items.
+        """
+
+        self._first_key = rows[0][1] if rows else None
+        self._last_key = rows[-1][1] if rows else None
+
+        if forward:
+            self.has_prev: bool = values is not None
+            self.has_next: bool = more
+        else:
+            self.has_prev = more
+            self.has_next = True
+
+    def _sort_keys(self) -> list[tuple[sa.ColumnElement[t.Any], bool]]:
+        """Get the ``(column, descending)`` pairs from the query's order by clause.
+
+        :meta private:
+        """
+        out: list[tuple[sa.ColumnElement[t.Any], bool]] = []
+
+        for clause in self._order_by_clauses():
+            if isinstance(clause, sa.UnaryExpression) and clause.modifier in {
+                operators.asc_op,
+                operators.desc_op,
+            }:
+                element = t.cast(sa.ColumnElement[t.Any], clause.element)
+                out.append((element, clause.modifier is operators.desc_op))
+            else:
+                out.append((clause, False))
+
+        if not out:
+            raise ValueError("Keyset pagination requires an ordered query.")
+
+        if len({d for _, d in out}) > 1:
+            raise ValueError(
+                "Keyset pagination requires all sort columns to use the same direction."
+            )
+
+        return out
+
+    def _order_by_clauses(self) -> t.Sequence[sa.ColumnElement[t.Any]]:
+        """Get the order by clauses of the query being paginated.
+
+        :meta private:
+        """
+        raise NotImplementedError
+
+    def _query_rows(
+        self,
+        *,
+        columns: list[sa.ColumnElement[t.Any]],
+        order_by: list[sa.ColumnElement[t.Any]],
+        where: sa.ColumnElement[bool] | None,
+        limit: int,
+    ) -> list[tuple[t.Any, tuple[t.Any, ...]]]:
+        """Execute the query to get the items on the current page along with the values
+        of their sort columns.
+
+        Uses init arguments stored in :attr:`_query_args`.
+
+        :meta private:
+
+        :param columns: The sort columns, to be added to the selected columns.
+        :param order_by: Replaces the query's order by clause.
+        :param where: A filter to apply, or ``None`` for the first page.
+        :param limit: The number of rows to query.
+        """
+        raise NotImplementedError
+
+    @property
+    def next_cursor(self) -> str | None:
+        """The cursor for the next page, or ``None`` if this is the last page."""
+        if not self.has_next or self._last_key is None:
+            return None
+
+        return _encode_cursor(True, self._last_key)
+
+    @property
+    def prev_cursor(self) -> str | None:
+        """The cursor for the previous page, or ``None`` if this is the first page."""
+        if not self.has_prev or self._first_key is None:
+            return None
+
+        return _encode_cursor(False, self._first_key)
+
+    def prev(self, *, error_out: bool = False) -> KeysetPagination:
+        """Query the :class:`KeysetPagination` object for the previous page.
+
+        :param error_out: Abort with a ``404 Not Found`` error if the cursor is not
+            valid.
+        """
+        return type(self)(
+            cursor=self.prev_cursor,
+            per_page=self.per_page,
+            max_per_page=self.max_per_page,
+            error_out=error_out,
+            **self._query_args,
+        )
+
+    def next(self, *, error_out: bool = False) -> KeysetPagination:
+        """Query the :class:`KeysetPagination` object for the next page.
+
+        :param error_out: Abort with a ``404 Not Found`` error if the cursor is not
+            valid.
+        """
+        return type(self)(
+            cursor=self.next_cursor,
+            per_page=self.per_page,
+            max_per_page=self.max_per_page,
+            error_out=error_out,
+            **self._query_args,
+        )
+
+    def __iter__(self) -> t.Iterator[t.Any]:
+        yield from self.items
+
+
+class SelectKeysetPagination(KeysetPagination):
+    """Returned by :meth:`.SQLAlchemy.keyset_paginate`. Takes ``select`` and
+    ``session`` arguments in addition to the :class:`KeysetPagination` arguments.
+
+    .. versionadded:: 3.2
+    """
+
+    def _order_by_clauses(self) -> t.Sequence[sa.ColumnElement[t.Any]]:
+        return self._query_args["select"]._order_by_clauses  # type: ignore[no-any-return]
+
+    def _query_rows(
+        self,
+        *,
+        columns: list[sa.ColumnElement[t.Any]],
+        order_by: list[sa.ColumnElement[t.Any]],
+        where: sa.ColumnElement[bool] | None,
+        limit: int,
+    ) -> list[tuple[t.Any, tuple[t.Any, ...]]]:
+        select = self._query_args["select"]
+        select = select.order_by(None).order_by(*order_by).add_columns(*columns)
+
+        if where is not None:
+            select = select.where(where)
+
+        session = self._query_args["session"]
+        result = session.execute(select.limit(limit)).unique()
+        return [(row[0], tuple(row[1:])) for row in result]
+
+
+class QueryKeysetPagination(KeysetPagination):
+    """Returned by :meth:`.Query.keyset_paginate`. Takes a ``query`` argument in
+    addition to the :class:`KeysetPagination` arguments.
+
+    .. versionadded:: 3.2
+    """
+
+    def _order_by_clauses(self) -> t.Sequence[sa.ColumnElement[t.Any]]:
+        return self._query_args["query"]._order_by_clauses  # type: ignore[no-any-return]
+
+    def _query_rows(
+        self,
+        *,
+        columns: list[sa.ColumnElement[t.Any]],
+        order_by: list[sa.ColumnElement[t.Any]],
+        where: sa.ColumnElement[bool] | None,
+        limit: int,
+    ) -> list[tuple[t.Any, tuple[t.Any, ...]]]:
+        query = self._query_args["query"]
+        query = query.order_by(None).order_by(*order_by).add_columns(*columns)
+
+        if where is not None:
+            query = query.filter(where)
+
+        return [(row[0], tuple(row[1:])) for row in query.limit(limit).all()]
+
+
+def _encode_value(value: t.Any) -> t.Any:
+    """Tag values that can't be represented directly in JSON so they can be decoded
+    back to the same type.
+    """
+    if isinstance(value, datetime.datetime):
+        return {"$dt": value.isoformat()}
+
+    if isinstance(value, datetime.date):
+        return {"$d": value.isoformat()}
+
+    if isinstance(value, datetime.time):
+        return {"$t": value.isoformat()}
+
+    if isinstance(value, decimal.Decimal):
+        return {"$dec": str(value)}
+
+    if isinstance(value, uuid.UUID):
+        return {"$uuid": str(value)}
+
+    if isinstance(value, bytes):
+        return {"$b": base64.b64encode(value).decode("ascii")}
+
+    raise TypeError(f"Cannot use {type(value).__name__!r} as a keyset cursor value.")
+
+
+_value_decoders: dict[str, t.Callable[[str], t.Any]] = {
+    "$dt": datetime.datetime.fromisoformat,
+    "$d": datetime.date.fromisoformat,
+    "$t": datetime.time.fromisoformat,
+    "$dec": decimal.Decimal,
+    "$uuid": uuid.UUID,
+    "$b": base64.b64decode,
+}
+
+
+_cursor_types = (
+    str,
+    int,
+    float,
+    datetime.date,
+    datetime.time,
+    decimal.Decimal,
+    uuid.UUID,
+    bytes,
+)
+"""The types of values that a decoded cursor may contain. Others, such as ``None``,
+lists, and dicts, are never encoded, and would fail in the database.
+"""
+
+
+def _decode_value(obj: dict[str, t.Any]) -> t.Any:
+    if len(obj) == 1:
+        tag, value = next(iter(obj.items()))
+
+        if tag in _value_decoders:
+            return _value_decoders[tag](value)
+
+    return obj
+
+
+def _encode_cursor(forward: bool, values: tuple[t.Any, ...]) -> str:
+    """Encode the direction and sort key values as an opaque URL-safe string."""
+    data = json.dumps(
+        ["n" if forward else "p", list(values)],
+        default=_encode_value,
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(data.encode()).rstrip(b"=").decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[bool, tuple[t.Any, ...]]:
+    """Decode a string from :func:`_encode_cursor`. Raises ``ValueError`` if the
+    cursor is not valid.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        direction, values = json.loads(data, object_hook=_decode_value)
+    except (binascii.Error, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor.") from e
+
+    if (
+        direction not in {"n", "p"}
+        or not isinstance(values, list)
+        or not all(isinstance(value, _cursor_types) for value in values)
+    ):
+        raise ValueError("Invalid cursor.")
+
+    return direction == "n", tuple(values)
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _submit(f: t.Callable[..., t.Any], *args: t.Any) -> Future[t.Any]:
+    """Call a function in a shared worker thread, with a copy of the current context
+    so that the Flask app context is available.
+    """
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(thread_name_prefix="flask_sqlalchemy")
+
+    ctx = contextvars.copy_context()
+    return _executor.submit(ctx.run, f, *args)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+import typing as t
+from time import perf_counter
+
+import sqlalchemy as sa
+import sqlalchemy.event as sa_event
+import sqlalchemy.exc as sa_exc
+
+
+@dataclasses.dataclass
+class PoolStats:
+    """Statistics about the connection pool of an engine. Returned by
+    :meth:`.SQLAlchemy.pool_stats`. Times are in seconds.
+
+    Counts of connections are the current state of the pool. The other values are
+    cumulative since the engine was created, or since the process was forked.
+
+    .. versionadded:: 3.2
+    """
+
+    bind_key: str | None
+    """The bind key of the engine."""
+
+    replica: bool
+    """Whether the engine is a read replica."""
+
+    size: int | None
+    """The configured ``pool_size``, or ``None`` if the pool does not have a fixed
+    size.
+    """
+
+    checked_out: int = 0
+    """Connections that are currently in use."""
+
+    idle: int = 0
+    """Open connections that are waiting in the pool to be used."""
+
+    overflow: int = 0
+    """Open connections beyond :attr:`size`, allowed by ``max_overflow``."""
+
+    total: int = 0
+    """All open connections, checked out or idle."""
+
+    checkouts: int = 0
+    """The number of times a connection was checked out."""
+
+    connects: int = 0
+    """The number of new connections that were opened."""
+
+    invalidated: int = 0
+    """The number of connections that were invalidated, such as after a disconnect
+    error.
+    """
+
+    timeouts: int = 0
+    """The number of times waiting for a connection failed with ``pool_timeout``."""
+
+    wait_time: float = 0.0
+    """The total time spent getting connections from the pool, including waiting for a
+    connection to be checked in and opening new connections.
+    """
+
+    max_wait: float = 0.0
+    """The longest time spent getting a single connection from the pool."""
+
+    replicas: list[PoolStats] = dataclasses.field(default_factory=list)
+    """The statistics for each replica of this engine, if it has ``replicas``
+    configured.
+    """
+
+    @property
+    def mean_wait(self) -> float:
+        """The average time spent getting a connection from the pool."""
+        if not self.checkouts:
+            return 0.0
+
+        return self.wait_time / self.checkouts
+
+
+class _PoolTracker:
+    """Collects :class:`PoolStats` for an engine using pool events. The time spent
+    getting a connection is measured around the engine's ``raw_connection``, since
+    there is no pool event before a checkout starts. Listeners stay attached if the
+    engine's pool is recreated by ``dispose``.
+
+    :param bind_key: The bind key of the engine.
+    :param engine: The engine to track.
+    :param replica: Whether the engine is a read replica.
+    """
+
+    def __init__(
+        self, bind_key: str | None, engine: sa.engine.Engine, replica: bool
+    ) -> None:
+        self.bind_key = bind_key
+        self.engine = engine
+        self.replica = replica
+        self._lock = threading.Lock()
+        self.reset()
+        sa_event.listen(engine, "connect", self._on_connect)
+        sa_event.listen(engine, "close", self._on_close)
+        sa_event.listen(engine, "detach", self._on_detach)
+        sa_event.listen(engine, "invalidate", self._on_invalidate)
+        sa_event.listen(engine, "checkout", self._on_checkout)
+        sa_event.listen(engine, "checkin", self._on_checkin)
+        raw_connection = engine.raw_connection
+
+        def timed_raw_connection() -> t.Any:
+            start = perf_counter()
+
+            try:
+                return raw_connection()
+            except sa_exc.TimeoutError:
+                with self._lock:
+                    self.timeouts += 1
+
+                raise
+            finally:
+                self._add_wait(perf_counter() - start)
+
+        engine.raw_connection = timed_raw_connection  # type: ignore[method-assign]
+
+    def reset(self) -> None:
+        """Forget all counts, such as after the pool is replaced in a forked process."""
+        with self._lock:
+            self.checked_out = 0
+            self.total = 0
+            self.checkouts = 0
+            self.connects = 0
+            self.invalidated = 0
+            self.timeouts = 0
+            self.wait_time = 0.0
+            self.max_wait = 0.0
+
+    def stats(self) -> PoolStats:
+        """A snapshot of the current statistics."""
+        size_method = getattr(self.engine.pool, "size", None)
+        size = t.cast(int, size_method()) if size_method is not None else None
+
+        with self._lock:
+            checked_out = max(self.checked_out, 0)
+            total = max(self.total, checked_out)
+            return PoolStats(
+                bind_key=self.bind_key,
+                replica=self.replica,
+                size=size,
+                checked_out=checked_out,
+                idle=total - checked_out,
+                overflow=max(total - size, 0) if size is not None else 0,
+                total=total,
+                checkouts=self.checkouts,
+                connects=self.connects,
+                invalidated=self.invalidated,
+                timeouts=self.timeouts,
+                wait_time=self.wait_time,
+                max_wait=self.max_wait,
+            )
+
+    def _add_wait(self, duration: float) -> None:
+        with self._lock:
+            self.wait_time += duration
+
+            if duration > self.max_wait:
+                self.max_wait = duration
+
+    def _on_connect(self, dbapi_connection: t.Any, record: t.Any) -> None:
+        with self._lock:
+            self.total += 1
+            self.connects += 1
+
+    def _on_close(self, dbapi_connection: t.Any, record: t.Any) -> None:
+        with self._lock:
+            self.total -= 1
+
+    def _on_detach(self, dbapi_connection: t.Any, record: t.Any) -> None:
+        # A detached connection is no longer managed by the pool, and is not checked
+        # in again.
+        with self._lock:
+            self.total -= 1
+            self.checked_out -= 1
+
+    def _on_invalidate(
+        self, dbapi_connection: t.Any, record: t.Any, exception: t.Any
+    ) -> None:
+        with self._lock:
+            self.invalidated += 1
+
+    def _on_checkout(
+        self, dbapi_connection: t.Any, record: t.Any, proxy: t.Any
+    ) -> None:
+        with self._lock:
+            self.checked_out += 1
+            self.checkouts += 1
+
+    def _on_checkin(self, dbapi_connection: t.Any, record: t.Any) -> None:
+        with self._lock:
+            self.checked_out -= 1
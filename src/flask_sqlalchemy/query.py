@@ -6,7 +6,10 @@ import sqlalchemy.exc as sa_exc
 import sqlalchemy.orm as sa_orm
 from flask import abort
 
+from .pagination import CountStrategy
+from .pagination import KeysetPagination
 from .pagination import Pagination
+from .pagination import QueryKeysetPagination
 from .pagination import QueryPagination
 
 
@@ -67,7 +70,7 @@ class Query(sa_orm.Query):  # type: ignore[type-arg]
         per_page: int | None = None,
         max_per_page: int | None = None,
         error_out: bool = True,
-        count: bool = True,
+        count: bool | str | CountStrategy = True,
     ) -> Pagination:
         """Apply an offset and limit to the query based on the current page and number
         of items per page, returning a :class:`.Pagination` object.
@@ -84,11 +87,17 @@ class Query(sa_orm.Query):  # type: ignore[type-arg]
             either are not ints.
         :param count: Calculate the total number of values by issuing an extra count
             query. For very complex queries this may be inaccurate or slow, so it can be
-            disabled and set manually if necessary.
+            disabled and set manually if necessary. Can also be a
+            :class:`.CountStrategy`, or one of the strings ``"exact"``,
+            ``"estimate"``, or ``"has_more"``.
 
         .. versionchanged:: 3.0
             All parameters are keyword-only.
 
+        .. versionchanged:: 3.2
+            ``count`` can be a :class:`.CountStrategy` or the name of a built-in
+            strategy.
+
         .. versionchanged:: 3.0
             The ``count`` query is more efficient.
 
@@ -103,3 +112,35 @@ class Query(sa_orm.Query):  # type: ignore[type-arg]
             error_out=error_out,
             count=count,
         )
+
+    def keyset_paginate(
+        self,
+        *,
+        cursor: str | None = None,
+        per_page: int | None = None,
+        max_per_page: int | None = None,
+        error_out: bool = True,
+    ) -> KeysetPagination:
+        """Filter the ordered query based on the sort key values of the last item on
+        the previous page, returning a :class:`.KeysetPagination` object. See
+        :meth:`.SQLAlchemy.keyset_paginate`.
+
+        :param cursor: The :attr:`~.KeysetPagination.next_cursor` or
+            :attr:`~.KeysetPagination.prev_cursor` value from another page. Defaults to
+            the ``cursor`` query arg during a request, or the first page otherwise.
+        :param per_page: The maximum number of items on a page. Defaults to the
+            ``per_page`` query arg during a request, or 20 otherwise.
+        :param max_per_page: The maximum allowed value for ``per_page``, to limit a
+            user-provided value. Use ``None`` for no limit. Defaults to 100.
+        :param error_out: Abort with a ``404 Not Found`` error if the cursor is not
+            valid, or if ``per_page`` is less than 1 or not an int.
+
+        .. versionadded:: 3.2
+        """
+        return QueryKeysetPagination(
+            query=self,
+            cursor=cursor,
+            per_page=per_page,
+            max_per_page=max_per_page,
+            error_out=error_out,
+        )
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import hashlib
+import typing as t
+import uuid
+
+import sqlalchemy as sa
+import sqlalchemy.orm as sa_orm
+
+from .pagination import _select_entity
+from .streaming import _entity_indexes
+
+if t.TYPE_CHECKING:
+    from .model_cache import CacheBackend
+    from .session import Session
+
+_tables_info = "_fsa_query_cache_tables"
+
+
+def _cached_query(
+    session: Session,
+    cache: CacheBackend,
+    select: sa.sql.Select[t.Any],
+    ttl: float | None,
+    tags: t.Iterable[t.Any] | None,
+) -> list[sa.Row[t.Any]]:
+    """Get the rows for a select from the cache, or execute it and cache the rows.
+
+    The cache key is a hash of the engine URL, the SQL compiled for that engine's
+    dialect, the parameters, and the current version of each tag. Invalidating a tag
+    replaces its version, so entries created with the previous version are never used
+    again, and expire on their own.
+
+    :param session: The session to execute with.
+    :param cache: The cache backend.
+    :param select: The ``select`` statement to execute.
+    :param ttl: The number of seconds to cache the rows.
+    :param tags: Models, tables, or table names that the select depends on. Defaults
+        to the tables the select reads from.
+    """
+    if _entity_indexes(select):
+        raise ValueError(
+            "Cached selects can't return ORM instances. Select columns instead."
+        )
+
+    bind_key, urls, dialect = _select_bind(session, select)
+
+    if tags is None:
+        names = sorted({_table_tag(table) for table in sa.sql.util.find_tables(select)})
+    else:
+        names = sorted({name for tag in tags for name in _tag_tables(tag, bind_key)})
+
+    versions = []
+
+    for name in names:
+        tag_key = _tag_key(name)
+        version = cache.get(tag_key)
+
+        if version is None:
+            # The version was never set or was evicted. Start a new one, so that
+            # entries created with an old version are not used.
+            version = uuid.uuid4().hex
+            cache.set(tag_key, version, None)
+
+        versions.append(version)
+
+    compiled = select.compile(dialect=dialect)
+    params = sorted(compiled.params.items())
+    value = repr((urls, str(compiled), params, names, versions))
+    key = f"flask_sqlalchemy:query:{hashlib.sha256(value.encode()).hexdigest()}"
+    rows: list[sa.Row[t.Any]] | None = cache.get(key)
+
+    if rows is None:
+        rows = list(session.execute(select).all())
+
+        # Don't cache rows that may include this session's uncommitted changes.
+        if not session._fsa_wrote:
+            cache.set(key, rows, ttl)
+
+    return rows
+
+
+def _select_bind(
+    session: Session, select: sa.sql.Select[t.Any]
+) -> tuple[str | None, list[str], sa.engine.Dialect]:
+    """Get the bind key of the model the select is executed for, the URL of each
+    engine it is executed on, and the dialect to compile it for. A select for a sharded
+    model is executed on every shard unless one was chosen with ``for_shard``.
+    """
+    entity = _select_entity(select)
+    bind_key = None
+
+    if entity is not None:
+        bind_key = sa.inspect(entity).mapper.local_table.metadata.info.get("bind_key")
+
+    shards = session._fsa_shards.get(bind_key)
+
+    if shards is not None and session._fsa_shard is None:
+        engines = [session._db.engines[shard_id] for shard_id in shards]
+    else:
+        engines = [session.get_bind(mapper=entity, clause=select).engine]
+
+    return bind_key, [str(engine.url) for engine in engines], engines[0].dialect
+
+
+def _table_tag(table: t.Any) -> str:
+    """The tag name of a table, which includes its bind key so that tables with the
+    same name in different databases are invalidated separately.
+    """
+    return f"{table.metadata.info.get('bind_key')}:{table.fullname}"
+
+
+def _tag_tables(tag: t.Any, bind_key: str | None) -> list[str]:
+    """Get the table tag names for a tag, which is a model, table, or table name. A name
+    is a table in the select's bind.
+    """
+    if isinstance(tag, str):
+        return [f"{bind_key}:{tag}"]
+
+    if isinstance(tag, sa.Table):
+        return [_table_tag(tag)]
+
+    return [_table_tag(table) for table in sa.inspect(tag).tables]
+
+
+def _tag_key(name: str) -> str:
+    return f"flask_sqlalchemy:tag:{name}"
+
+
+def _invalidate(cache: CacheBackend, names: t.Iterable[str]) -> None:
+    for name in names:
+        cache.set(_tag_key(name), uuid.uuid4().hex, None)
+
+
+def _record_flushed(session: Session, flush_context: t.Any) -> None:
+    """Invalidate the tables of instances that were inserted, updated, or deleted.
+    They are invalidated again after the commit, in case another session cached the
+    old rows in between.
+    """
+    cache = session._fsa_query_cache
+
+    if cache is None:
+        return
+
+    names: set[str] = set()
+
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        names.update(_table_tag(table) for table in sa.inspect(obj).mapper.tables)
+
+    if names:
+        _invalidate(cache, names)
+        session.info.setdefault(_tables_info, set()).update(names)
+
+
+def _record_executed(orm_context: sa_orm.ORMExecuteState) -> None:
+    """Invalidate the table of an ``insert``, ``update``, or ``delete`` statement
+    executed by the session.
+    """
+    statement = orm_context.statement
+
+    if not isinstance(statement, sa.sql.dml.UpdateBase):
+        return
+
+    session = t.cast("Session", orm_context.session)
+    cache = session._fsa_query_cache
+
+    if cache is None or not isinstance(statement.table, sa.Table):
+        return
+
+    name = _table_tag(statement.table)
+    _invalidate(cache, [name])
+    session.info.setdefault(_tables_info, set()).add(name)
+
+
+def _invalidate_committed_tables(session: Session) -> None:
+    names = session.info.pop(_tables_info, None)
+    cache = session._fsa_query_cache
+
+    if names and cache is not None:
+        _invalidate(cache, names)
+
+
+def _discard_tables(session: Session, *args: t.Any) -> None:
+    session.info.pop(_tables_info, None)
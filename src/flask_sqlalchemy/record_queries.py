@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 import dataclasses
-import inspect
+import functools
+import random
+import re
+import sys
+import threading
 import typing as t
+import warnings
+from collections import deque
 from time import perf_counter
 
 import sqlalchemy as sa
 import sqlalchemy.event as sa_event
+import sqlalchemy.orm as sa_orm
 from flask import current_app
+from flask import Flask
 from flask import g
 from flask import has_app_context
 
@@ -31,6 +39,11 @@ def get_recorded_queries() -> list[_QueryInfo]:
         A string description of where in your application code the query was executed.
         This may not be possible to calculate, and the format is not stable.
 
+    .. versionchanged:: 3.2
+        Only the most recent :data:`.SQLALCHEMY_RECORD_QUERIES_MAX` queries are
+        returned, and queries are only recorded for a sample of app contexts if
+        :data:`.SQLALCHEMY_RECORD_QUERIES_SAMPLE_RATE` is set.
+
     .. versionchanged:: 3.0
         Renamed from ``get_debug_queries``.
 
@@ -43,13 +56,56 @@ def get_recorded_queries() -> list[_QueryInfo]:
     .. versionchanged:: 3.0
         Not enabled automatically in debug or testing mode.
     """
-    return g.get("_sqlalchemy_queries", [])  # type: ignore[no-any-return]
+    queries = g.get("_sqlalchemy_queries")
+
+    if queries is None:
+        return []
+
+    if isinstance(queries, deque):
+        return list(queries)
+
+    return queries  # type: ignore[no-any-return]
+
+
+class NPlusOneWarning(UserWarning):
+    """Shown when :data:`.SQLALCHEMY_N_PLUS_ONE_THRESHOLD` is exceeded and the action
+    is ``"warn"``.
+
+    .. versionadded:: 3.2
+    """
+
+
+class NPlusOneError(Exception):
+    """Raised when :data:`.SQLALCHEMY_N_PLUS_ONE_THRESHOLD` is exceeded and the
+    action is ``"raise"``.
+
+    .. versionadded:: 3.2
+    """
+
+
+class QueryBudgetWarning(UserWarning):
+    """Shown when an app context exceeds its query budget and
+    :data:`.SQLALCHEMY_QUERY_BUDGET_ACTION` is ``"warn"``.
+
+    .. versionadded:: 3.2
+    """
+
+
+class QueryBudgetError(Exception):
+    """Raised when an app context exceeds its query budget and
+    :data:`.SQLALCHEMY_QUERY_BUDGET_ACTION` is ``"raise"``.
+
+    .. versionadded:: 3.2
+    """
 
 
 @dataclasses.dataclass
 class _QueryInfo:
     """Information about an executed query. Returned by :func:`get_recorded_queries`.
 
+    .. versionchanged:: 3.2
+        Uses ``__slots__``.
+
     .. versionchanged:: 3.0
         Renamed from ``_DebugQueryTuple``.
 
@@ -60,6 +116,8 @@ class _QueryInfo:
         ``context`` is renamed to ``location``.
     """
 
+    __slots__ = ("statement", "parameters", "start_time", "end_time", "location")
+
     statement: str | None
     parameters: t.Any
     start_time: float
@@ -71,47 +129,497 @@ class _QueryInfo:
         return self.end_time - self.start_time
 
 
-def _listen(engine: sa.engine.Engine) -> None:
-    sa_event.listen(engine, "before_cursor_execute", _record_start, named=True)
-    sa_event.listen(engine, "after_cursor_execute", _record_end, named=True)
+class _Histogram:
+    """Count values in buckets with a bounded relative error, similar to an HDR
+    histogram. Values are recorded as integer microseconds. Values less than
+    ``2 * sub_buckets`` are exact, larger values are grouped into ``sub_buckets``
+    linear buckets per power of two, an error of about 3%. Memory is bounded by the
+    number of distinct buckets used, not the number of values.
+    """
 
+    __slots__ = ("counts", "count", "total", "min", "max")
 
-def _record_start(context: sa.engine.ExecutionContext, **kwargs: t.Any) -> None:
-    if not has_app_context():
-        return
+    sub_bits = 5
+    sub_buckets = 1 << sub_bits
 
-    context._fsa_start_time = perf_counter()  # type: ignore[attr-defined]
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
 
+    def record(self, value: float) -> None:
+        micros = int(value * 1_000_000)
+        index = self._index(micros)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
 
-def _record_end(context: sa.engine.ExecutionContext, **kwargs: t.Any) -> None:
-    if not has_app_context():
-        return
+        if value < self.min:
+            self.min = value
 
-    if "_sqlalchemy_queries" not in g:
-        g._sqlalchemy_queries = []
+        if value > self.max:
+            self.max = value
 
-    import_top = current_app.import_name.partition(".")[0]
-    import_dot = f"{import_top}."
-    frame = inspect.currentframe()
+    def _index(self, micros: int) -> int:
+        if micros < 2 * self.sub_buckets:
+            return micros
 
-    while frame:
-        name = frame.f_globals.get("__name__")
+        shift = micros.bit_length() - self.sub_bits - 1
+        return (shift + 1) * self.sub_buckets + (micros >> shift) - self.sub_buckets
 
-        if name and (name == import_top or name.startswith(import_dot)):
-            code = frame.f_code
-            location = f"{code.co_filename}:{frame.f_lineno} ({code.co_name})"
-            break
+    def _value(self, index: int) -> int:
+        """Get the highest value that would be counted in the bucket."""
+        if index < 2 * self.sub_buckets:
+            return index
 
-        frame = frame.f_back
-    else:
-        location = "<unknown>"
-
-    g._sqlalchemy_queries.append(
-        _QueryInfo(
-            statement=context.statement,
-            parameters=context.parameters,
-            start_time=context._fsa_start_time,  # type: ignore[attr-defined]
-            end_time=perf_counter(),
-            location=location,
-        )
+        shift = index // self.sub_buckets - 1
+        mantissa = index % self.sub_buckets + self.sub_buckets
+        return ((mantissa + 1) << shift) - 1
+
+    def percentile(self, q: float) -> float:
+        """Get the value in seconds that ``q`` percent of the recorded values are less
+        than or equal to.
+        """
+        if not self.count:
+            return 0.0
+
+        target = max(1, self.count * q / 100)
+        seen = 0
+
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+
+            if seen >= target:
+                # Buckets count whole microseconds, keep the value within the range
+                # that was actually recorded.
+                value = self._value(index) / 1_000_000
+                return max(min(value, self.max), self.min)
+
+        return self.max
+
+
+@dataclasses.dataclass
+class StatementStats:
+    """Statistics about a normalized statement executed with a bind key. Returned by
+    :meth:`QueryStats.snapshot`. Times are in seconds.
+
+    .. versionadded:: 3.2
+    """
+
+    bind_key: str | None
+    """The bind key of the engine that executed the statement."""
+
+    statement: str
+    """The normalized statement."""
+
+    count: int
+    """The number of times the statement completed."""
+
+    errors: int
+    """The number of times the statement raised an error."""
+
+    rows: int
+    """The total number of rows reported by the cursor. Some drivers, like SQLite,
+    don't report this for ``SELECT`` statements.
+    """
+
+    total: float
+    """The total time spent executing the statement."""
+
+    min: float
+    """The shortest time."""
+
+    max: float
+    """The longest time."""
+
+    p50: float
+    """The median time."""
+
+    p90: float
+    """The 90th percentile time."""
+
+    p95: float
+    """The 95th percentile time."""
+
+    p99: float
+    """The 99th percentile time."""
+
+    @property
+    def mean(self) -> float:
+        """The average time."""
+        if not self.count:
+            return 0.0
+
+        return self.total / self.count
+
+
+class _StatementRecord:
+    __slots__ = ("histogram", "errors", "rows")
+
+    def __init__(self) -> None:
+        self.histogram = _Histogram()
+        self.errors = 0
+        self.rows = 0
+
+
+class QueryStats:
+    """Cumulative statistics about the queries executed across all requests,
+    grouped by bind key and a normalized form of each statement. Available as
+    :attr:`.SQLAlchemy.query_stats` if :data:`.SQLALCHEMY_QUERY_STATS` is enabled.
+
+    Statements are normalized by replacing literal values and parameter placeholders
+    with ``?`` and collapsing repeated groups, so that the same query with different
+    values is counted together. Times are recorded in a histogram with a fixed
+    precision, so the memory used does not grow with the number of queries.
+
+    This does not require an app context, and can be read from any thread.
+
+    .. versionadded:: 3.2
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: dict[tuple[str | None, str], _StatementRecord] = {}
+
+    def _get(self, bind_key: str | None, statement: str) -> _StatementRecord:
+        """Get the record for a statement. Must be called with the lock held."""
+        key = (bind_key, _normalize(statement))
+        record = self._stats.get(key)
+
+        if record is None:
+            record = self._stats[key] = _StatementRecord()
+
+        return record
+
+    def _record(
+        self, bind_key: str | None, statement: str, duration: float, rows: int
+    ) -> None:
+        with self._lock:
+            record = self._get(bind_key, statement)
+            record.histogram.record(duration)
+
+            if rows > 0:
+                record.rows += rows
+
+    def _record_error(self, bind_key: str | None, statement: str) -> None:
+        with self._lock:
+            self._get(bind_key, statement).errors += 1
+
+    def snapshot(self, *, reset: bool = False) -> list[StatementStats]:
+        """Get the statistics for each bind key and normalized statement, sorted by
+        total time with the slowest first.
+
+        :param reset: Clear the statistics after taking the snapshot, in one step.
+        """
+        with self._lock:
+            items = list(self._stats.items())
+
+            if reset:
+                self._stats = {}
+
+        out = []
+
+        for (bind_key, statement), record in items:
+            h = record.histogram
+            out.append(
+                StatementStats(
+                    bind_key=bind_key,
+                    statement=statement,
+                    count=h.count,
+                    errors=record.errors,
+                    rows=record.rows,
+                    total=h.total,
+                    min=h.min if h.count else 0.0,
+                    max=h.max,
+                    p50=h.percentile(50),
+                    p90=h.percentile(90),
+                    p95=h.percentile(95),
+                    p99=h.percentile(99),
+                )
+            )
+
+        out.sort(key=lambda x: x.total, reverse=True)
+        return out
+
+    def reset(self) -> None:
+        """Clear all the statistics."""
+        with self._lock:
+            self._stats = {}
+
+
+_strings_re = re.compile(r"'(?:[^']|'')*'")
+_numbers_re = re.compile(r"(?<![\w.$])-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b")
+_placeholders_re = re.compile(r"%\(\w+\)s|%s|(?<!:):\w+|\$\d+|\?")
+_lists_re = re.compile(r"\?(?:\s*,\s*\?)+")
+_groups_re = re.compile(r"(\((?:\?|\?\.\.\.)\))(?:\s*,\s*\1)+")
+_space_re = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=2048)
+def _normalize(statement: str) -> str:
+    """Normalize a statement so that the same query with different values, or a
+    different number of values in a list, groups together.
+    """
+    out = _strings_re.sub("?", statement)
+    out = _placeholders_re.sub("?", out)
+    out = _numbers_re.sub("?", out)
+    out = _lists_re.sub("?...", out)
+    out = _groups_re.sub(r"\1, ...", out)
+    return _space_re.sub(" ", out).strip()
+
+
+class _Recorder:
+    """Listens to an engine's events to record queries. Options are read from the app
+    config once when the engine is created.
+    """
+
+    __slots__ = (
+        "bind_key",
+        "import_top",
+        "import_dot",
+        "record",
+        "sample_rate",
+        "max",
+        "location",
+        "stats",
+        "n_plus_one",
+        "n_plus_one_action",
+        "budget",
+        "budget_action",
     )
+
+    def __init__(
+        self, app: Flask, bind_key: str | None, stats: QueryStats | None
+    ) -> None:
+        self.bind_key = bind_key
+        self.import_top = app.import_name.partition(".")[0]
+        self.import_dot = f"{self.import_top}."
+        self.record: bool = app.config["SQLALCHEMY_RECORD_QUERIES"]
+        self.sample_rate: float = app.config["SQLALCHEMY_RECORD_QUERIES_SAMPLE_RATE"]
+        self.max: int | None = app.config["SQLALCHEMY_RECORD_QUERIES_MAX"]
+        self.location: bool = app.config["SQLALCHEMY_RECORD_QUERIES_LOCATION"]
+        self.stats = stats
+        self.n_plus_one: int | None = app.config["SQLALCHEMY_N_PLUS_ONE_THRESHOLD"]
+        self.n_plus_one_action: str = app.config["SQLALCHEMY_N_PLUS_ONE_ACTION"]
+
+        budget: dict[str, t.Any] | None = app.config["SQLALCHEMY_QUERY_BUDGET"]
+        self.budget: tuple[int | None, float | None] | None = None
+        self.budget_action: str = app.config["SQLALCHEMY_QUERY_BUDGET_ACTION"]
+
+        if self.n_plus_one_action not in {"warn", "log", "raise"}:
+            raise ValueError(
+                "'SQLALCHEMY_N_PLUS_ONE_ACTION' must be 'warn', 'log', or 'raise'."
+            )
+
+        if budget is not None:
+            if budget.keys() - {"queries", "time"}:
+                raise ValueError(
+                    "'SQLALCHEMY_QUERY_BUDGET' may only have 'queries' and 'time' keys."
+                )
+
+            self.budget = (budget.get("queries"), budget.get("time"))
+
+            if self.budget_action not in {"warn", "log", "raise"}:
+                raise ValueError(
+                    "'SQLALCHEMY_QUERY_BUDGET_ACTION' must be 'warn', 'log', or"
+                    " 'raise'."
+                )
+
+    def _get_queries(self) -> list[_QueryInfo] | deque[_QueryInfo] | None:
+        """Get the container to record queries to for the current app context, or
+        ``None`` if this context was not sampled.
+        """
+        if "_sqlalchemy_queries" not in g:
+            if self.sample_rate < 1 and random.random() >= self.sample_rate:
+                g._sqlalchemy_queries = None
+            elif self.max is not None:
+                g._sqlalchemy_queries = deque(maxlen=self.max)
+            else:
+                g._sqlalchemy_queries = []
+
+        return g._sqlalchemy_queries  # type: ignore[no-any-return]
+
+    def _get_location(self) -> str:
+        import_top = self.import_top
+        import_dot = self.import_dot
+        frame = sys._getframe(1)
+
+        while frame:
+            name = frame.f_globals.get("__name__")
+
+            if name and (name == import_top or name.startswith(import_dot)):
+                code = frame.f_code
+                return f"{code.co_filename}:{frame.f_lineno} ({code.co_name})"
+
+            frame = frame.f_back  # type: ignore[assignment]
+
+        return "<unknown>"
+
+    def record_start(
+        self, context: sa.engine.ExecutionContext, **kwargs: t.Any
+    ) -> None:
+        context._fsa_start_time = perf_counter()  # type: ignore[attr-defined]
+
+    def record_end(self, context: sa.engine.ExecutionContext, **kwargs: t.Any) -> None:
+        end_time = perf_counter()
+        start_time = context._fsa_start_time  # type: ignore[attr-defined]
+        statement = context.statement
+
+        if self.stats is not None and statement is not None:
+            rows = context.rowcount  # type: ignore[attr-defined]
+            self.stats._record(self.bind_key, statement, end_time - start_time, rows)
+
+        if not has_app_context():
+            return
+
+        if self.n_plus_one and statement is not None:
+            self._detect_n_plus_one(context, statement)
+
+        if self.budget is not None:
+            self._check_budget(end_time - start_time, statement)
+
+        if not self.record:
+            return
+
+        queries = self._get_queries()
+
+        if queries is None:
+            return
+
+        queries.append(
+            _QueryInfo(
+                statement=statement,
+                parameters=context.parameters,
+                start_time=start_time,
+                end_time=end_time,
+                location=self._get_location() if self.location else "<unknown>",
+            )
+        )
+
+    def _detect_n_plus_one(
+        self, context: sa.engine.ExecutionContext, statement: str
+    ) -> None:
+        """Count how many different parameters each normalized select statement has
+        been executed with in the current app context. Report the statement once if
+        the count exceeds the threshold.
+        """
+        if context.isinsert or context.isupdate or context.isdelete:  # type: ignore[attr-defined]
+            return
+
+        if "_sqlalchemy_n_plus_one" not in g:
+            g._sqlalchemy_n_plus_one = {}
+
+        seen: dict[str, set[str] | None] = g._sqlalchemy_n_plus_one
+        key = _normalize(statement)
+        params = seen.get(key, set())
+
+        if params is None:
+            # Already reported in this app context.
+            return
+
+        params.add(repr(context.parameters))
+        seen[key] = params
+
+        if len(params) <= self.n_plus_one:  # type: ignore[operator]
+            return
+
+        seen[key] = None
+        message = (
+            f"The same statement was executed with {len(params)} different"
+            f" parameters in one app context, which may be an N+1 query problem."
+            f"\nLocation: {self._get_location()}\nStatement: {key}"
+        )
+        relationship = _lazy_load_relationship(context)
+
+        if relationship is not None:
+            message = (
+                f"{message}\nThe statement lazy loads {relationship}. Consider"
+                f" eager loading it with 'selectinload({relationship})' or"
+                f" 'joinedload({relationship})'."
+            )
+
+        _report(message, self.n_plus_one_action, NPlusOneWarning, NPlusOneError)
+
+    def _check_budget(self, duration: float, statement: str | None) -> None:
+        """Count the queries and total query time in the current app context, and
+        report once if either exceeds the budget set by :data:`.SQLALCHEMY_QUERY_BUDGET`
+        or :meth:`.SQLAlchemy.query_budget`.
+        """
+        used: list[t.Any] | None = g.get("_sqlalchemy_query_budget_used")
+
+        if used is None:
+            used = g._sqlalchemy_query_budget_used = [0, 0.0, False]
+
+        used[0] += 1
+        used[1] += duration
+
+        if used[2]:
+            # Already reported in this app context.
+            return
+
+        queries, time = g.get("_sqlalchemy_query_budget", self.budget)
+        exceeded = []
+
+        if queries is not None and used[0] > queries:
+            exceeded.append(f"{used[0]} queries exceeds the budget of {queries}")
+
+        if time is not None and used[1] > time:
+            exceeded.append(f"{used[1]:.3f}s of queries exceeds the budget of {time}s")
+
+        if not exceeded:
+            return
+
+        used[2] = True
+        message = (
+            f"The app context exceeded its query budget: {', '.join(exceeded)}."
+            f"\nLocation: {self._get_location()}\nStatement: {statement}"
+        )
+        _report(message, self.budget_action, QueryBudgetWarning, QueryBudgetError)
+
+    def record_error(self, context: sa.engine.ExceptionContext) -> None:
+        if self.stats is not None and context.statement is not None:
+            self.stats._record_error(self.bind_key, context.statement)
+
+
+def _report(
+    message: str,
+    action: str,
+    warning: type[Warning],
+    error: type[Exception],
+) -> None:
+    """Warn, log, or raise, depending on the configured action."""
+    if action == "raise":
+        raise error(message)
+
+    if action == "log":
+        current_app.logger.warning(message)
+    else:
+        warnings.warn(message, warning, stacklevel=3)
+
+
+def _lazy_load_relationship(context: sa.engine.ExecutionContext) -> str | None:
+    """If the statement is loading an ORM relationship, get the name of the
+    relationship attribute, like ``User.posts``.
+    """
+    compile_state = getattr(context.compiled, "compile_state", None)
+    path = getattr(compile_state, "current_path", None)
+
+    if not path:
+        return None
+
+    prop = path.path[-1]
+
+    if not isinstance(prop, sa_orm.RelationshipProperty):
+        return None
+
+    return f"{prop.parent.class_.__name__}.{prop.key}"
+
+
+def _listen(engine: sa.engine.Engine, recorder: _Recorder) -> None:
+    sa_event.listen(engine, "before_cursor_execute", recorder.record_start, named=True)
+    sa_event.listen(engine, "after_cursor_execute", recorder.record_end, named=True)
+
+    if recorder.stats is not None:
+        sa_event.listen(engine, "handle_error", recorder.record_error)
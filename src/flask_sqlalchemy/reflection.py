@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+import typing as t
+
+import sqlalchemy as sa
+
+# Change this if the format of the cache files changes.
+_format = 1
+
+
+class _ReflectCache:
+    """Saves the tables reflected from each bind in a file, and loads them instead of
+    reflecting again while the file is valid. A file is valid if it was written for the
+    same database URL, SQLAlchemy version, and schema version.
+
+    The files are pickled, so the directory must only be writable by trusted users.
+
+    :param path: The directory to store cache files in.
+    :param version: A SQL string selecting a single value, or a function that takes a
+        connection and returns a value. The value is checked before using a cached file,
+        which is refreshed if the value has changed. For example, the current revision
+        from a migration tool.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        version: str | t.Callable[[sa.engine.Connection], t.Any] | None = None,
+    ) -> None:
+        self.path = path
+        self.version = version
+
+    def reflect(
+        self, metadata: sa.MetaData, bind_key: str | None, engine: sa.engine.Engine
+    ) -> None:
+        """Add the tables from the cached snapshot to the metadata, or reflect and save
+        a new snapshot if there is no valid cache file. Like ``metadata.reflect()``,
+        tables that are already in the metadata are not replaced.
+
+        :param metadata: The metadata to add tables to.
+        :param bind_key: The bind key, used to name the cache file.
+        :param engine: The engine to reflect from.
+        """
+        key = self._key(engine)
+        version = self._get_version(engine)
+        snapshot = self._load(bind_key, key, version)
+
+        if snapshot is None:
+            snapshot = sa.MetaData(schema=metadata.schema)
+            snapshot.reflect(bind=engine)
+            self._save(bind_key, key, version, snapshot)
+
+        for name, table in snapshot.tables.items():
+            if name not in metadata.tables:
+                table.to_metadata(metadata)
+
+    def clear(self, bind_key: str | None) -> None:
+        """Remove the cache file for a bind key, so that the next
+        :meth:`reflect` reflects from the database.
+
+        :param bind_key: The bind key to clear.
+        """
+        try:
+            os.remove(self._file(bind_key))
+        except FileNotFoundError:
+            pass
+
+    def _file(self, bind_key: str | None) -> str:
+        name = "default" if bind_key is None else f"bind-{bind_key}"
+        return os.path.join(self.path, f"{name}.pickle")
+
+    def _key(self, engine: sa.engine.Engine) -> str:
+        url = engine.url.render_as_string(hide_password=True)
+        value = f"{_format}:{sa.__version__}:{url}"
+        return hashlib.sha256(value.encode()).hexdigest()
+
+    def _get_version(self, engine: sa.engine.Engine) -> t.Any:
+        if self.version is None:
+            return None
+
+        with engine.connect() as conn:
+            if isinstance(self.version, str):
+                return conn.execute(sa.text(self.version)).scalar()
+
+            return self.version(conn)
+
+    def _load(self, bind_key: str | None, key: str, version: t.Any) -> t.Any:
+        try:
+            with open(self._file(bind_key), "rb") as f:
+                data = pickle.load(f)
+        except Exception:
+            # A file that doesn't exist or can't be loaded, such as one written by a
+            # different version of a library, is replaced.
+            return None
+
+        if data.get("key") != key or data.get("version") != version:
+            return None
+
+        return data["metadata"]
+
+    def _save(
+        self, bind_key: str | None, key: str, version: t.Any, metadata: sa.MetaData
+    ) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        data = {"key": key, "version": version, "metadata": metadata}
+        # Write to a temporary file then rename it, so that other processes never
+        # load a partially written file.
+        fd, temp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(data, f)
+
+            os.replace(temp, self._file(bind_key))
+        except BaseException:
+            os.remove(temp)
+            raise
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import itertools
+import typing as t
+
+import sqlalchemy as sa
+
+if t.TYPE_CHECKING:
+    from .health import _HealthChecker
+
+_strategies = {"round_robin", "least_connections"}
+
+
+class _ReplicaGroup:
+    """The read replica engines configured for a primary engine, and the strategy used
+    to choose between them. Replicas that the health checker has marked unhealthy are
+    skipped.
+
+    :param engines: The replica engines.
+    :param strategy: ``"round_robin"`` or ``"least_connections"``.
+    """
+
+    __slots__ = ("engines", "strategy", "health", "_counter")
+
+    def __init__(self, engines: list[sa.engine.Engine], strategy: str) -> None:
+        _check_strategy(strategy)
+        self.engines = engines
+        self.strategy = strategy
+        self.health: _HealthChecker | None = None
+        self._counter = itertools.count()
+
+    def choose(self) -> sa.engine.Engine | None:
+        """Choose a replica engine to use, or ``None`` if there are no healthy
+        replicas.
+        """
+        engines = self.engines
+
+        if self.health is not None:
+            engines = [e for e in engines if self.health.is_healthy(e)]
+
+        if not engines:
+            return None
+
+        # Rotate the starting point so ties are spread between replicas.
+        start = next(self._counter) % len(engines)
+        engines = engines[start:] + engines[:start]
+
+        if self.strategy == "least_connections":
+            return min(engines, key=_checked_out)
+
+        return engines[0]
+
+
+def _check_strategy(strategy: str) -> None:
+    """Raise a ``ValueError`` if the replica strategy name is not valid."""
+    if strategy not in _strategies:
+        raise ValueError(
+            f"Invalid replica strategy {strategy!r}. Must be 'round_robin' or"
+            " 'least_connections'."
+        )
+
+
+def _checked_out(engine: sa.engine.Engine) -> int:
+    """The number of connections currently checked out of the engine's pool. Pools
+    that don't track this are treated as having none.
+    """
+    checkedout = getattr(engine.pool, "checkedout", None)
+
+    if checkedout is None:
+        return 0
+
+    return t.cast(int, checkedout())
+
+
+def _is_read_only(clause: t.Any) -> bool:
+    """Whether the clause is a ``SELECT`` that doesn't lock rows with ``FOR UPDATE``,
+    and so can be sent to a replica.
+    """
+    return (
+        isinstance(clause, sa.sql.selectable.GenerativeSelect)
+        and clause._for_update_arg is None
+    )
@@ -1,12 +1,26 @@
 from __future__ import annotations
 
 import typing as t
+import zlib
+from contextlib import contextmanager
 
 import sqlalchemy as sa
+import sqlalchemy.event as sa_event
 import sqlalchemy.exc as sa_exc
 import sqlalchemy.orm as sa_orm
 from flask.globals import app_ctx
 
+from .model_cache import _cached_get
+from .model_cache import _discard_keys
+from .model_cache import _invalidate_committed
+from .model_cache import _invalidate_executed
+from .model_cache import _invalidate_flushed
+from .query_cache import _discard_tables
+from .query_cache import _invalidate_committed_tables
+from .query_cache import _record_executed
+from .query_cache import _record_flushed
+from .replicas import _is_read_only
+
 if t.TYPE_CHECKING:
     from .extension import SQLAlchemy
 
@@ -19,6 +33,17 @@ class Session(sa_orm.Session):
     To customize ``db.session``, subclass this and pass it as the ``class_`` key in the
     ``session_options`` to :class:`.SQLAlchemy`.
 
+    .. versionchanged:: 3.2
+        Read-only queries are sent to a replica if the bind has ``replicas``
+        configured.
+
+    .. versionchanged:: 3.2
+        Models with a bind key in :data:`.SQLALCHEMY_SHARDS` are sharded across
+        multiple engines.
+
+    .. versionchanged:: 3.2
+        ``get`` uses :data:`.SQLALCHEMY_MODEL_CACHE` for models with ``__cache__``.
+
     .. versionchanged:: 3.0
         Renamed from ``SignallingSession``.
     """
@@ -27,6 +52,99 @@ class Session(sa_orm.Session):
         super().__init__(**kwargs)
         self._db = db
         self._model_changes: dict[object, tuple[t.Any, str]] = {}
+        self._fsa_track: bool | tuple[type[t.Any], ...] = False
+        self._fsa_use_primary = 0
+        self._fsa_wrote = False
+        self._fsa_replicas: dict[sa.engine.Engine, sa.engine.Engine] = {}
+        self._fsa_shard: str | None = None
+        # Look up the app's features once, so that the session event listeners return
+        # immediately for features that are not enabled.
+        self._fsa_shards = db._shards
+        self._fsa_model_cache = db._model_cache
+        self._fsa_query_cache = db._query_cache
+
+        if self._fsa_shards:
+            self.connection_callable = self._connection_for_instance
+
+    @contextmanager
+    def using_primary(self) -> t.Iterator[None]:
+        """Send all queries to the primary engine within the ``with`` block, even
+        read-only queries that would otherwise go to a replica. Use this when a read
+        must see a write that may not have reached the replicas yet.
+
+        .. code-block:: python
+
+            with db.session.using_primary():
+                user = db.session.get(User, user_id)
+
+        .. versionadded:: 3.2
+        """
+        self._fsa_use_primary += 1
+
+        try:
+            yield
+        finally:
+            self._fsa_use_primary -= 1
+
+    @contextmanager
+    def for_shard(self, shard_id: str) -> t.Iterator[None]:
+        """Send all queries for sharded models to the given shard within the ``with``
+        block, instead of running them on every shard.
+
+        .. code-block:: python
+
+            with db.session.for_shard("tenants_1"):
+                orders = db.session.scalars(db.select(Order)).all()
+
+        :param shard_id: The bind key of one of the shards in
+            :data:`.SQLALCHEMY_SHARDS`. Use :meth:`.SQLAlchemy.get_shard` to find the
+            shard for a shard key value.
+
+        .. versionadded:: 3.2
+        """
+        previous = self._fsa_shard
+        self._fsa_shard = shard_id
+
+        try:
+            yield
+        finally:
+            self._fsa_shard = previous
+
+    def close(self) -> None:
+        """Close the session, and allow read-only queries to go to replicas again.
+
+        :meta private:
+        """
+        super().close()
+        self._fsa_wrote = False
+        self._fsa_replicas.clear()
+
+    def get(self, entity: t.Any, ident: t.Any, **kwargs: t.Any) -> t.Any:
+        """Get an instance by primary key. If :data:`.SQLALCHEMY_MODEL_CACHE` is
+        enabled and the model sets ``__cache__``, an instance that is not in the
+        session is loaded from the cache before the database. The cache is not used
+        if any other arguments are given, such as ``options``.
+
+        :meta private:
+
+        .. versionadded:: 3.2
+        """
+        cache = self._fsa_model_cache
+
+        if (
+            cache is not None
+            # The scoped session passes every argument, with default values.
+            and not any(kwargs.values())
+            and getattr(entity, "__cache__", None) is not None
+        ):
+            mapper = sa.inspect(entity)
+
+            # Sharded instances are not cached, since the shard is part of the
+            # identity.
+            if _mapper_bind_key(mapper) not in self._fsa_shards:
+                return _cached_get(self, cache, mapper, ident, super().get)
+
+        return super().get(entity, ident, **kwargs)
 
     def get_bind(
         self,
@@ -38,6 +156,20 @@ class Session(sa_orm.Session):
         """Select an engine based on the ``bind_key`` of the metadata associated with
         the model or table being queried. If no bind key is set, uses the default bind.
 
+        If the engine has ``replicas`` configured, a ``SELECT`` without ``FOR UPDATE``
+        is sent to one of the replicas instead, unless this session has written
+        anything or :meth:`using_primary` is active. The same replica is used until the
+        session is closed.
+
+        For a sharded model, the shard is given by :meth:`for_shard` or the
+        ``shard_id`` bind argument.
+
+        .. versionchanged:: 3.2
+            Route read-only queries to replicas.
+
+        .. versionchanged:: 3.2
+            Choose an engine for sharded models.
+
         .. versionchanged:: 3.0.3
             Fix finding the bind for a joined inheritance model.
 
@@ -50,7 +182,28 @@ class Session(sa_orm.Session):
         if bind is not None:
             return bind
 
+        shard_id = kwargs.get("shard_id") or self._fsa_shard
+        engine = self._get_primary_bind(mapper, clause, shard_id)
+
+        if engine is None:
+            return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+        if clause is not None and not _is_read_only(clause):
+            self._fsa_wrote = True
+
+        if self._fsa_use_primary or self._fsa_wrote or not _is_read_only(clause):
+            return engine
+
+        return self._get_replica(engine)
+
+    def _get_primary_bind(
+        self, mapper: t.Any | None, clause: t.Any | None, shard_id: str | None
+    ) -> sa.engine.Engine | None:
+        """Select the primary engine based on the bind key, or ``None`` if there is no
+        default engine to fall back to.
+        """
         engines = self._db.engines
+        shards = self._fsa_shards
 
         if mapper is not None:
             try:
@@ -61,29 +214,285 @@ class Session(sa_orm.Session):
 
                 raise
 
-            engine = _clause_to_engine(mapper.local_table, engines)
+            engine = _clause_to_engine(mapper.local_table, engines, shards, shard_id)
 
             if engine is not None:
                 return engine
 
         if clause is not None:
-            engine = _clause_to_engine(clause, engines)
+            engine = _clause_to_engine(clause, engines, shards, shard_id)
 
             if engine is not None:
                 return engine
 
-        if None in engines:
-            return engines[None]
+        return engines.get(None)
+
+    def _get_replica(self, engine: sa.engine.Engine) -> sa.engine.Engine:
+        """Choose a replica of the given primary engine, or the primary engine if it
+        has no replicas. The choice is remembered until the session is closed.
+        """
+        if engine in self._fsa_replicas:
+            return self._fsa_replicas[engine]
+
+        group = self._db._replica_groups.get(engine)
+        replica = group.choose() if group is not None else None
+
+        if replica is None:
+            return engine
+
+        self._fsa_replicas[engine] = replica
+        return replica
+
+    def _get_shard(
+        self,
+        mapper: sa_orm.Mapper[t.Any],
+        state: sa_orm.InstanceState[t.Any],
+        load: bool = True,
+    ) -> str | None:
+        """Choose the shard for an instance of a sharded model, using the value of its
+        ``__shard_key__`` attribute. Returns ``None`` if the model is not sharded.
+
+        :param mapper: The mapper of the model.
+        :param state: The instance's state.
+        :param load: Load the shard key attribute if it's not loaded, otherwise return
+            ``None`` if it's not loaded.
+        """
+        bind_key = _mapper_bind_key(mapper)
+        shards = self._fsa_shards.get(bind_key)
+
+        if shards is None:
+            return None
+
+        name = getattr(mapper.class_, "__shard_key__", None)
+
+        if name is None:
+            raise sa_exc.InvalidRequestError(
+                f"Model '{mapper.class_.__name__}' uses the sharded bind key"
+                f" '{bind_key}' but does not set '__shard_key__'."
+            )
+
+        if load:
+            value = getattr(state.obj(), name)
+        else:
+            value = state.dict.get(name)
+
+            if value is None:
+                return None
+
+        if value is None:
+            raise sa_exc.InvalidRequestError(
+                f"Can't choose a shard for {state.obj()!r}, its shard key '{name}' is"
+                " None."
+            )
+
+        return self._db._shard_resolver(value, shards)
+
+    def _connection_for_instance(
+        self,
+        mapper: sa_orm.Mapper[t.Any] | None = None,
+        instance: t.Any | None = None,
+        **kwargs: t.Any,
+    ) -> sa.engine.Connection:
+        """Get the connection to flush an instance with, using the shard chosen by the
+        instance's shard key if its model is sharded.
+        """
+        if mapper is None or instance is None:
+            return self.connection(bind_arguments={"mapper": mapper})
+
+        shard_id = self._instance_shard(mapper, sa.inspect(instance))
+        return self.connection(bind_arguments={"mapper": mapper, "shard_id": shard_id})
+
+    def _instance_shard(
+        self,
+        mapper: sa_orm.Mapper[t.Any],
+        state: sa_orm.InstanceState[t.Any],
+        load: bool = True,
+    ) -> str | None:
+        """Get the shard of an instance of a sharded model. An instance that was
+        loaded or flushed stays in the shard of its identity token. Otherwise, the shard
+        is chosen by its shard key, and set as its identity token so that it is
+        identified by its shard and primary key after it's flushed.
+
+        :param mapper: The mapper of the model.
+        :param state: The instance's state.
+        :param load: Load the shard key attribute if it's not loaded.
+        """
+        if state.key is not None and state.key[2] is not None:
+            return state.key[2]  # type: ignore[no-any-return]
+
+        if state.identity_token is not None:
+            return t.cast(str, state.identity_token)
+
+        shard_id = self._get_shard(mapper, state, load=load)
+
+        if shard_id is not None:
+            state.identity_token = shard_id
+
+        return shard_id
+
+    def _identity_lookup(  # type: ignore[override]
+        self,
+        mapper: sa_orm.Mapper[t.Any],
+        primary_key_identity: t.Any,
+        identity_token: t.Any = None,
+        **kwargs: t.Any,
+    ) -> t.Any:
+        """Find an instance of a sharded model in the identity map under the token
+        of each shard, or only the shard chosen with :meth:`for_shard` or the shard of
+        the instance it's lazy loaded from, unless a token is given.
+
+        :meta private:
+
+        .. versionadded:: 3.2
+        """
+        if identity_token is None:
+            bind_key = _mapper_bind_key(mapper)
+            shards = self._fsa_shards.get(bind_key)
+
+            if shards is not None:
+                state = kwargs.get("lazy_loaded_from")
+
+                if self._fsa_shard is not None:
+                    shards = [self._fsa_shard]
+                elif (
+                    state is not None
+                    and state.key is not None
+                    and _mapper_bind_key(state.mapper) == bind_key
+                ):
+                    shards = [state.key[2]]
+
+                for shard_id in shards:
+                    obj = super()._identity_lookup(
+                        mapper, primary_key_identity, identity_token=shard_id, **kwargs
+                    )
+
+                    if obj is not None:
+                        return obj
+
+                return None
+
+        return super()._identity_lookup(
+            mapper, primary_key_identity, identity_token=identity_token, **kwargs
+        )
+
+
+def _execute_sharded(orm_context: sa_orm.ORMExecuteState) -> t.Any:
+    """Run a query for a sharded model on every shard and merge the results, if a
+    shard was not chosen with :meth:`Session.for_shard`. Loading an expired attribute
+    or a relationship of a sharded instance only queries that instance's shard.
+
+    Each shard's ID is used as the identity token of the instances it loads, the same
+    as :mod:`sqlalchemy.ext.horizontal_shard`, so that instances with the same primary
+    key in different shards are separate.
+    """
+    session = t.cast(Session, orm_context.session)
+
+    if not session._fsa_shards:
+        return None
+
+    if orm_context.is_select:
+        options: t.Any = orm_context.load_options
+    elif orm_context.is_update or orm_context.is_delete:
+        options = orm_context.update_delete_options
+    else:
+        return None
 
-        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+    mapper = orm_context.bind_mapper
+
+    if mapper is None:
+        return None
+
+    bind_key = _mapper_bind_key(mapper)
+    shards = session._fsa_shards.get(bind_key)
+
+    if shards is None:
+        return None
+
+    shard_id = (
+        session._fsa_shard
+        or orm_context.bind_arguments.get("shard_id")
+        or options._identity_token
+    )
+
+    if shard_id is None and orm_context.is_select:
+        state = orm_context.lazy_loaded_from or options._refresh_state
+
+        if state is not None and _mapper_bind_key(state.mapper) == bind_key:
+            shard_id = session._instance_shard(state.mapper, state, load=False)
+
+    def execute(shard_id: str) -> t.Any:
+        orm_context.update_execution_options(identity_token=shard_id)
+        return orm_context.invoke_statement(bind_arguments={"shard_id": shard_id})
+
+    if shard_id is not None:
+        return execute(shard_id)
+
+    results = [execute(shard_id) for shard_id in shards]
+    return results[0].merge(*results[1:])
+
+
+def _mapper_bind_key(mapper: sa_orm.Mapper[t.Any]) -> str | None:
+    """The bind key of the metadata of the mapper's table."""
+    metadata = getattr(mapper.local_table, "metadata", None)
+
+    if metadata is None:
+        return None
+
+    return metadata.info.get("bind_key")  # type: ignore[no-any-return]
+
+
+def _hash_shard(value: t.Any, shards: t.Sequence[str]) -> str:
+    """The default shard resolver. Chooses a shard using a stable hash of the shard
+    key value. Integers are used directly.
+    """
+    if isinstance(value, int):
+        number = value
+    else:
+        number = zlib.crc32(str(value).encode())
+
+    return shards[number % len(shards)]
+
+
+def _after_flush(session: Session, flush_context: t.Any) -> None:
+    """Send all further queries to the primary once a flush has written anything."""
+    session._fsa_wrote = True
+
+
+sa_event.listen(Session, "after_flush", _after_flush)
+sa_event.listen(Session, "after_flush", _invalidate_flushed)
+sa_event.listen(Session, "after_commit", _invalidate_committed)
+sa_event.listen(Session, "after_rollback", _discard_keys)
+sa_event.listen(Session, "do_orm_execute", _invalidate_executed)
+sa_event.listen(Session, "after_flush", _record_flushed)
+sa_event.listen(Session, "do_orm_execute", _record_executed)
+sa_event.listen(Session, "after_commit", _invalidate_committed_tables)
+sa_event.listen(Session, "after_rollback", _discard_tables)
+sa_event.listen(Session, "do_orm_execute", _execute_sharded)
+
+
+class _ScopedSession(sa_orm.scoped_session[Session]):
+    """A :class:`~sqlalchemy.orm.scoping.scoped_session` that also proxies
+    :meth:`Session.using_primary` and :meth:`Session.for_shard`.
+    """
+
+    def using_primary(self) -> t.ContextManager[None]:
+        """Proxy for :meth:`Session.using_primary`."""
+        return self.registry().using_primary()
+
+    def for_shard(self, shard_id: str) -> t.ContextManager[None]:
+        """Proxy for :meth:`Session.for_shard`."""
+        return self.registry().for_shard(shard_id)
 
 
 def _clause_to_engine(
     clause: sa.ClauseElement | None,
     engines: t.Mapping[str | None, sa.engine.Engine],
+    shards: t.Mapping[str | None, list[str]] | None = None,
+    shard_id: str | None = None,
 ) -> sa.engine.Engine | None:
     """If the clause is a table, return the engine associated with the table's
-    metadata's bind key.
+    metadata's bind key. If the bind key is sharded, return the engine for the given
+    shard.
     """
     table = None
 
@@ -96,6 +505,21 @@ def _clause_to_engine(
     if table is not None and "bind_key" in table.metadata.info:
         key = table.metadata.info["bind_key"]
 
+        if shards and key in shards:
+            if shard_id is None:
+                raise sa_exc.UnboundExecutionError(
+                    f"Bind key '{key}' is sharded. Use 'session.for_shard()' to choose"
+                    " a shard."
+                )
+
+            if shard_id not in shards[key]:
+                raise sa_exc.UnboundExecutionError(
+                    f"Shard '{shard_id}' is not in 'SQLALCHEMY_SHARDS' config for bind"
+                    f" key '{key}'."
+                )
+
+            key = shard_id
+
         if key not in engines:
             raise sa_exc.UnboundExecutionError(
                 f"Bind key '{key}' is not in 'SQLALCHEMY_BINDS' config."
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import contextvars
+import typing as t
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+import sqlalchemy as sa
+import sqlalchemy.orm as sa_orm
+
+if t.TYPE_CHECKING:
+    from .session import Session
+
+
+def _stream(
+    session: sa_orm.Session,
+    select: sa.sql.Select[t.Any],
+    chunk_size: int,
+    scalars: bool,
+) -> t.Generator[t.Any, None, None]:
+    """Execute the select with ``yield_per``, yielding each result, and expunge the
+    ORM objects in each chunk after the next chunk is requested. The result is closed
+    if the generator is closed before it finishes.
+
+    The arguments are checked when this is called, the select is executed when the
+    generator is first advanced.
+
+    :param session: The session to execute with.
+    :param select: The ``select`` statement to execute.
+    :param chunk_size: The number of rows to fetch at a time.
+    :param scalars: Yield the first column of each row instead of the row.
+    """
+    _check_chunk_size(chunk_size)
+    return _stream_rows(session, select, chunk_size, scalars)
+
+
+def _stream_rows(
+    session: sa_orm.Session,
+    select: sa.sql.Select[t.Any],
+    chunk_size: int,
+    scalars: bool,
+) -> t.Generator[t.Any, None, None]:
+    entities = _entity_indexes(select)
+    result = session.execute(select, execution_options={"yield_per": chunk_size})
+
+    try:
+        for chunk in result.partitions():
+            for row in chunk:
+                yield row[0] if scalars else row
+
+            _expunge(session, chunk, entities)
+    finally:
+        result.close()
+
+
+def _check_chunk_size(chunk_size: int) -> None:
+    if chunk_size < 1:
+        raise ValueError("'chunk_size' must be at least 1.")
+
+
+def _entity_indexes(select: sa.sql.Select[t.Any]) -> list[int]:
+    """The positions of the columns in the select's rows that are ORM entities, which
+    should be expunged from the session once they are processed.
+    """
+    return [
+        i
+        for i, desc in enumerate(select.column_descriptions)
+        if desc.get("entity") is not None and desc["expr"] is desc["entity"]
+    ]
+
+
+def _expunge(
+    session: sa_orm.Session, chunk: t.Sequence[sa.Row[t.Any]], entities: list[int]
+) -> None:
+    """Remove the ORM objects in a chunk of rows from the session, so that they can be
+    garbage collected.
+    """
+    for row in chunk:
+        for i in entities:
+            obj = row[i]
+
+            if obj is not None and obj in session:
+                session.expunge(obj)
+
+
+def _chunk_select(
+    model: type[t.Any],
+    where: sa.ColumnElement[bool] | None,
+    after: tuple[t.Any, ...] | None,
+    chunk_size: int | None,
+    columns: t.Sequence[t.Any] | None = None,
+) -> sa.Select[t.Any]:
+    """Select the next chunk of a model ordered by primary key, starting after the
+    given primary key.
+
+    :param model: The model to select.
+    :param where: An extra condition to filter by.
+    :param after: Select rows with a primary key greater than this.
+    :param chunk_size: The maximum number of rows to select.
+    :param columns: Select these columns instead of the model.
+    """
+    pk = sa.inspect(model).primary_key
+    key = pk[0] if len(pk) == 1 else sa.tuple_(*pk)
+    select = sa.select(*columns) if columns is not None else sa.select(model)
+    select = select.order_by(*pk)
+
+    if where is not None:
+        select = select.where(where)
+
+    if after is not None:
+        select = select.where(key > (after[0] if len(pk) == 1 else sa.tuple_(*after)))
+
+    if chunk_size is not None:
+        select = select.limit(chunk_size)
+
+    return select
+
+
+def _iter_chunks(
+    session_factory: t.Callable[[], Session],
+    model: type[t.Any],
+    chunk_size: int,
+    where: sa.ColumnElement[bool] | None,
+    process: t.Callable[[list[t.Any]], t.Any] | None,
+    workers: int | None,
+) -> t.Generator[t.Any, None, None]:
+    """Walk a model's table in primary key order, loading each chunk in a new session
+    that is committed after the chunk is processed. With ``workers``, the primary key
+    range of each chunk is found first, then the chunk is loaded and processed in a
+    worker thread. Rows are read from the primary engine, since the chunks are likely
+    to be modified.
+
+    The arguments are checked when this is called, no chunks are loaded until the
+    generator is first advanced.
+    """
+    _check_chunk_size(chunk_size)
+
+    if workers is not None:
+        if process is None:
+            raise ValueError("'process' is required when using 'workers'.")
+
+        if workers < 1:
+            raise ValueError("'workers' must be at least 1.")
+
+        return _iter_chunks_parallel(
+            session_factory, model, chunk_size, where, process, workers
+        )
+
+    return _iter_chunks_serial(session_factory, model, chunk_size, where, process)
+
+
+def _iter_chunks_serial(
+    session_factory: t.Callable[[], Session],
+    model: type[t.Any],
+    chunk_size: int,
+    where: sa.ColumnElement[bool] | None,
+    process: t.Callable[[list[t.Any]], t.Any] | None,
+) -> t.Generator[t.Any, None, None]:
+    mapper = sa.inspect(model)
+    after = None
+
+    while True:
+        with session_factory() as session, session.using_primary():
+            select = _chunk_select(model, where, after, chunk_size)
+            items = list(session.scalars(select))
+
+            if not items:
+                return
+
+            after = mapper.primary_key_from_instance(items[-1])
+            yield items if process is None else process(items)
+            session.commit()
+
+        if len(items) < chunk_size:
+            return
+
+
+def _iter_chunks_parallel(
+    session_factory: t.Callable[[], Session],
+    model: type[t.Any],
+    chunk_size: int,
+    where: sa.ColumnElement[bool] | None,
+    process: t.Callable[[list[t.Any]], t.Any],
+    workers: int,
+) -> t.Generator[t.Any, None, None]:
+    pk = sa.inspect(model).primary_key
+    after = None
+    pending: deque[Future[t.Any]] = deque()
+
+    def run(first: tuple[t.Any, ...], last: tuple[t.Any, ...]) -> t.Any:
+        with session_factory() as session, session.using_primary():
+            # Select the chunk's primary key range, including both ends.
+            select = _chunk_select(model, where, None, None)
+
+            if len(pk) == 1:
+                select = select.where(pk[0].between(first[0], last[0]))
+            else:
+                key = sa.tuple_(*pk)
+                select = select.where(key >= sa.tuple_(*first), key <= sa.tuple_(*last))
+
+            result = process(list(session.scalars(select)))
+            session.commit()
+            return result
+
+    with ThreadPoolExecutor(workers, thread_name_prefix="flask_sqlalchemy") as executor:
+        try:
+            while True:
+                with session_factory() as session, session.using_primary():
+                    select = _chunk_select(model, where, after, chunk_size, pk)
+                    keys = [tuple(row) for row in session.execute(select)]
+
+                if keys:
+                    after = keys[-1]
+                    ctx = contextvars.copy_context()
+                    pending.append(executor.submit(ctx.run, run, keys[0], keys[-1]))
+
+                # Limit how many chunks are waiting to be processed.
+                while len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+
+                if len(keys) < chunk_size:
+                    break
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import functools
+import typing as t
+from time import perf_counter
+
+import sqlalchemy as sa
+import sqlalchemy.event as sa_event
+from flask import g
+from flask import has_app_context
+
+_timeout_key = "_fsa_statement_timeout"
+_deadline_key = "_fsa_statement_deadline"
+
+
+class _StatementTimeout:
+    """Limits how long each statement on an engine may run. The timeout is applied to
+    a connection when it is checked out from the pool, and only changes the
+    connection if the timeout is different than the last time it was checked out.
+
+    PostgreSQL sets ``statement_timeout``, MySQL sets ``max_execution_time`` (which
+    only applies to ``SELECT``), MariaDB sets ``max_statement_time``, and SQLite
+    interrupts the statement using a progress handler. Other databases are not
+    limited.
+
+    :param timeout: The timeout in seconds, or ``None`` for no timeout.
+    """
+
+    def __init__(self, timeout: float | None) -> None:
+        self.timeout = timeout
+
+    def listen(self, engine: sa.engine.Engine) -> None:
+        name = engine.dialect.name
+
+        if name not in {"postgresql", "mysql", "mariadb", "sqlite"}:
+            return
+
+        on_checkout = functools.partial(self._on_checkout, engine.dialect)
+        sa_event.listen(engine, "checkout", on_checkout)
+
+        if name == "sqlite":
+            sa_event.listen(engine, "before_cursor_execute", _start_deadline)
+
+    def _on_checkout(
+        self,
+        dialect: sa.engine.Dialect,
+        dbapi_connection: t.Any,
+        record: t.Any,
+        proxy: sa.pool.PoolProxiedConnection,
+    ) -> None:
+        timeout = self.timeout
+
+        if has_app_context():
+            timeout = g.get("_sqlalchemy_statement_timeout", timeout)
+
+        # Setting a timeout of 0 disables it, the same as None.
+        timeout = timeout or None
+
+        if record.info.get(_timeout_key) == timeout:
+            return
+
+        _set_timeout(dialect, dbapi_connection, record.info, timeout)
+
+
+def _set_timeout(
+    dialect: sa.engine.Dialect,
+    dbapi_connection: t.Any,
+    info: dict[str, t.Any],
+    timeout: float | None,
+) -> None:
+    """Apply the timeout to a DBAPI connection, and remember it in the connection
+    record's info.
+    """
+    name = dialect.name
+
+    if name == "sqlite":
+        if not hasattr(dbapi_connection, "set_progress_handler"):
+            # Drivers such as aiosqlite don't expose the progress handler.
+            return
+
+        if timeout is None:
+            dbapi_connection.set_progress_handler(None, 0)
+        else:
+            # Check the deadline every 1000 virtual machine instructions.
+            handler = functools.partial(_past_deadline, info)
+            dbapi_connection.set_progress_handler(handler, 1000)
+    else:
+        if name == "postgresql":
+            sql = f"SET statement_timeout = {int((timeout or 0) * 1000)}"
+        elif name == "mariadb" or getattr(dialect, "is_mariadb", False):
+            sql = f"SET SESSION max_statement_time = {timeout or 0}"
+        else:
+            sql = f"SET SESSION max_execution_time = {int((timeout or 0) * 1000)}"
+
+        cursor = dbapi_connection.cursor()
+
+        try:
+            cursor.execute(sql)
+        finally:
+            cursor.close()
+
+        # The setting is transactional in PostgreSQL, commit it so that the pool's
+        # rollback when the connection is returned does not undo it.
+        dbapi_connection.commit()
+
+    info[_timeout_key] = timeout
+
+
+def _start_deadline(
+    conn: sa.engine.Connection,
+    cursor: t.Any,
+    statement: str,
+    parameters: t.Any,
+    context: t.Any,
+    executemany: bool,
+) -> None:
+    """Record when the SQLite statement must finish by, for the progress handler."""
+    timeout = conn.info.get(_timeout_key)
+
+    if timeout is not None:
+        conn.info[_deadline_key] = perf_counter() + timeout
+
+
+def _past_deadline(info: dict[str, t.Any]) -> bool:
+    """The SQLite progress handler. Returning true interrupts the statement."""
+    deadline = info.get(_deadline_key)
+    return deadline is not None and perf_counter() > deadline
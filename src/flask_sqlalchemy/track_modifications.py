@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import atexit
+import queue
+import threading
 import typing as t
+import weakref
 
 import sqlalchemy as sa
 import sqlalchemy.event as sa_event
-import sqlalchemy.orm as sa_orm
 from flask import current_app
+from flask import Flask
 from flask import has_app_context
 from flask.signals import Namespace  # type: ignore[attr-defined]
 
@@ -21,6 +25,14 @@ models in the session.
 The sender is the application that emitted the changes. The receiver is passed the
 ``changes`` argument with a list of tuples in the form ``(instance, operation)``.
 The operations are ``"insert"``, ``"update"``, and ``"delete"``.
+
+If :data:`.SQLALCHEMY_TRACK_MODIFICATIONS_QUEUE` is set, the signal is sent from a
+background thread with an app context pushed, and the tuples are in the form
+``(model, identity, operation)`` instead, where ``identity`` is the instance's primary
+key tuple.
+
+.. versionchanged:: 3.2
+    Can be sent from a background thread.
 """
 
 before_models_committed = _signals.signal("before-models-committed")
@@ -29,60 +41,209 @@ commit takes place.
 """
 
 
-def _listen(session: sa_orm.scoped_session[Session]) -> None:
-    sa_event.listen(session, "before_flush", _record_ops, named=True)
-    sa_event.listen(session, "before_commit", _record_ops, named=True)
+def _listen(session: t.Any) -> None:
+    sa_event.listen(session, "before_flush", _record_updates)
+    sa_event.listen(session, "pending_to_persistent", _record_insert)
+    sa_event.listen(session, "persistent_to_deleted", _record_delete)
     sa_event.listen(session, "before_commit", _before_commit)
     sa_event.listen(session, "after_commit", _after_commit)
     sa_event.listen(session, "after_rollback", _after_rollback)
 
 
-def _record_ops(session: Session, **kwargs: t.Any) -> None:
-    if not has_app_context():
-        return
+def _record_updates(session: Session, flush_context: t.Any, instances: t.Any) -> None:
+    """Look up which models are tracked for the current app once per flush, then
+    record the instances that will be updated. Inserts and deletes are recorded by the
+    per-instance events as the flush processes them, so ``session.new`` and
+    ``session.deleted``, which may be large, don't need to be copied and inspected.
+    """
+    session._fsa_track = models = session._db._track_modifications
 
-    if not current_app.config["SQLALCHEMY_TRACK_MODIFICATIONS"]:
+    if models is False:
         return
 
-    for targets, operation in (
-        (session.new, "insert"),
-        (session.dirty, "update"),
-        (session.deleted, "delete"),
-    ):
-        for target in targets:
-            state = sa.inspect(target)
-            key = state.identity_key if state.has_identity else id(target)
-            session._model_changes[key] = (target, operation)
+    for target in session.dirty:
+        if models is True or isinstance(target, models):
+            session._model_changes[sa.inspect(target).identity_key] = (target, "update")
 
 
-def _before_commit(session: Session) -> None:
-    if not has_app_context():
-        return
+def _record_insert(session: Session, target: t.Any) -> None:
+    models = session._fsa_track
+
+    if models is True or (models is not False and isinstance(target, models)):
+        # Keyed by id, as it was before it had an identity, so that a later update in
+        # the same transaction is recorded separately.
+        session._model_changes[id(target)] = (target, "insert")
+
+
+def _record_delete(session: Session, target: t.Any) -> None:
+    models = session._fsa_track
+
+    if models is True or (models is not False and isinstance(target, models)):
+        session._model_changes[sa.inspect(target).identity_key] = (target, "delete")
 
-    app = current_app._get_current_object()  # type: ignore[attr-defined]
 
-    if not app.config["SQLALCHEMY_TRACK_MODIFICATIONS"]:
+def _before_commit(session: Session) -> None:
+    if not session._db._track_modifications:
         return
 
+    # Flush now instead of during the commit, so that the pending changes are recorded
+    # before the signal is sent.
+    session.flush()
+
     if session._model_changes:
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
         changes = list(session._model_changes.values())
         before_models_committed.send(app, changes=changes)
 
 
 def _after_commit(session: Session) -> None:
-    if not has_app_context():
+    if not session._model_changes:
         return
 
-    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    if has_app_context():
+        app = current_app._get_current_object()  # type: ignore[attr-defined]
+        signal_queue = session._db._signal_queue
+
+        if signal_queue is None:
+            changes = list(session._model_changes.values())
+            models_committed.send(app, changes=changes)
+        else:
+            # Don't pass live instances to another thread, where they would be used
+            # outside their session.
+            signal_queue.put(
+                app,
+                [
+                    (type(target), sa.inspect(target).identity, operation)
+                    for target, operation in session._model_changes.values()
+                ],
+            )
 
-    if not app.config["SQLALCHEMY_TRACK_MODIFICATIONS"]:
-        return
-
-    if session._model_changes:
-        changes = list(session._model_changes.values())
-        models_committed.send(app, changes=changes)
-        session._model_changes.clear()
+    session._model_changes.clear()
 
 
 def _after_rollback(session: Session) -> None:
     session._model_changes.clear()
+
+
+class _SignalQueue:
+    """Sends :data:`models_committed` from a daemon thread, so that slow receivers
+    don't delay the commit. The thread is started when the first changes are queued.
+    Queued changes are sent before the process exits.
+
+    :param maxsize: The maximum number of commits waiting to be sent, or 0 for no
+        limit.
+    :param full: What to do when the queue is full. ``"block"`` waits for space, and
+        ``"drop"`` discards the changes and logs a warning.
+    """
+
+    def __init__(self, maxsize: int = 0, full: str = "block") -> None:
+        if full not in {"block", "drop"}:
+            raise ValueError(
+                f"Queue full action must be 'block' or 'drop', not {full!r}."
+            )
+
+        self.maxsize = maxsize
+        self.full = full
+        self.dropped = 0
+        self._queue: queue.Queue[tuple[Flask, list[t.Any]] | None]
+        self._queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        _signal_queues.add(self)
+
+    def put(self, app: Flask, changes: list[t.Any]) -> None:
+        """Queue changes to be sent, starting the thread if needed.
+
+        :param app: The application that committed the changes.
+        :param changes: The ``(model, identity, operation)`` tuples to send.
+        """
+        if threading.current_thread() is self._thread:
+            # A receiver committed from the thread. Waiting for space in the queue
+            # would wait for the thread itself, so send the changes now.
+            models_committed.send(app, changes=changes)
+            return
+
+        self._start()
+
+        if self.full == "block":
+            self._queue.put((app, changes))
+            return
+
+        try:
+            self._queue.put_nowait((app, changes))
+        except queue.Full:
+            self.dropped += 1
+            app.logger.warning(
+                "The 'models_committed' queue is full, dropped %d changes.",
+                len(changes),
+            )
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until every queued signal has been sent. Returns ``False`` if the
+        timeout passed first.
+
+        :param timeout: The maximum number of seconds to wait.
+        """
+        q = self._queue
+
+        with q.all_tasks_done:
+            return q.all_tasks_done.wait_for(lambda: not q.unfinished_tasks, timeout)
+
+    def stop(self) -> None:
+        """Send the remaining queued signals, then stop the thread."""
+        with self._lock:
+            thread = self._thread
+
+            if thread is None:
+                return
+
+            self._queue.put(None)
+            thread.join()
+            self._thread = None
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="flask-sqlalchemy-signals", daemon=True
+                )
+                self._thread.start()
+
+    def _restart_after_fork(self) -> None:
+        """Discard the parent's thread and queue in a forked child process. The parent
+        still sends the changes it queued.
+        """
+        self._queue = queue.Queue(self.maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+
+            try:
+                if item is None:
+                    return
+
+                app, changes = item
+
+                with app.app_context():
+                    try:
+                        models_committed.send(app, changes=changes)
+                    except Exception:
+                        app.logger.exception("Error in a 'models_committed' receiver.")
+            finally:
+                self._queue.task_done()
+
+
+_signal_queues: weakref.WeakSet[_SignalQueue] = weakref.WeakSet()
+"""Every signal queue, so that queued changes are sent before the process exits."""
+
+
+@atexit.register
+def _stop_signal_queues() -> None:
+    for signal_queue in list(_signal_queues):
+        signal_queue.stop()
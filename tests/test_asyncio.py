@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import asyncio
+import typing as t
+
+import pytest
+import sqlalchemy as sa
+import sqlalchemy.ext.asyncio as sa_async
+from flask import Flask
+from werkzeug.exceptions import NotFound
+
+from flask_sqlalchemy.asyncio import AsyncSQLAlchemy
+from flask_sqlalchemy.pagination import KeysetPagination
+from flask_sqlalchemy.pagination import Pagination
+from flask_sqlalchemy.session import Session
+
+
+@pytest.fixture
+def app(app: Flask) -> Flask:
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite+aiosqlite://"
+    app.config["SQLALCHEMY_BINDS"] = {"a": "sqlite+aiosqlite://"}
+    return app
+
+
+@pytest.fixture
+def db(app: Flask) -> t.Generator[AsyncSQLAlchemy, None, None]:
+    db = AsyncSQLAlchemy(app)
+    yield db
+
+    # Close pooled connections, aiosqlite's worker threads prevent exiting otherwise.
+    async def dispose() -> None:
+        for engine in db.async_engines.values():
+            await engine.dispose()
+
+    with app.app_context():
+        asyncio.run(dispose())
+
+
+def _make_models(db: AsyncSQLAlchemy) -> tuple[t.Any, t.Any]:
+    class Todo(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+        title = sa.Column(sa.String)
+
+    class Post(db.Model):
+        __bind_key__ = "a"
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    return Todo, Post
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_engines(db: AsyncSQLAlchemy) -> None:
+    assert isinstance(db.async_engine, sa_async.AsyncEngine)
+    assert db.async_engine.sync_engine is db.engine
+    assert db.async_engines["a"].sync_engine is db.engines["a"]
+    assert isinstance(db.engine.pool, sa.pool.StaticPool)
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_session(db: AsyncSQLAlchemy) -> None:
+    Todo, Post = _make_models(db)
+
+    async def run() -> None:
+        await db.create_all()
+        session = db.session()
+        assert isinstance(session, sa_async.AsyncSession)
+        assert session is db.session()
+        assert isinstance(session.sync_session, Session)
+        assert session.sync_session.get_bind(Post) is db.engines["a"]
+        db.session.add_all([Todo(title="a"), Post()])
+        await db.session.commit()
+        assert await db.session.scalar(sa.select(sa.func.count(Post.id))) == 1
+
+        async with db.async_engines["a"].connect() as conn:
+            assert await conn.scalar(sa.select(sa.func.count(Post.id))) == 1
+
+        await db.session.remove()
+
+    asyncio.run(run())
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_create_all_parallel(db: AsyncSQLAlchemy) -> None:
+    Todo, Post = _make_models(db)
+
+    async def run() -> None:
+        await db.create_all(parallel=True)
+        db.session.add_all([Todo(), Post()])
+        await db.session.commit()
+        await db.drop_all(parallel=True)
+
+        with pytest.raises(sa.exc.OperationalError):
+            await db.session.execute(sa.select(Post))
+
+        await db.session.remove()
+
+    asyncio.run(run())
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_or_404(db: AsyncSQLAlchemy) -> None:
+    Todo, _ = _make_models(db)
+
+    async def run() -> None:
+        await db.create_all()
+        db.session.add(Todo(title="a"))
+        await db.session.commit()
+        assert (await db.get_or_404(Todo, 1)).title == "a"
+        assert [todo.id for todo in await db.get_many_or_404(Todo, [1])] == [1]
+        assert await db.get_many(Todo, [2]) == [None]
+        assert (await db.first_or_404(sa.select(Todo))).id == 1
+        assert (await db.one_or_404(sa.select(Todo))).id == 1
+
+        with pytest.raises(NotFound):
+            await db.get_or_404(Todo, 2)
+
+        with pytest.raises(NotFound):
+            await db.first_or_404(sa.select(Todo).where(Todo.id == 2))
+
+        with pytest.raises(NotFound):
+            await db.one_or_404(sa.select(Todo).where(Todo.id == 2))
+
+        await db.session.remove()
+
+    asyncio.run(run())
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_paginate(db: AsyncSQLAlchemy) -> None:
+    Todo, _ = _make_models(db)
+
+    async def run() -> None:
+        await db.create_all()
+        db.session.add_all([Todo(title=str(i)) for i in range(25)])
+        await db.session.commit()
+        p = await db.paginate(sa.select(Todo).order_by(Todo.id), page=2)
+        assert isinstance(p, Pagination)
+        assert p.total == 25
+        assert [t.id for t in p.items] == list(range(21, 26))
+
+        with pytest.raises(NotFound):
+            await db.paginate(sa.select(Todo), page=3)
+
+        await db.session.remove()
+
+    asyncio.run(run())
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_keyset_paginate(db: AsyncSQLAlchemy) -> None:
+    Todo, _ = _make_models(db)
+
+    async def run() -> None:
+        await db.create_all()
+        db.session.add_all([Todo(title=str(i)) for i in range(25)])
+        await db.session.commit()
+        select = sa.select(Todo).order_by(Todo.id)
+        p = await db.keyset_paginate(select, per_page=10)
+        assert isinstance(p, KeysetPagination)
+        assert [t.id for t in p.items] == list(range(1, 11))
+        assert p.next_cursor is not None
+        p = await db.keyset_paginate(select, cursor=p.next_cursor, per_page=10)
+        assert [t.id for t in p.items] == list(range(11, 21))
+        assert p.prev_cursor is not None
+        p = await db.keyset_paginate(select, cursor=p.prev_cursor, per_page=10)
+        assert [t.id for t in p.items] == list(range(1, 11))
+
+        with pytest.raises(NotFound):
+            await db.keyset_paginate(select, cursor="invalid")
+
+        await db.session.remove()
+
+    asyncio.run(run())
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_bulk(db: AsyncSQLAlchemy) -> None:
+    Todo, _ = _make_models(db)
+
+    async def run() -> None:
+        await db.create_all()
+        new_rows = ({"title": str(i)} for i in range(5))
+        keys = await db.bulk_insert(Todo, new_rows, batch_size=2, return_keys=True)
+        assert keys is not None
+        assert [tuple(r) for r in keys] == [(i,) for i in range(1, 6)]
+        rows = [{"id": 1, "title": "a"}, {"id": 6, "title": "b"}]
+        await db.bulk_upsert(Todo, rows, conflict_cols=["id"])
+        titles = await db.session.scalars(sa.select(Todo.title).order_by(Todo.id))
+        assert titles.all() == ["a", "1", "2", "3", "4", "b"]
+        await db.session.remove()
+
+    asyncio.run(run())
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_stream(db: AsyncSQLAlchemy) -> None:
+    Todo, _ = _make_models(db)
+
+    async def run() -> None:
+        await db.create_all()
+        await db.bulk_insert(Todo, ({"title": str(i)} for i in range(5)))
+        select = sa.select(Todo).order_by(Todo.id)
+        ids = [todo.id async for todo in db.stream(select, chunk_size=2)]
+        assert ids == [1, 2, 3, 4, 5]
+        assert len(db.session.identity_map) == 0
+        await db.session.remove()
+
+    asyncio.run(run())
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_iter_chunks(db: AsyncSQLAlchemy) -> None:
+    Todo, _ = _make_models(db)
+
+    async def run() -> None:
+        await db.create_all()
+        await db.bulk_insert(Todo, ({"title": str(i)} for i in range(5)))
+        await db.session.commit()
+        await db.session.remove()
+        chunks = []
+
+        async for todos in db.iter_chunks(Todo, chunk_size=2):
+            chunks.append([todo.id for todo in todos])
+
+            for todo in todos:
+                todo.title = "done"
+
+        assert chunks == [[1, 2], [3, 4], [5]]
+        titles = await db.session.scalars(sa.select(Todo.title))
+        assert set(titles) == {"done"}
+        await db.session.remove()
+
+    asyncio.run(run())
+
+
+def test_async_view(app: Flask, db: AsyncSQLAlchemy) -> None:
+    Todo, _ = _make_models(db)
+
+    with app.app_context():
+        asyncio.run(db.create_all())
+
+    @app.post("/")
+    async def create() -> str:
+        db.session.add(Todo(title="a"))
+        await db.session.commit()
+        return str((await db.get_or_404(Todo, 1)).title)
+
+    assert app.test_client().post("/").text == "a"
+
+
+def test_requires_async_driver(app: Flask) -> None:
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+
+    with pytest.raises(sa.exc.InvalidRequestError, match="async"):
+        AsyncSQLAlchemy(app)
+
+
+def test_no_background_health_check(app: Flask) -> None:
+    app.config["SQLALCHEMY_HEALTH_CHECK_INTERVAL"] = 1
+
+    with pytest.raises(RuntimeError, match="check_health"):
+        AsyncSQLAlchemy(app)
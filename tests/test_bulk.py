@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import typing as t
+import unittest.mock
+
+import pytest
+import sqlalchemy as sa
+import sqlalchemy.dialects.mssql
+import sqlalchemy.dialects.mysql
+import sqlalchemy.orm as sa_orm
+from flask import Flask
+
+from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.bulk import _upsert_statement
+
+
+def _make_model(db: SQLAlchemy) -> t.Any:
+    class Item(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+        sku = sa.Column(sa.String, unique=True)
+        qty = sa.Column("quantity", sa.Integer)
+
+    db.create_all()
+    return Item
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_bulk_insert(db: SQLAlchemy) -> None:
+    Item = _make_model(db)
+    rows = ({"sku": str(i), "qty": i} for i in range(5))
+    assert db.bulk_insert(Item, rows, batch_size=2) is None
+    # Inserted rows are not added to the session.
+    assert not db.session.new
+    assert db.session.scalar(sa.select(sa.func.count(Item.id))) == 5
+    keys = db.bulk_insert(Item, [{"sku": "a"}, {"sku": "b"}], return_keys=True)
+    assert keys is not None
+    assert [tuple(r) for r in keys] == [(6,), (7,)]
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_bulk_insert_batches(db: SQLAlchemy) -> None:
+    Item = _make_model(db)
+
+    with unittest.mock.patch.object(
+        db.session(), "execute", wraps=db.session().execute
+    ) as execute:
+        db.bulk_insert(Item, ({"sku": str(i)} for i in range(5)), batch_size=2)
+
+    assert [len(c.args[1]) for c in execute.call_args_list] == [2, 2, 1]
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_bulk_upsert(db: SQLAlchemy) -> None:
+    Item = _make_model(db)
+    db.bulk_insert(Item, [{"sku": "a", "qty": 1}, {"sku": "b", "qty": 1}])
+    rows = [{"sku": "a", "qty": 2}, {"sku": "c", "qty": 2}]
+    keys = db.bulk_upsert(Item, rows, conflict_cols=["sku"], return_keys=True)
+    assert keys is not None
+    assert [tuple(r) for r in keys] == [(1,), (3,)]
+    rows = [{"sku": "b", "qty": 3}]
+    db.bulk_upsert(Item, rows, conflict_cols=["sku"], update_cols=[])
+    result = db.session.execute(sa.select(Item.sku, Item.qty).order_by(Item.id))
+    assert [tuple(r) for r in result] == [("a", 2), ("b", 1), ("c", 2)]
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_bulk_upsert_batch_keys(db: SQLAlchemy) -> None:
+    Item = _make_model(db)
+    db.bulk_insert(Item, [{"sku": "a", "qty": 1}, {"sku": "b", "qty": 1}])
+    # Each batch updates the columns in its own rows.
+    rows: list[dict[str, t.Any]] = [{"sku": "a"}, {"sku": "b", "qty": 2}]
+    db.bulk_upsert(Item, rows, conflict_cols=["sku"], batch_size=1)
+    result = db.session.execute(sa.select(Item.sku, Item.qty).order_by(Item.id))
+    assert [tuple(r) for r in result] == [("a", 1), ("b", 2)]
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_bulk_insert_bind(app: Flask) -> None:
+    app.config["SQLALCHEMY_BINDS"] = {"a": "sqlite://"}
+    db = SQLAlchemy(app)
+
+    class Post(db.Model):
+        __bind_key__ = "a"
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    db.create_all()
+    db.bulk_insert(Post, [{}, {}])
+
+    with db.engines["a"].connect() as conn:
+        assert conn.scalar(sa.select(sa.func.count()).select_from(Post)) == 2
+
+
+def test_upsert_mysql(db: SQLAlchemy) -> None:
+    class Item(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+        qty = sa.Column("quantity", sa.Integer)
+
+    mapper = sa_orm.class_mapper(Item)
+    dialect = sa.dialects.mysql.dialect()  # type: ignore[no-untyped-call]
+    statement = _upsert_statement(["id"], None)(dialect, mapper, mapper, ["id", "qty"])
+    sql = str(statement.compile(dialect=dialect))
+    assert sql.endswith("ON DUPLICATE KEY UPDATE quantity = VALUES(quantity)")
+    statement = _upsert_statement(["id"], [])(dialect, mapper, mapper, ["id"])
+    sql = str(statement.compile(dialect=dialect))
+    assert sql.endswith("ON DUPLICATE KEY UPDATE id = item.id")
+
+
+def test_upsert_unsupported(db: SQLAlchemy) -> None:
+    class Item(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    mapper = sa_orm.class_mapper(Item)
+    dialect = sa.dialects.mssql.dialect()  # type: ignore[no-untyped-call]
+
+    with pytest.raises(ValueError, match="'mssql' dialect"):
+        _upsert_statement(["id"], None)(dialect, mapper, mapper, ["id"])
@@ -129,3 +129,79 @@ def test_mysql_defaults(
     options = make_engine.call_args[0][2]
     assert options["pool_recycle"] == 7200
     assert options["url"].query["charset"] == "utf8mb4"
+
+
+def test_lazy_engines(app: Flask) -> None:
+    app.config["SQLALCHEMY_LAZY_ENGINES"] = True
+    app.config["SQLALCHEMY_BINDS"] = {"a": "sqlite://", "b": "sqlite://"}
+
+    with unittest.mock.patch.object(
+        SQLAlchemy, "_make_engine", autospec=True, wraps=SQLAlchemy._make_engine
+    ) as make_engine:
+        db = SQLAlchemy(app)
+        assert not make_engine.called
+
+        with app.app_context():
+            assert list(db.engines) == ["a", "b", None]
+            assert "b" in db.engines
+            assert repr(db) == "<SQLAlchemy sqlite:// +2 engines>"
+            assert db.replica_engines == {}
+            assert not make_engine.called
+            engine = db.engines["a"]
+            assert db.engines["a"] is engine
+            assert make_engine.call_count == 1
+
+            with pytest.raises(KeyError):
+                db.engines["c"]
+
+
+def test_lazy_engines_validate(app: Flask) -> None:
+    app.config["SQLALCHEMY_LAZY_ENGINES"] = True
+    app.config["SQLALCHEMY_BINDS"] = {
+        "a": {
+            "url": "sqlite://",
+            "replicas": ["sqlite://"],
+            "replica_strategy": "random",
+        }
+    }
+
+    with pytest.raises(ValueError, match="replica strategy"):
+        SQLAlchemy(app)
+
+
+def test_after_fork_replaces_pool(app: Flask) -> None:
+    app.config["SQLALCHEMY_BINDS"] = {"a": "sqlite://"}
+    db = SQLAlchemy(app)
+
+    with app.app_context():
+        pools = {key: engine.pool for key, engine in db.engines.items()}
+
+        with unittest.mock.patch.object(
+            sa.pool.Pool, "dispose", autospec=True
+        ) as dispose:
+            db._after_fork_in_child()
+
+        # The inherited connections are not closed.
+        assert not dispose.called
+
+        for key, engine in db.engines.items():
+            assert engine.pool is not pools[key]
+
+
+@pytest.mark.parametrize("after_fork", [False, True])
+def test_connect_after_fork(app: Flask, after_fork: bool) -> None:
+    app.config["SQLALCHEMY_CONNECT_AFTER_FORK"] = after_fork
+
+    with unittest.mock.patch.object(
+        SQLAlchemy, "_make_engine", autospec=True, wraps=SQLAlchemy._make_engine
+    ) as make_engine:
+        db = SQLAlchemy(app)
+        assert make_engine.called is not after_fork
+
+    with app.app_context(), db.engine.connect() as conn:
+        conn.execute(sa.text("select 1"))
+
+    with unittest.mock.patch.object(sa.engine.Engine, "dispose") as dispose:
+        db._before_fork()
+
+    assert dispose.called is after_fork
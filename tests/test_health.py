@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+import typing as t
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from flask import Flask
+
+from flask_sqlalchemy import SQLAlchemy
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_check_health(db: SQLAlchemy) -> None:
+    (health,) = db.engine_health
+    assert health.checked is None
+    (health,) = db.check_health()
+    assert health.bind_key is None
+    assert health.engine is db.engine
+    assert not health.replica
+    assert health.healthy
+    assert health.latency is not None
+    assert health.lag is None
+    assert health.checked is not None
+    assert db.engine_health == [health]
+
+
+def _replica_db(app: Flask, tmp_path: Path) -> tuple[SQLAlchemy, t.Any]:
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "replicas": [f"sqlite:///{tmp_path}/missing/a.db", "sqlite://"]
+    }
+    db = SQLAlchemy(app)
+
+    class Todo(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    return db, Todo
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_unhealthy_replica_skipped(app: Flask, tmp_path: Path) -> None:
+    db, Todo = _replica_db(app, tmp_path)
+    down, up = db.replica_engines[None]
+    status = {h.engine: h for h in db.check_health()}
+    assert status[db.engine].healthy
+    assert not status[down].healthy
+    assert isinstance(status[down].error, sa.exc.OperationalError)
+    assert status[up].healthy and status[up].replica
+
+    for _ in range(2):
+        assert db.session.get_bind(Todo, clause=sa.select(Todo)) is up
+        db.session.remove()
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_replica_lag(
+    app: Flask, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app.config["SQLALCHEMY_REPLICA_MAX_LAG"] = 5
+    db, Todo = _replica_db(app, tmp_path)
+    monkeypatch.setattr("flask_sqlalchemy.health._replication_lag", lambda conn: 10.0)
+    status = {h.engine: h for h in db.check_health()}
+    _, lagging = db.replica_engines[None]
+    assert status[lagging].lag == 10.0
+    assert not status[lagging].healthy
+    assert status[db.engine].lag is None
+    # No healthy replicas, use the primary.
+    assert db.session.get_bind(Todo, clause=sa.select(Todo)) is db.engine
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_background_check(app: Flask) -> None:
+    app.config["SQLALCHEMY_HEALTH_CHECK_INTERVAL"] = 0.01
+    db = SQLAlchemy(app)
+    checker = db._app_health[app]
+
+    try:
+        deadline = time.monotonic() + 5
+
+        while db.engine_health[0].checked is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert db.engine_health[0].healthy
+        assert db.engine_health[0].checked is not None
+    finally:
+        checker.stop()
+
+    assert checker._thread is None
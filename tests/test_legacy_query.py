@@ -74,6 +74,27 @@ def test_paginate(db: SQLAlchemy, Todo: t.Any) -> None:
     assert p2.total == 150
 
 
+@pytest.mark.usefixtures("app_ctx")
+def test_paginate_has_more(db: SQLAlchemy, Todo: t.Any) -> None:
+    db.session.add_all(Todo() for _ in range(30))
+    db.session.commit()
+    p = Todo.query.paginate(count="has_more")
+    assert p.total is None
+    assert p.has_next
+    assert not p.next().has_next
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_keyset_paginate(db: SQLAlchemy, Todo: t.Any) -> None:
+    db.session.add_all(Todo() for _ in range(150))
+    db.session.commit()
+    p = Todo.query.order_by(Todo.id).keyset_paginate()
+    assert [x.id for x in p] == list(range(1, 21))
+    p2 = p.next()
+    assert [x.id for x in p2] == list(range(21, 41))
+    assert p2.prev().items == p.items
+
+
 @pytest.mark.usefixtures("app_ctx")
 def test_default_query_class(db: SQLAlchemy) -> None:
     class Parent(db.Model):
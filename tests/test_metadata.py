@@ -9,6 +9,7 @@ import sqlalchemy.orm as sa_orm
 from flask import Flask
 
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.extension import BindOperationError
 from flask_sqlalchemy.model import DefaultMeta
 from flask_sqlalchemy.model import Model
 
@@ -127,6 +128,46 @@ def test_create_drop_all(app: Flask) -> None:
         db.session.execute(sa.select(Post)).scalars()
 
 
+@pytest.mark.usefixtures("app_ctx")
+def test_create_drop_all_parallel(app: Flask) -> None:
+    app.config["SQLALCHEMY_BINDS"] = {"a": "sqlite://", "b": "sqlite://"}
+    db = SQLAlchemy(app)
+
+    class User(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    class Post(db.Model):
+        __bind_key__ = "a"
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    class Tag(db.Model):
+        __bind_key__ = "b"
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    def fail(*args: t.Any, **kwargs: t.Any) -> None:
+        raise ValueError("fail")
+
+    sa.event.listen(Post.__table__, "before_create", fail)
+
+    with pytest.raises(BindOperationError) as exc_info:
+        db.create_all(parallel=True)
+
+    assert list(exc_info.value.errors) == ["a"]
+    assert isinstance(exc_info.value.errors["a"], ValueError)
+    # The other binds were still created.
+    db.session.execute(sa.select(User)).scalars()
+    db.session.execute(sa.select(Tag)).scalars()
+
+    sa.event.remove(Post.__table__, "before_create", fail)
+    db.create_all(parallel=True)
+    db.session.execute(sa.select(Post)).scalars()
+    db.drop_all(parallel=True)
+
+    for model in User, Post, Tag:
+        with pytest.raises(sa_exc.OperationalError):
+            db.session.execute(sa.select(model)).scalars()
+
+
 @pytest.mark.usefixtures("app_ctx")
 @pytest.mark.parametrize("bind_key", ["a", ["a"]])
 def test_create_key_spec(app: Flask, bind_key: str | list[str | None]) -> None:
@@ -148,7 +189,8 @@ def test_create_key_spec(app: Flask, bind_key: str | list[str | None]) -> None:
 
 
 @pytest.mark.usefixtures("app_ctx")
-def test_reflect(app: Flask) -> None:
+@pytest.mark.parametrize("parallel", [False, True])
+def test_reflect(app: Flask, parallel: bool) -> None:
     app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///user.db"
     app.config["SQLALCHEMY_BINDS"] = {"post": "sqlite:///post.db"}
     db = SQLAlchemy(app)
@@ -159,7 +201,7 @@ def test_reflect(app: Flask) -> None:
     del app.extensions["sqlalchemy"]
     db = SQLAlchemy(app)
     assert not db.metadata.tables
-    db.reflect()
+    db.reflect(parallel=parallel)
     assert "user" in db.metadata.tables
     assert "post" in db.metadatas["post"].tables
 
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import typing as t
+
+import pytest
+import sqlalchemy as sa
+from flask import Flask
+
+from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.model_cache import CacheBackend
+from flask_sqlalchemy.model_cache import MemoryCache
+
+
+@pytest.fixture
+def app(app: Flask) -> Flask:
+    app.config["SQLALCHEMY_MODEL_CACHE"] = True
+    return app
+
+
+@pytest.fixture
+def db(app: Flask) -> SQLAlchemy:
+    return SQLAlchemy(app)
+
+
+@pytest.fixture
+def Plan(db: SQLAlchemy) -> t.Any:
+    class Plan(db.Model):
+        __cache__ = {"ttl": 60}
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String)
+
+    return Plan
+
+
+@pytest.fixture
+def statements(app: Flask, db: SQLAlchemy, Plan: t.Any) -> list[str]:
+    out: list[str] = []
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Plan(name="a"))
+        db.session.commit()
+        sa.event.listen(
+            db.engine, "before_cursor_execute", lambda *args: out.append(args[2])
+        )
+
+    return out
+
+
+def test_cached_get(
+    app: Flask, db: SQLAlchemy, Plan: t.Any, statements: list[str]
+) -> None:
+    with app.app_context():
+        plan = db.session.get(Plan, 1)
+        assert plan is not None
+        assert plan.name == "a"
+
+    assert len(statements) == 1
+
+    with app.app_context():
+        plan = db.get_or_404(Plan, 1)
+        assert plan.name == "a"
+        assert sa.inspect(plan).persistent
+        # Changes to a cached instance are saved.
+        plan.name = "b"
+        db.session.commit()
+
+    assert len(statements) == 2
+
+    with app.app_context():
+        # The commit invalidated the cached value.
+        plan = db.session.get(Plan, 1)
+        assert plan is not None
+        assert plan.name == "b"
+        assert len(statements) == 3
+        db.session.delete(plan)
+        db.session.commit()
+
+    with app.app_context():
+        assert db.session.get(Plan, 1) is None
+
+
+def test_not_cached(
+    app: Flask, db: SQLAlchemy, Plan: t.Any, statements: list[str]
+) -> None:
+    class Tag(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    with app.app_context():
+        db.create_all()
+
+    statements.clear()
+
+    for _ in range(2):
+        with app.app_context():
+            db.session.get(Tag, 1)
+            db.session.get(Plan, 1, populate_existing=True)
+
+    # Models without __cache__ and calls with options are not cached.
+    assert len(statements) == 4
+
+
+def test_uncommitted(
+    app: Flask, db: SQLAlchemy, Plan: t.Any, statements: list[str]
+) -> None:
+    with app.app_context():
+        db.session.add(Plan(name="b"))
+        db.session.flush()
+        db.session.expunge_all()
+        plan = db.session.get(Plan, 2)
+        assert plan is not None
+        assert plan.name == "b"
+        db.session.rollback()
+
+    with app.app_context():
+        # A value read after writing was not cached.
+        assert db.session.get(Plan, 2) is None
+
+
+def test_execute_update(
+    app: Flask, db: SQLAlchemy, Plan: t.Any, statements: list[str]
+) -> None:
+    with app.app_context():
+        db.session.get(Plan, 1)
+
+    with app.app_context():
+        db.session.execute(sa.update(Plan).values(name="b"))
+        db.session.commit()
+
+    with app.app_context():
+        # The update invalidated every cached value for the table.
+        plan = db.session.get(Plan, 1)
+        assert plan is not None
+        assert plan.name == "b"
+
+    assert len(statements) == 3
+
+
+def test_bulk_upsert(
+    app: Flask, db: SQLAlchemy, Plan: t.Any, statements: list[str]
+) -> None:
+    with app.app_context():
+        db.session.get(Plan, 1)
+
+    with app.app_context():
+        db.bulk_upsert(Plan, [{"id": 1, "name": "b"}], conflict_cols=["id"])
+        db.session.commit()
+
+    with app.app_context():
+        plan = db.session.get(Plan, 1)
+        assert plan is not None
+        assert plan.name == "b"
+
+
+def test_mutable_value(app: Flask, db: SQLAlchemy) -> None:
+    class Config(db.Model):
+        __cache__ = {"ttl": None}
+        id = sa.Column(sa.Integer, primary_key=True)
+        data = sa.Column(sa.JSON)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Config(data={"a": 1}))
+        db.session.commit()
+
+    for _ in range(2):
+        with app.app_context():
+            config = db.session.get(Config, 1)
+            assert config is not None
+            assert config.data == {"a": 1}
+            # Changing the loaded or cached value in place doesn't change the cache.
+            config.data["a"] = 2
+            db.session.rollback()
+
+
+def test_ttl(app: Flask, db: SQLAlchemy, Plan: t.Any, statements: list[str]) -> None:
+    Plan.__cache__ = {"ttl": 0}
+
+    for _ in range(2):
+        with app.app_context():
+            db.session.get(Plan, 1)
+
+    assert len(statements) == 2
+
+
+def test_memory_cache_maxsize() -> None:
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", 1, None)
+    cache.set("b", 2, None)
+    cache.get("a")
+    cache.set("c", 3, None)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    cache.delete(["a"])
+    assert cache.get("a") is None
+
+
+def test_custom_backend(app: Flask) -> None:
+    class DictCache(CacheBackend):
+        def __init__(self) -> None:
+            self.data: dict[str, t.Any] = {}
+
+        def get(self, key: str) -> t.Any | None:
+            return self.data.get(key)
+
+        def set(self, key: str, value: t.Any, ttl: float | None) -> None:
+            self.data[key] = value
+
+        def delete(self, keys: t.Collection[str]) -> None:
+            for key in keys:
+                self.data.pop(key, None)
+
+    cache = app.config["SQLALCHEMY_MODEL_CACHE"] = DictCache()
+    db = SQLAlchemy(app)
+
+    class Plan(db.Model):
+        __cache__ = {"ttl": None}
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Plan())
+        db.session.commit()
+
+    with app.app_context():
+        db.session.get(Plan, 1)
+
+    version = cache.data["flask_sqlalchemy:version:None:plan"]
+    assert cache.data[f"flask_sqlalchemy:None:plan:(1,):{version}"] == {"id": 1}
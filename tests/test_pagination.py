@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import base64
+import datetime
+import decimal
+import threading
+import time
 import typing as t
+import uuid
 
 import pytest
+import sqlalchemy as sa
 from flask import Flask
 from werkzeug.exceptions import NotFound
 
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.pagination import _decode_cursor
+from flask_sqlalchemy.pagination import _encode_cursor
+from flask_sqlalchemy.pagination import CachedCount
+from flask_sqlalchemy.pagination import EstimatedCount
+from flask_sqlalchemy.pagination import HasMoreCount
 from flask_sqlalchemy.pagination import Pagination
+from flask_sqlalchemy.session import Session
 
 
 class RangePagination(Pagination):
@@ -203,3 +216,228 @@ def test_no_items_404(db: SQLAlchemy, Todo: t.Any) -> None:
 
     with pytest.raises(NotFound):
         db.paginate(db.select(Todo), page=2)
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_count_has_more(paginate: _PaginateCallable) -> None:
+    db, Todo = paginate.db, paginate.Todo
+    p = db.paginate(db.select(Todo), per_page=100, count="has_more")
+    assert len(p.items) == 100
+    assert p.total is None
+    assert p.has_next
+    p = p.next().next()
+    assert len(p.items) == 50
+    assert not p.has_next
+    p = db.paginate(db.select(Todo), page=2, per_page=125, count=HasMoreCount())
+    assert len(p.items) == 125
+    assert not p.has_next
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_count_estimate(paginate: _PaginateCallable) -> None:
+    db, Todo = paginate.db, paginate.Todo
+    # no statistics, falls back to exact count
+    assert db.paginate(db.select(Todo), count="estimate").total == 250
+    db.session.execute(sa.text("ANALYZE"))
+    db.session.add(Todo(title="extra"))
+    db.session.commit()
+    assert db.paginate(db.select(Todo), count="estimate").total == 250
+    assert db.paginate(db.select(Todo)).total == 251
+    # filtered queries use an exact count
+    select = db.select(Todo).filter(Todo.id > 200)
+    assert db.paginate(select, count="estimate").total == 51
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_count_cached(paginate: _PaginateCallable) -> None:
+    db, Todo = paginate.db, paginate.Todo
+    cached = CachedCount(ttl=60)
+    assert db.paginate(db.select(Todo), count=cached).total == 250
+    db.session.add(Todo(title="extra"))
+    db.session.commit()
+    assert db.paginate(db.select(Todo), count=cached).total == 250
+    assert db.paginate(db.select(Todo).filter(Todo.id > 200), count=cached).total == 51
+    assert db.paginate(db.select(Todo).filter(Todo.id > 240), count=cached).total == 11
+    cached.clear()
+    assert db.paginate(db.select(Todo), count=cached).total == 251
+    expired = CachedCount(ttl=0)
+    assert db.paginate(db.select(Todo), count=expired).total == 251
+    db.session.add(Todo(title="extra"))
+    db.session.commit()
+    assert db.paginate(db.select(Todo), count=expired).total == 252
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_count_unknown(db: SQLAlchemy, Todo: t.Any) -> None:
+    with pytest.raises(ValueError, match="Unknown count strategy"):
+        db.paginate(db.select(Todo), count="guess")
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_count_concurrent(app: Flask, monkeypatch: pytest.MonkeyPatch) -> None:
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///concurrent.db"
+    db = SQLAlchemy(app)
+
+    class Todo(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    db.create_all()
+    db.session.add_all(Todo() for _ in range(50))
+    db.session.commit()
+    threads = set()
+
+    @sa.event.listens_for(db.engine, "before_cursor_execute")
+    def record_thread(*args: t.Any) -> None:
+        threads.add(threading.current_thread())
+
+    p = db.paginate(db.select(Todo), per_page=10, concurrent=True)
+    assert len(p.items) == 10
+    assert p.total == 50
+    assert len(threads) == 2
+    bind_threads = set()
+    get_bind = Session.get_bind
+
+    def record_get_bind(self: Session, *args: t.Any, **kwargs: t.Any) -> t.Any:
+        bind_threads.add(threading.current_thread())
+        return get_bind(self, *args, **kwargs)
+
+    monkeypatch.setattr(Session, "get_bind", record_get_bind)
+    cached = CachedCount(strategy=EstimatedCount())
+    assert db.paginate(db.select(Todo), concurrent=True, count=cached).total == 50
+    # The worker doesn't use the session, which isn't thread safe.
+    assert bind_threads == {threading.current_thread()}
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_count_concurrent_error(app: Flask) -> None:
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///concurrent.db"
+    db = SQLAlchemy(app)
+
+    class Todo(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    db.create_all()
+    main = threading.current_thread()
+    running = []
+
+    @sa.event.listens_for(db.engine, "before_cursor_execute")
+    def slow_count(*args: t.Any) -> None:
+        if threading.current_thread() is not main:
+            running.append(True)
+            time.sleep(0.1)
+
+    @sa.event.listens_for(db.engine, "after_cursor_execute")
+    def count_done(*args: t.Any) -> None:
+        if threading.current_thread() is not main:
+            running.pop()
+
+    with pytest.raises(NotFound):
+        db.paginate(db.select(Todo), page=2, concurrent=True)
+
+    # The count was cancelled or finished before the error was raised.
+    assert not running
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_count_concurrent_static_pool(paginate: _PaginateCallable) -> None:
+    db, Todo = paginate.db, paginate.Todo
+    p = db.paginate(db.select(Todo), concurrent=True)
+    assert p.total == 250
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_keyset_paginate(paginate: _PaginateCallable) -> None:
+    db, Todo = paginate.db, paginate.Todo
+    select = db.select(Todo).order_by(Todo.id)
+    p = db.keyset_paginate(select, per_page=100)
+    assert [x.id for x in p] == list(range(1, 101))
+    assert not p.has_prev
+    assert p.prev_cursor is None
+    assert p.has_next
+    p = p.next()
+    assert [x.id for x in p] == list(range(101, 201))
+    assert p.has_prev
+    p = p.next()
+    assert [x.id for x in p] == list(range(201, 251))
+    assert not p.has_next
+    assert p.next_cursor is None
+    p = p.prev()
+    assert [x.id for x in p] == list(range(101, 201))
+    assert p.has_next
+    p = p.prev()
+    assert [x.id for x in p] == list(range(1, 101))
+    assert not p.has_prev
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_keyset_paginate_desc(paginate: _PaginateCallable) -> None:
+    db, Todo = paginate.db, paginate.Todo
+    select = db.select(Todo).order_by(Todo.title.desc(), Todo.id.desc())
+    p = db.keyset_paginate(select, per_page=10)
+    titles = sorted((f"task {i}" for i in range(1, 251)), reverse=True)
+    assert [x.title for x in p] == titles[:10]
+    p = p.next()
+    assert [x.title for x in p] == titles[10:20]
+    p = p.prev()
+    assert [x.title for x in p] == titles[:10]
+
+
+def test_keyset_paginate_qs(paginate: _PaginateCallable) -> None:
+    db, Todo = paginate.db, paginate.Todo
+    select = db.select(Todo).order_by(Todo.id)
+
+    with paginate.app.test_request_context(query_string={"per_page": 5}):
+        cursor = db.keyset_paginate(select).next_cursor
+
+    qs = {"per_page": 5, "cursor": cursor}
+
+    with paginate.app.test_request_context(query_string=qs):
+        p = db.keyset_paginate(select)
+        assert p.cursor == cursor
+        assert [x.id for x in p] == [6, 7, 8, 9, 10]
+
+    with paginate.app.test_request_context(query_string={"cursor": "abc"}):
+        with pytest.raises(NotFound):
+            db.keyset_paginate(select)
+
+        p = db.keyset_paginate(select, error_out=False)
+        assert p.cursor is None
+        assert p.items[0].id == 1
+
+    # A cursor with a value that is never encoded is invalid, not a database error.
+    qs = {"cursor": base64.urlsafe_b64encode(b'["n",[{"x":1}]]').decode()}
+
+    with paginate.app.test_request_context(query_string=qs):
+        with pytest.raises(NotFound):
+            db.keyset_paginate(select)
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_keyset_paginate_requires_order(db: SQLAlchemy, Todo: t.Any) -> None:
+    with pytest.raises(ValueError, match="ordered"):
+        db.keyset_paginate(db.select(Todo))
+
+    with pytest.raises(ValueError, match="same direction"):
+        db.keyset_paginate(db.select(Todo).order_by(Todo.title, Todo.id.desc()))
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        (1, "a", 1.5, True),
+        (datetime.datetime(2024, 1, 2, 3, 4, 5), datetime.date(2024, 1, 2)),
+        (datetime.time(3, 4), decimal.Decimal("1.10"), uuid.uuid4(), b"\x00"),
+    ],
+)
+def test_cursor_round_trip(values: tuple[t.Any, ...]) -> None:
+    assert _decode_cursor(_encode_cursor(False, values)) == (False, values)
+
+
+@pytest.mark.parametrize(
+    "data", ['["n",[null]]', '["n",[{"x":1}]]', '["n",[[1,2]]]', '["x",[1]]']
+)
+def test_invalid_cursor(data: str) -> None:
+    cursor = base64.urlsafe_b64encode(data.encode()).decode()
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        _decode_cursor(cursor)
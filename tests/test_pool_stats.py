@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+import sqlalchemy.pool
+from flask import Flask
+
+from flask_sqlalchemy import SQLAlchemy
+
+
+@pytest.fixture
+def app(app: Flask, tmp_path: Path) -> Flask:
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/a.db"
+    app.config["SQLALCHEMY_POOL_STATS"] = True
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "poolclass": sa.pool.QueuePool,
+        "pool_size": 1,
+        "max_overflow": 1,
+        "pool_timeout": 0,
+    }
+    return app
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_pool_stats(db: SQLAlchemy) -> None:
+    stats = db.pool_stats()[None]
+    assert stats.size == 1
+    assert stats.total == 0
+    assert stats.checkouts == 0
+
+    with db.engine.connect(), db.engine.connect():
+        stats = db.pool_stats()[None]
+        assert stats.checked_out == 2
+        assert stats.idle == 0
+        assert stats.overflow == 1
+        assert stats.total == 2
+        assert stats.connects == 2
+
+        with pytest.raises(sa.exc.TimeoutError):
+            db.engine.connect()
+
+    stats = db.pool_stats()[None]
+    assert stats.checked_out == 0
+    # The overflow connection is closed when it is checked in.
+    assert stats.idle == 1
+    assert stats.overflow == 0
+    assert stats.checkouts == 2
+    assert stats.timeouts == 1
+    assert stats.wait_time >= stats.max_wait > 0
+    assert stats.mean_wait > 0
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_invalidated(db: SQLAlchemy) -> None:
+    with db.engine.connect() as conn:
+        conn.invalidate()
+
+    stats = db.pool_stats()[None]
+    assert stats.invalidated == 1
+    assert stats.total == 0
+    assert stats.checked_out == 0
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_replicas(app: Flask, tmp_path: Path) -> None:
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"]["replicas"] = [f"sqlite:///{tmp_path}/b.db"]
+    db = SQLAlchemy(app)
+
+    with db.replica_engines[None][0].connect():
+        stats = db.pool_stats()[None]
+
+    assert stats.checked_out == 0
+    (replica,) = stats.replicas
+    assert replica.replica
+    assert replica.checked_out == 1
+
+
+def test_reset_after_fork(app: Flask) -> None:
+    db = SQLAlchemy(app)
+
+    with app.app_context():
+        with db.engine.connect():
+            pass
+
+        # Another thread held the lock when the process forked.
+        tracker = db._app_pools[app][db.engine]
+        tracker._lock.acquire()
+        db._after_fork_in_child()
+        stats = db.pool_stats()[None]
+        assert stats.total == 0
+        assert stats.checkouts == 0
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_disabled(app: Flask) -> None:
+    app.config["SQLALCHEMY_POOL_STATS"] = False
+    db = SQLAlchemy(app)
+
+    with pytest.raises(RuntimeError, match="SQLALCHEMY_POOL_STATS"):
+        db.pool_stats()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import typing as t
+
+import pytest
+import sqlalchemy as sa
+from flask import Flask
+
+from flask_sqlalchemy import SQLAlchemy
+
+
+@pytest.fixture
+def app(app: Flask) -> Flask:
+    app.config["SQLALCHEMY_QUERY_CACHE"] = True
+    return app
+
+
+@pytest.fixture
+def db(app: Flask) -> SQLAlchemy:
+    return SQLAlchemy(app)
+
+
+@pytest.fixture
+def Item(app: Flask, db: SQLAlchemy) -> t.Any:
+    class Item(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String)
+
+    class Other(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(Item(name="a"))
+        db.session.commit()
+
+    return Item
+
+
+@pytest.fixture
+def statements(app: Flask, db: SQLAlchemy, Item: t.Any) -> list[str]:
+    out: list[str] = []
+
+    with app.app_context():
+        sa.event.listen(
+            db.engine, "before_cursor_execute", lambda *args: out.append(args[2])
+        )
+
+    return out
+
+
+def test_cached(app: Flask, db: SQLAlchemy, Item: t.Any, statements: list[str]) -> None:
+    select = sa.select(Item.name).order_by(Item.id)
+
+    for _ in range(2):
+        with app.app_context():
+            assert [row.name for row in db.cached(select)] == ["a"]
+
+    assert len(statements) == 1
+
+    with app.app_context():
+        # Different parameters are cached separately.
+        assert db.cached(select.where(Item.id == 2)) == []
+        db.session.add(Item(name="b"))
+        db.session.commit()
+
+    assert len(statements) == 3
+
+    with app.app_context():
+        # The commit invalidated the rows.
+        assert [row.name for row in db.cached(select)] == ["a", "b"]
+        db.session.execute(sa.update(Item).values(name="c"))
+        db.session.commit()
+
+    with app.app_context():
+        assert [row.name for row in db.cached(select)] == ["c", "c"]
+
+
+def test_tags(app: Flask, db: SQLAlchemy, Item: t.Any, statements: list[str]) -> None:
+    for _ in range(2):
+        with app.app_context():
+            assert db.cached(sa.select(sa.literal(1)), tags=[Item])[0][0] == 1
+            db.cached(sa.select(sa.literal(2)), tags=["other"])
+
+    assert len(statements) == 2
+
+    with app.app_context():
+        db.session.add(Item())
+        db.session.commit()
+        statements.clear()
+        db.cached(sa.select(sa.literal(1)), tags=[Item])
+        db.cached(sa.select(sa.literal(2)), tags=["other"])
+
+    # Only the select tagged with the changed table is executed again.
+    assert len(statements) == 1
+
+
+def test_uncommitted(app: Flask, db: SQLAlchemy, Item: t.Any) -> None:
+    select = sa.select(sa.func.count()).select_from(Item)
+
+    with app.app_context():
+        db.session.add(Item())
+        db.session.flush()
+        assert db.cached(select)[0][0] == 2
+        db.session.rollback()
+
+    with app.app_context():
+        assert db.cached(select)[0][0] == 1
+
+
+def test_binds(app: Flask) -> None:
+    app.config["SQLALCHEMY_BINDS"] = {"a": "sqlite://", "s0": "sqlite://"}
+    app.config["SQLALCHEMY_SHARDS"] = {"tenants": ["a", "s0"]}
+    db = SQLAlchemy(app)
+
+    class Item(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String)
+
+    class OtherItem(db.Model):
+        __bind_key__ = "tenants"
+        __tablename__ = "item"
+        __shard_key__ = "id"
+        id = sa.Column(sa.Integer, primary_key=True)
+        name = sa.Column(sa.String)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add_all([Item(id=1, name="default"), OtherItem(id=2, name="a")])
+        db.session.commit()
+
+    for _ in range(2):
+        with app.app_context():
+            # The same SQL on different databases is cached separately.
+            assert db.cached(sa.select(Item.name)) == [("default",)]
+            assert db.cached(sa.select(OtherItem.name)) == [("a",)]
+
+            with db.session.for_shard("s0"):
+                assert db.cached(sa.select(OtherItem.name)) == []
+
+    with app.app_context():
+        db.session.add(OtherItem(id=4, name="b"))
+        db.session.commit()
+        statements: list[str] = []
+        sa.event.listen(
+            db.engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+        )
+
+    with app.app_context():
+        # A change to one database's table doesn't invalidate the other's.
+        assert db.cached(sa.select(Item.name)) == [("default",)]
+        assert db.cached(sa.select(OtherItem.name)) == [("a",), ("b",)]
+        assert statements == []
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_entities(db: SQLAlchemy, Item: t.Any) -> None:
+    with pytest.raises(ValueError, match="ORM instances"):
+        db.cached(sa.select(Item))
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_disabled(app: Flask) -> None:
+    app.config["SQLALCHEMY_QUERY_CACHE"] = False
+    db = SQLAlchemy(app)
+
+    with pytest.raises(RuntimeError, match="SQLALCHEMY_QUERY_CACHE"):
+        db.cached(sa.select(sa.literal(1)))
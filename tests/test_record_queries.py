@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 import os
+import threading
+import typing as t
 
 import pytest
 import sqlalchemy as sa
 import sqlalchemy.orm as sa_orm
 from flask import Flask
+from flask import g
 
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.record_queries import _Histogram
+from flask_sqlalchemy.record_queries import _normalize
 from flask_sqlalchemy.record_queries import get_recorded_queries
+from flask_sqlalchemy.record_queries import NPlusOneError
+from flask_sqlalchemy.record_queries import NPlusOneWarning
+from flask_sqlalchemy.record_queries import QueryBudgetError
+from flask_sqlalchemy.record_queries import QueryBudgetWarning
 
 
 @pytest.mark.usefixtures("app_ctx")
@@ -49,3 +58,344 @@ def test_query_info(app: Flask) -> None:
     assert info.duration == info.end_time - info.start_time
     assert os.path.join("tests", "test_record_queries.py:") in info.location
     assert "(test_query_info)" in info.location
+
+
+def _make_todo(db: SQLAlchemy) -> t.Any:
+    class Todo(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    return Todo
+
+
+def test_sample_rate(app: Flask) -> None:
+    app.config["SQLALCHEMY_RECORD_QUERIES"] = True
+    app.config["SQLALCHEMY_RECORD_QUERIES_SAMPLE_RATE"] = 0
+    db = SQLAlchemy(app)
+    Todo = _make_todo(db)
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(sa.select(Todo)).scalars()
+        assert get_recorded_queries() == []
+
+    # statistics are still recorded for contexts that are not sampled
+    assert db.query_stats.snapshot()
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_max_queries(app: Flask) -> None:
+    app.config["SQLALCHEMY_RECORD_QUERIES"] = True
+    app.config["SQLALCHEMY_RECORD_QUERIES_MAX"] = 2
+    db = SQLAlchemy(app)
+    Todo = _make_todo(db)
+    db.create_all()
+
+    for i in range(5):
+        db.session.execute(sa.select(Todo).filter(Todo.id == i)).scalars()
+
+    queries = get_recorded_queries()
+    assert len(queries) == 2
+    assert [q.parameters[0][0] for q in queries] == [3, 4]
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_skip_location(app: Flask) -> None:
+    app.config["SQLALCHEMY_RECORD_QUERIES"] = True
+    app.config["SQLALCHEMY_RECORD_QUERIES_LOCATION"] = False
+    db = SQLAlchemy(app)
+    Todo = _make_todo(db)
+    db.create_all()
+    db.session.execute(sa.select(Todo)).scalars()
+    assert get_recorded_queries()[-1].location == "<unknown>"
+
+
+def test_query_stats(app: Flask) -> None:
+    app.config["SQLALCHEMY_RECORD_QUERIES"] = True
+    db = SQLAlchemy(app)
+    Todo = _make_todo(db)
+
+    with app.app_context():
+        db.create_all()
+
+        for i in range(10):
+            db.session.execute(sa.select(Todo).filter(Todo.id == i)).scalars()
+
+    stats = {s.statement: s for s in db.query_stats.snapshot()}
+    s = stats["SELECT todo.id FROM todo WHERE todo.id = ?"]
+    assert s.bind_key is None
+    assert s.count == 10
+    assert s.errors == 0
+    assert 0 < s.min <= s.p50 <= s.p99 <= s.max
+    assert s.mean == pytest.approx(s.total / 10)
+
+
+def test_query_stats_binds(app: Flask) -> None:
+    app.config["SQLALCHEMY_QUERY_STATS"] = True
+    app.config["SQLALCHEMY_BINDS"] = {"a": "sqlite://"}
+    db = SQLAlchemy(app)
+
+    class Todo(db.Model):
+        __bind_key__ = "a"
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(sa.insert(Todo), [{"id": 1}, {"id": 2}])
+
+        with pytest.raises(sa.exc.IntegrityError):
+            db.session.execute(sa.insert(Todo), [{"id": 1}])
+
+        # per-request recording is not enabled
+        assert get_recorded_queries() == []
+
+    stats = {s.statement: s for s in db.query_stats.snapshot()}
+    s = stats["INSERT INTO todo (id) VALUES (?)"]
+    assert s.bind_key == "a"
+    assert s.count == 1
+    assert s.rows == 2
+    assert s.errors == 1
+    assert db.query_stats.snapshot(reset=True)
+    assert db.query_stats.snapshot() == []
+
+
+def test_query_stats_disabled(app: Flask) -> None:
+    app.config["SQLALCHEMY_RECORD_QUERIES"] = True
+    app.config["SQLALCHEMY_QUERY_STATS"] = False
+    db = SQLAlchemy(app)
+    Todo = _make_todo(db)
+
+    with app.app_context():
+        db.create_all()
+        db.session.execute(sa.select(Todo)).scalars()
+        assert get_recorded_queries()
+
+    assert db.query_stats.snapshot() == []
+
+
+def _make_n_plus_one(app: Flask) -> tuple[SQLAlchemy, t.Any]:
+    db = SQLAlchemy(app)
+
+    class Parent(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+        children = db.relationship("Child")
+
+    class Child(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+        parent_id = sa.Column(sa.ForeignKey(Parent.id))  # type: ignore[var-annotated]
+
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(Parent(children=[Child()]) for _ in range(5))
+        db.session.commit()
+
+    return db, Parent
+
+
+def test_n_plus_one_warn(app: Flask) -> None:
+    app.config["SQLALCHEMY_N_PLUS_ONE_THRESHOLD"] = 3
+    db, Parent = _make_n_plus_one(app)
+
+    with app.app_context():
+        parents = db.session.execute(sa.select(Parent)).scalars().all()
+
+        with pytest.warns(NPlusOneWarning) as record:
+            for parent in parents:
+                assert len(parent.children) == 1
+
+        assert len(record) == 1
+        message = str(record[0].message)
+        assert "4 different parameters" in message
+        assert "(test_n_plus_one_warn)" in message
+        assert "selectinload(Parent.children)" in message
+
+    with app.app_context():
+        # eager loading doesn't trigger the warning
+        select = sa.select(Parent).options(sa_orm.selectinload(Parent.children))
+
+        for parent in db.session.execute(select).scalars():
+            assert len(parent.children) == 1
+
+
+def test_n_plus_one_raise(app: Flask) -> None:
+    app.config["SQLALCHEMY_N_PLUS_ONE_THRESHOLD"] = 3
+    app.config["SQLALCHEMY_N_PLUS_ONE_ACTION"] = "raise"
+    db, Parent = _make_n_plus_one(app)
+
+    with app.app_context():
+        with pytest.raises(NPlusOneError):
+            for parent in db.session.execute(sa.select(Parent)).scalars().all():
+                assert parent.children
+
+    with app.app_context():
+        # the same parameters don't count
+        for _ in range(5):
+            db.session.execute(sa.select(Parent).filter_by(id=1)).scalars()
+
+
+def test_n_plus_one_log(app: Flask, caplog: pytest.LogCaptureFixture) -> None:
+    app.config["SQLALCHEMY_N_PLUS_ONE_THRESHOLD"] = 3
+    app.config["SQLALCHEMY_N_PLUS_ONE_ACTION"] = "log"
+    db, Parent = _make_n_plus_one(app)
+
+    with app.app_context():
+        for parent in db.session.execute(sa.select(Parent)).scalars().all():
+            assert parent.children
+
+    assert "N+1" in caplog.text
+
+
+def _run_queries(db: SQLAlchemy, n: int) -> None:
+    for _ in range(n):
+        db.session.execute(sa.text("select 1"))
+
+
+def test_query_budget_warn(app: Flask) -> None:
+    app.config["SQLALCHEMY_QUERY_BUDGET"] = {"queries": 3}
+    db = SQLAlchemy(app)
+
+    with app.app_context():
+        _run_queries(db, 3)
+
+        with pytest.warns(QueryBudgetWarning) as record:
+            _run_queries(db, 3)
+
+    assert len(record) == 1
+    message = str(record[0].message)
+    assert "4 queries exceeds the budget of 3" in message
+    assert "(_run_queries)" in message
+
+    with app.app_context():
+        # the budget is for each app context
+        _run_queries(db, 3)
+
+
+def test_query_budget_time(app: Flask, monkeypatch: pytest.MonkeyPatch) -> None:
+    app.config["SQLALCHEMY_QUERY_BUDGET"] = {"time": 0.5}
+    app.config["SQLALCHEMY_QUERY_BUDGET_ACTION"] = "raise"
+    db = SQLAlchemy(app)
+    times = iter([0, 0.3, 1, 1.3])
+    monkeypatch.setattr("flask_sqlalchemy.record_queries.perf_counter", times.__next__)
+
+    with app.app_context():
+        _run_queries(db, 1)
+
+        with pytest.raises(QueryBudgetError, match="0.600s of queries"):
+            _run_queries(db, 1)
+
+
+def test_query_budget_log(app: Flask, caplog: pytest.LogCaptureFixture) -> None:
+    app.config["SQLALCHEMY_QUERY_BUDGET"] = {"queries": 1}
+    app.config["SQLALCHEMY_QUERY_BUDGET_ACTION"] = "log"
+    db = SQLAlchemy(app)
+
+    with app.app_context():
+        _run_queries(db, 2)
+
+    assert "query budget" in caplog.text
+
+
+def test_query_budget_decorator(app: Flask) -> None:
+    app.testing = True
+    app.config["SQLALCHEMY_QUERY_BUDGET"] = {}
+    app.config["SQLALCHEMY_QUERY_BUDGET_ACTION"] = "raise"
+    db = SQLAlchemy(app)
+
+    @app.route("/")
+    @db.query_budget(queries=2)
+    def index() -> str:
+        _run_queries(db, 3)
+        return ""
+
+    @app.route("/async")
+    @db.query_budget(queries=2)
+    async def async_index() -> str:
+        _run_queries(db, 3)
+        return ""
+
+    with app.app_context():
+        # no limits are configured outside the decorator
+        _run_queries(db, 5)
+
+    with pytest.raises(QueryBudgetError):
+        app.test_client().get("/")
+
+    with pytest.raises(QueryBudgetError):
+        app.test_client().get("/async")
+
+    with app.app_context(), db.query_budget(queries=5):
+        _run_queries(db, 5)
+
+
+def test_query_budget_concurrent(app: Flask) -> None:
+    db = SQLAlchemy(app)
+    entered = threading.Barrier(2)
+    first_done = threading.Event()
+    restored: dict[str, t.Any] = {}
+
+    @db.query_budget(queries=1)
+    def view(name: str) -> None:
+        entered.wait(5)
+
+        if name == "b":
+            first_done.wait(5)
+
+    def run(name: str, queries: int) -> None:
+        with app.app_context(), db.query_budget(queries=queries):
+            view(name)
+            restored[name] = g.get("_sqlalchemy_query_budget")
+            first_done.set()
+
+    threads = [
+        threading.Thread(target=run, args=("a", 10)),
+        threading.Thread(target=run, args=("b", 20)),
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    # Each request's own budget is restored after the shared decorated view.
+    assert restored == {"a": (10, None), "b": (20, None)}
+
+
+def test_query_budget_invalid(app: Flask) -> None:
+    app.config["SQLALCHEMY_QUERY_BUDGET"] = {"count": 1}
+
+    with pytest.raises(ValueError, match="'queries' and 'time'"):
+        SQLAlchemy(app)
+
+
+@pytest.mark.parametrize(
+    ("statement", "expect"),
+    [
+        ("SELECT a FROM t WHERE a = ?", "SELECT a FROM t WHERE a = ?"),
+        ("SELECT a FROM t WHERE a = %(a_1)s", "SELECT a FROM t WHERE a = ?"),
+        ("SELECT a FROM t WHERE a = :a_1", "SELECT a FROM t WHERE a = ?"),
+        ("SELECT a1 FROM t WHERE a = $1", "SELECT a1 FROM t WHERE a = ?"),
+        (
+            "SELECT a FROM t WHERE a = 'x''y' OR a = 1.5",
+            "SELECT a FROM t WHERE a = ? OR a = ?",
+        ),
+        ("SELECT a FROM t WHERE a IN (?, ?, ?)", "SELECT a FROM t WHERE a IN (?...)"),
+        ("INSERT INTO t (a) VALUES (?), (?), (?)", "INSERT INTO t (a) VALUES (?), ..."),
+        ("SELECT a::INTEGER\n  FROM t", "SELECT a::INTEGER FROM t"),
+    ],
+)
+def test_normalize(statement: str, expect: str) -> None:
+    assert _normalize(statement) == expect
+
+
+def test_histogram() -> None:
+    h = _Histogram()
+
+    for i in range(1, 1001):
+        h.record(i / 1000)
+
+    assert h.count == 1000
+    assert h.min == 0.001
+    assert h.max == 1
+    assert h.percentile(50) == pytest.approx(0.5, rel=0.04)
+    assert h.percentile(99) == pytest.approx(0.99, rel=0.04)
+    assert h.percentile(100) == 1
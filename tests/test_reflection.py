@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from flask import Flask
+
+from flask_sqlalchemy import SQLAlchemy
+
+
+@pytest.fixture
+def app(app: Flask, tmp_path: Path) -> Flask:
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/a.db"
+    app.config["SQLALCHEMY_REFLECT_CACHE"] = "reflect"
+
+    with sa.create_engine(app.config["SQLALCHEMY_DATABASE_URI"]).begin() as conn:
+        conn.execute(sa.text("create table user (id integer primary key, name text)"))
+        conn.execute(sa.text("create table version (value integer)"))
+        conn.execute(sa.text("insert into version values (1)"))
+
+    return app
+
+
+def _reflect(app: Flask) -> sa.MetaData:
+    app.extensions.pop("sqlalchemy", None)
+    db = SQLAlchemy(app)
+
+    with app.app_context():
+        db.reflect()
+
+    return db.metadata
+
+
+def _add_table(app: Flask) -> None:
+    with sa.create_engine(app.config["SQLALCHEMY_DATABASE_URI"]).begin() as conn:
+        conn.execute(sa.text("create table post (id integer primary key)"))
+        conn.execute(sa.text("update version set value = 2"))
+
+
+def test_reflect_cache(app: Flask) -> None:
+    metadata = _reflect(app)
+    assert os.path.exists(os.path.join(app.instance_path, "reflect", "default.pickle"))
+    assert list(metadata.tables["user"].columns.keys()) == ["id", "name"]
+
+    _add_table(app)
+    # The cached tables are loaded instead of reflecting again.
+    assert "post" not in _reflect(app).tables
+
+    result = app.test_cli_runner().invoke(args=["sqlalchemy", "reflect"])
+    assert "Saved reflected tables" in result.output
+    assert "post" in _reflect(app).tables
+
+
+def test_version(app: Flask) -> None:
+    app.config["SQLALCHEMY_REFLECT_CACHE_VERSION"] = "select value from version"
+    _reflect(app)
+    _add_table(app)
+    assert "post" in _reflect(app).tables
+
+
+def test_invalid_file(app: Flask) -> None:
+    _reflect(app)
+    _add_table(app)
+
+    with open(os.path.join(app.instance_path, "reflect", "default.pickle"), "wb") as f:
+        f.write(b"invalid")
+
+    assert "post" in _reflect(app).tables
+
+
+def test_existing_table(app: Flask) -> None:
+    _reflect(app)
+    app.extensions.pop("sqlalchemy")
+    db = SQLAlchemy(app)
+    user = db.Table("user", sa.Column("id", sa.Integer, primary_key=True))
+
+    with app.app_context():
+        db.reflect()
+
+    # Like reflect, tables that are already defined are not replaced.
+    assert db.metadata.tables["user"] is user
+    assert "name" not in user.columns
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import typing as t
+from pathlib import Path
 
 import pytest
 import sqlalchemy as sa
@@ -205,3 +206,127 @@ def test_session_multiple_dbs(app: Flask, model_class: t.Any) -> None:
     db.session.commit()
     products = db.session.execute(db.select(Product)).scalars().all()
     assert len(products) == 2
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_features_looked_up_once(
+    db: SQLAlchemy, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    class Todo(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    db.create_all()
+    db.session()
+
+    def fail(self: SQLAlchemy) -> None:
+        raise AssertionError("Looked up by a session event.")
+
+    # Sharding and caching are checked when the session is created, not for each
+    # query and flush.
+    for name in ("_shards", "_model_cache", "_query_cache"):
+        monkeypatch.setattr(SQLAlchemy, name, property(fail))
+
+    db.session.add(Todo())
+    db.session.commit()
+    db.session.execute(sa.update(Todo).values(id=2))
+    db.session.commit()
+    assert db.session.get(Todo, 2) is not None
+    assert len(db.session.scalars(db.select(Todo)).all()) == 1
+
+
+def _replica_db(app: Flask, **options: t.Any) -> tuple[SQLAlchemy, t.Any]:
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "replicas": ["sqlite://", "sqlite://"],
+        **options,
+    }
+    db = SQLAlchemy(app)
+
+    class Todo(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    with app.app_context():
+        db.create_all()
+
+        for replica in db.replica_engines[None]:
+            db.metadata.create_all(replica)
+
+    return db, Todo
+
+
+def test_replica_reads(app: Flask) -> None:
+    db, Todo = _replica_db(app)
+
+    with app.app_context():
+        db.session.add(Todo())
+        db.session.commit()
+        # Writes make the session use the primary until it's closed.
+        assert db.session.scalar(sa.select(sa.func.count(Todo.id))) == 1
+        db.session.remove()
+
+        assert (
+            db.session.get_bind(Todo, clause=sa.select(Todo))
+            in db.replica_engines[None]
+        )
+        assert db.session.scalar(sa.select(sa.func.count(Todo.id))) == 0
+        assert db.session.get(Todo, 1) is None
+
+        with db.session.using_primary():
+            assert db.session.get_bind(Todo, clause=sa.select(Todo)) is db.engine
+            assert db.session.get(Todo, 1) is not None
+
+
+def test_replica_primary_for_writes(app: Flask) -> None:
+    db, Todo = _replica_db(app)
+
+    with app.app_context():
+        assert db.session.get_bind(Todo) is db.engine
+        assert db.session.get_bind(Todo, clause=sa.update(Todo)) is db.engine
+        locked = sa.select(Todo).with_for_update()
+        assert db.session.get_bind(Todo, clause=locked) is db.engine
+        # The update above is sticky.
+        assert db.session.get_bind(Todo, clause=sa.select(Todo)) is db.engine
+
+
+def test_replica_round_robin(app: Flask) -> None:
+    db, Todo = _replica_db(app)
+
+    with app.app_context():
+        replicas = db.replica_engines[None]
+        chosen = []
+
+        for _ in range(3):
+            chosen.append(db.session.get_bind(Todo, clause=sa.select(Todo)))
+            # The choice is kept for the session.
+            assert db.session.get_bind(Todo, clause=sa.select(Todo)) is chosen[-1]
+            db.session.remove()
+
+        assert chosen == [replicas[0], replicas[1], replicas[0]]
+
+
+def test_replica_least_connections(app: Flask, tmp_path: Path) -> None:
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "replicas": [f"sqlite:///{tmp_path}/a.db", f"sqlite:///{tmp_path}/b.db"],
+        "replica_strategy": "least_connections",
+    }
+    db = SQLAlchemy(app)
+
+    class Todo(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    with app.app_context():
+        busy, idle = db.replica_engines[None]
+
+        with busy.connect():
+            for _ in range(2):
+                assert db.session.get_bind(Todo, clause=sa.select(Todo)) is idle
+                db.session.remove()
+
+
+def test_replica_invalid_strategy(app: Flask) -> None:
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "replicas": ["sqlite://"],
+        "replica_strategy": "random",
+    }
+
+    with pytest.raises(ValueError, match="replica strategy"):
+        SQLAlchemy(app)
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import typing as t
+
+import pytest
+import sqlalchemy as sa
+import sqlalchemy.orm as sa_orm
+from flask import Flask
+
+from flask_sqlalchemy import SQLAlchemy
+
+
+@pytest.fixture
+def app(app: Flask) -> Flask:
+    app.config["SQLALCHEMY_BINDS"] = {"s0": "sqlite://", "s1": "sqlite://"}
+    app.config["SQLALCHEMY_SHARDS"] = {"tenants": ["s0", "s1"]}
+    return app
+
+
+def _make_models(db: SQLAlchemy) -> tuple[t.Any, t.Any]:
+    class Order(db.Model):
+        __bind_key__ = "tenants"
+        __shard_key__ = "tenant_id"
+        id = sa.Column(sa.Integer, primary_key=True)
+        tenant_id = sa.Column(sa.Integer, nullable=False)
+        items = sa_orm.relationship("Item")
+
+    class Item(db.Model):
+        __bind_key__ = "tenants"
+        __shard_key__ = "tenant_id"
+        id = sa.Column(sa.Integer, primary_key=True)
+        tenant_id = sa.Column(sa.Integer, nullable=False)
+        order_id = sa.Column(sa.Integer, sa.ForeignKey(Order.id))
+
+    return Order, Item
+
+
+@pytest.fixture
+def db(app: Flask) -> SQLAlchemy:
+    return SQLAlchemy(app)
+
+
+def _count(db: SQLAlchemy, shard_id: str) -> int:
+    with db.engines[shard_id].connect() as conn:
+        return conn.scalar(sa.text('select count(*) from "order"')) or 0
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_flush_and_read(db: SQLAlchemy) -> None:
+    Order, Item = _make_models(db)
+    db.create_all()
+    assert db.get_shard("tenants", 2) == "s0"
+    assert db.get_shard("tenants", 3) == "s1"
+    db.session.add_all([Order(id=1, tenant_id=2), Order(id=2, tenant_id=3)])
+    db.session.commit()
+    assert _count(db, "s0") == 1
+    assert _count(db, "s1") == 1
+
+    # Without choosing a shard, results from all shards are merged.
+    ids = db.session.scalars(sa.select(Order.id)).all()
+    assert sorted(ids) == [1, 2]
+    order = db.session.get(Order, 2)
+    assert order is not None
+    assert order.tenant_id == 3
+
+    with db.session.for_shard("s1"):
+        assert db.session.scalars(sa.select(Order.id)).all() == [2]
+
+    db.session.execute(sa.update(Order).values(tenant_id=2))
+    db.session.execute(sa.delete(Order).where(Order.id == 2))
+    db.session.commit()
+    assert db.session.scalars(sa.select(Order.tenant_id)).all() == [2]
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_load_from_instance_shard(db: SQLAlchemy) -> None:
+    Order, Item = _make_models(db)
+    db.create_all()
+    db.session.add_all([Order(id=1, tenant_id=3, items=[Item(id=1, tenant_id=3)])])
+    db.session.commit()
+    executed: list[sa.engine.Engine] = []
+
+    def before_execute(conn: sa.engine.Connection, *args: t.Any) -> None:
+        executed.append(conn.engine)
+
+    for key in ("s0", "s1"):
+        sa.event.listen(db.engines[key], "before_cursor_execute", before_execute)
+
+    order = db.session.get(Order, 1)
+    assert order is not None
+    assert len(executed) == 2
+    executed.clear()
+    db.session.expire(order, ["id"])
+    assert order.id == 1
+    assert [len(order.items)] == [1]
+    assert executed == [db.engines["s1"], db.engines["s1"]]
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_duplicate_keys(db: SQLAlchemy) -> None:
+    Order, Item = _make_models(db)
+    db.create_all()
+    db.session.add_all(
+        [
+            Order(id=1, tenant_id=2, items=[Item(id=1, tenant_id=2)]),
+            Order(id=1, tenant_id=3, items=[Item(id=1, tenant_id=3)]),
+        ]
+    )
+    db.session.commit()
+    db.session.expunge_all()
+
+    # The same primary key in each shard is a separate instance.
+    orders: list[t.Any] = list(
+        db.session.scalars(sa.select(Order).order_by(Order.tenant_id))
+    )
+    assert [o.tenant_id for o in orders] == [2, 3]
+    assert [sa.inspect(o).identity_token for o in orders] == ["s0", "s1"]
+    assert [[i.tenant_id for i in o.items] for o in orders] == [[2], [3]]
+    item = orders[1].items[0]
+
+    with db.session.for_shard("s1"):
+        assert db.session.get(Order, 1) is orders[1]
+
+    assert db.session.get(Order, 1, identity_token="s0") is orders[0]
+    item.tenant_id = 4
+    db.session.commit()
+    db.session.expunge_all()
+
+    with db.session.for_shard("s1"):
+        assert db.session.scalars(sa.select(Item.tenant_id)).all() == [4]
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_shard_required(db: SQLAlchemy) -> None:
+    Order, _ = _make_models(db)
+
+    with pytest.raises(sa.exc.UnboundExecutionError, match="for_shard"):
+        db.session.get_bind(Order)
+
+    with pytest.raises(sa.exc.UnboundExecutionError, match="not in"):
+        with db.session.for_shard("s2"):
+            db.session.get_bind(Order)
+
+    with db.session.for_shard("s1"):
+        assert db.session.get_bind(Order) is db.engines["s1"]
+
+    db.session.add(Order(id=1, tenant_id=None))
+
+    with pytest.raises(sa.exc.InvalidRequestError, match="is None"):
+        db.session.flush()
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_missing_shard_key(db: SQLAlchemy) -> None:
+    class Order(db.Model):
+        __bind_key__ = "tenants"
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    db.session.add(Order(id=1))
+
+    with pytest.raises(sa.exc.InvalidRequestError, match="__shard_key__"):
+        db.session.flush()
+
+
+def test_resolver(app: Flask) -> None:
+    db = SQLAlchemy(app, shard_resolver=lambda value, shards: shards[-1])
+
+    with app.app_context():
+        assert db.get_shard("tenants", 2) == "s1"
+
+        with pytest.raises(sa.exc.UnboundExecutionError):
+            db.get_shard("other", 2)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_create_drop_all_shard_bind(app: Flask, parallel: bool) -> None:
+    db = SQLAlchemy()
+    _make_models(db)
+
+    # A shard's bind can also have its own models.
+    class Setting(db.Model):
+        __bind_key__ = "s0"
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all(parallel=parallel)
+        assert sa.inspect(db.engines["s0"]).get_table_names() == [
+            "item",
+            "order",
+            "setting",
+        ]
+        assert sa.inspect(db.engines["s1"]).get_table_names() == ["item", "order"]
+
+        db.drop_all(parallel=parallel)
+        assert sa.inspect(db.engines["s0"]).get_table_names() == []
+        assert sa.inspect(db.engines["s1"]).get_table_names() == []
+
+
+def test_invalid_config(app: Flask) -> None:
+    app.config["SQLALCHEMY_SHARDS"] = {"tenants": ["s0", "s2"]}
+
+    with pytest.raises(RuntimeError, match="'s2'"):
+        SQLAlchemy(app)
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_bulk_insert(db: SQLAlchemy) -> None:
+    Order, _ = _make_models(db)
+    db.create_all()
+    rows = ({"id": i, "tenant_id": i} for i in range(5))
+    db.bulk_insert(Order, rows, batch_size=2)
+    db.session.commit()
+    assert _count(db, "s0") == 3
+    assert _count(db, "s1") == 2
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_stream(db: SQLAlchemy) -> None:
+    Order, _ = _make_models(db)
+    db.create_all()
+    db.bulk_insert(Order, ({"id": i, "tenant_id": i} for i in range(5)))
+    ids = [order.id for order in db.stream(sa.select(Order), chunk_size=2)]
+    assert sorted(ids) == [0, 1, 2, 3, 4]
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+import typing as t
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+import sqlalchemy.orm as sa_orm
+from flask import Flask
+
+from flask_sqlalchemy import SQLAlchemy
+
+
+def _make_model(db: SQLAlchemy) -> t.Any:
+    class Item(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    db.create_all()
+    db.bulk_insert(Item, ({} for _ in range(10)))
+    return Item
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_stream(db: SQLAlchemy) -> None:
+    Item = _make_model(db)
+    ids = []
+
+    for item in db.stream(db.select(Item).order_by(Item.id), chunk_size=3):
+        ids.append(item.id)
+        # Only the current chunk is in the session.
+        assert len(db.session.identity_map) <= 3
+
+    assert ids == list(range(1, 11))
+    assert len(db.session.identity_map) == 0
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_stream_rows(db: SQLAlchemy) -> None:
+    Item = _make_model(db)
+    select = db.select(Item.id, Item).order_by(Item.id)
+    rows = list(db.stream(select, chunk_size=4, scalars=False))
+    assert [row.id for row in rows] == list(range(1, 11))
+    assert rows[0].Item.id == 1
+    assert sa_orm.object_session(rows[0].Item) is None
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_stream_close(db: SQLAlchemy) -> None:
+    Item = _make_model(db)
+    it = db.stream(db.select(Item.id), chunk_size=3)
+    assert next(it) == 1
+    it.close()
+    assert db.session.scalar(sa.select(sa.func.count(Item.id))) == 10
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_invalid_chunk_size(db: SQLAlchemy) -> None:
+    with pytest.raises(ValueError):
+        db.stream(db.select(sa.literal(1)), chunk_size=0)
+
+
+@pytest.fixture
+def file_db(app: Flask, tmp_path: Path) -> SQLAlchemy:
+    # Chunks use their own sessions and worker threads, which need a database that
+    # is shared between connections.
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path}/a.db"
+    return SQLAlchemy(app)
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_iter_chunks(file_db: SQLAlchemy) -> None:
+    db = file_db
+
+    class Item(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+        done = sa.Column(sa.Boolean, default=False, nullable=False)
+
+    db.create_all()
+    db.bulk_insert(Item, ({} for _ in range(10)))
+    db.session.commit()
+    chunks = []
+
+    for items in db.iter_chunks(Item, chunk_size=3, where=Item.id != 5):
+        chunks.append([item.id for item in items])
+        assert items[0] not in db.session
+
+        for item in items:
+            item.done = True
+
+    assert chunks == [[1, 2, 3], [4, 6, 7], [8, 9, 10]]
+    assert db.session.scalars(sa.select(Item.id).where(~Item.done)).all() == [5]
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_iter_chunks_stop(file_db: SQLAlchemy) -> None:
+    db = file_db
+    Item = _make_model(db)
+    db.session.commit()
+
+    chunks = db.iter_chunks(Item, chunk_size=3)
+
+    for items in chunks:
+        items[0].id = 100
+        break
+
+    chunks.close()
+    # The chunk that was not finished is rolled back.
+    assert db.session.get(Item, 100) is None
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_iter_chunks_workers(file_db: SQLAlchemy) -> None:
+    db = file_db
+    Item = _make_model(db)
+    db.session.commit()
+    threads = set()
+
+    def process(items: list[t.Any]) -> list[int]:
+        threads.add(threading.get_ident())
+        return [item.id for item in items]
+
+    chunks = list(db.iter_chunks(Item, chunk_size=3, process=process, workers=2))
+    assert chunks == [[1, 2, 3], [4, 5, 6], [7, 8, 9], [10]]
+    assert threading.get_ident() not in threads
+
+    with pytest.raises(ValueError, match="'process' is required"):
+        db.iter_chunks(Item, workers=2)
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_iter_chunks_invalid(db: SQLAlchemy) -> None:
+    Item = _make_model(db)
+
+    # Invalid arguments are raised when called, not when iteration starts.
+    with pytest.raises(ValueError, match="'chunk_size'"):
+        db.iter_chunks(Item, chunk_size=0)
+
+    with pytest.raises(ValueError, match="'workers'"):
+        db.iter_chunks(Item, process=len, workers=0)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+import typing as t
+import unittest.mock
+
+import pytest
+import sqlalchemy as sa
+import sqlalchemy.dialects.mysql
+import sqlalchemy.dialects.postgresql
+from flask import Flask
+from flask import g
+
+from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.timeouts import _set_timeout
+
+# Takes about 0.3 seconds.
+slow = sa.text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c LIMIT 1000000)"
+    " SELECT count(*) FROM c"
+)
+
+
+def test_sqlite_timeout(app: Flask) -> None:
+    app.config["SQLALCHEMY_STATEMENT_TIMEOUT"] = 0.01
+    db = SQLAlchemy(app)
+
+    with app.app_context():
+        with pytest.raises(sa.exc.OperationalError, match="interrupted"):
+            db.session.execute(slow)
+
+        db.session.rollback()
+        # Fast statements still work on the same connection.
+        assert db.session.execute(sa.text("select 1")).scalar() == 1
+
+
+def test_bind_timeout(app: Flask) -> None:
+    app.config["SQLALCHEMY_STATEMENT_TIMEOUT"] = 0.01
+    app.config["SQLALCHEMY_BINDS"] = {"a": {"url": "sqlite://", "statement_timeout": 0}}
+    db = SQLAlchemy(app)
+
+    with app.app_context(), db.engines["a"].connect() as conn:
+        assert conn.execute(slow).scalar() == 1000000
+
+
+def test_override_timeout(app: Flask) -> None:
+    app.testing = True
+    app.config["SQLALCHEMY_STATEMENT_TIMEOUT"] = 0.01
+    db = SQLAlchemy(app)
+
+    @app.route("/")
+    @db.statement_timeout(None)
+    def index() -> str:
+        return str(db.session.execute(slow).scalar())
+
+    assert app.test_client().get("/").text == "1000000"
+
+    with app.app_context():
+        with pytest.raises(sa.exc.OperationalError):
+            db.session.execute(slow)
+
+
+def test_override_timeout_concurrent(app: Flask) -> None:
+    db = SQLAlchemy(app)
+    entered = threading.Barrier(2)
+    first_done = threading.Event()
+    restored: dict[str, t.Any] = {}
+
+    @db.statement_timeout(None)
+    def view(name: str) -> None:
+        entered.wait(5)
+
+        if name == "b":
+            first_done.wait(5)
+
+    def run(name: str, timeout: float) -> None:
+        with app.app_context(), db.statement_timeout(timeout):
+            view(name)
+            restored[name] = g.get("_sqlalchemy_statement_timeout")
+            first_done.set()
+
+    threads = [
+        threading.Thread(target=run, args=("a", 1)),
+        threading.Thread(target=run, args=("b", 2)),
+    ]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    # Each request's own timeout is restored after the shared decorated view.
+    assert restored == {"a": 1, "b": 2}
+
+
+@pytest.mark.parametrize(
+    ("name", "timeout", "expect"),
+    [
+        ("postgresql", 1.5, "SET statement_timeout = 1500"),
+        ("postgresql", None, "SET statement_timeout = 0"),
+        ("mysql", 1.5, "SET SESSION max_execution_time = 1500"),
+        ("mariadb", 1.5, "SET SESSION max_statement_time = 1.5"),
+    ],
+)
+def test_set_timeout(name: str, timeout: float | None, expect: str) -> None:
+    dialect: sa.engine.Dialect
+
+    if name == "postgresql":
+        dialect = sa.dialects.postgresql.dialect()  # type: ignore[no-untyped-call]
+    else:
+        dialect = sa.dialects.mysql.dialect(  # type: ignore[no-untyped-call]
+            is_mariadb=name == "mariadb"
+        )
+
+    dbapi_connection = unittest.mock.Mock()
+    info: dict[str, float | None] = {}
+    _set_timeout(dialect, dbapi_connection, info, timeout)
+    dbapi_connection.cursor().execute.assert_called_once_with(expect)
+    dbapi_connection.commit.assert_called_once()
+    assert info["_fsa_statement_timeout"] == timeout
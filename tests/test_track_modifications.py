@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 import typing as t
 
 import pytest
@@ -84,3 +85,123 @@ def test_track_modifications(app: Flask, model_class: t.Any) -> None:
         assert len(before) == 1
         assert before[0] == (item, "delete")
         assert before == after
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_track_models(app: Flask) -> None:
+    db = SQLAlchemy()
+
+    class Todo(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+        title = sa.Column(sa.String)
+
+    class Tag(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = [Todo]
+    db.init_app(app)
+    db.create_all()
+    recorded: list[tuple[t.Any, str]] = []
+
+    def after_commit(sender: Flask, changes: list[tuple[t.Any, str]]) -> None:
+        recorded.extend(changes)
+
+    with models_committed.connected_to(after_commit, app):
+        item = Todo()
+        db.session.add_all([item, Tag()])
+        db.session.flush()
+        item.title = "test"  # type: ignore[assignment]
+        db.session.commit()
+
+    # Only the listed model is tracked. Changes in separate flushes are all recorded.
+    assert recorded == [(item, "insert"), (item, "update")]
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_queue(app: Flask) -> None:
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = True
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS_QUEUE"] = 10
+    db = SQLAlchemy(app)
+
+    class Todo(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    db.create_all()
+    recorded: list[tuple[t.Any, ...]] = []
+    threads: list[threading.Thread] = []
+
+    def after_commit(sender: Flask, changes: list[tuple[t.Any, ...]]) -> None:
+        recorded.extend(changes)
+        threads.append(threading.current_thread())
+
+    with models_committed.connected_to(after_commit, app):
+        db.session.add(Todo())
+        db.session.commit()
+        assert db.wait_for_signals(timeout=5)
+
+    # Model, primary key, and operation are sent from the background thread.
+    assert recorded == [(Todo, (1,), "insert")]
+    assert threads[0] is not threading.current_thread()
+
+
+def test_queue_commit_in_receiver(app: Flask) -> None:
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = True
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS_QUEUE"] = 1
+    db = SQLAlchemy(app)
+
+    class Todo(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    recorded: list[tuple[t.Any, ...]] = []
+
+    def after_commit(sender: Flask, changes: list[tuple[t.Any, ...]]) -> None:
+        recorded.extend(changes)
+
+        if len(recorded) == 1:
+            # More commits than the queue holds, from the thread that empties it.
+            for _ in range(2):
+                db.session.add(Todo())
+                db.session.commit()
+
+    with app.app_context(), models_committed.connected_to(after_commit, app):
+        db.create_all()
+        db.session.add(Todo())
+        db.session.commit()
+        assert db.wait_for_signals(timeout=5)
+
+    # Commits made by a receiver are sent immediately instead of queued.
+    assert [change[1] for change in recorded] == [(1,), (2,), (3,)]
+
+
+def test_queue_drop(app: Flask) -> None:
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = True
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS_QUEUE"] = 1
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS_QUEUE_FULL"] = "drop"
+    db = SQLAlchemy(app)
+
+    class Todo(db.Model):
+        id = sa.Column(sa.Integer, primary_key=True)
+
+    release = threading.Event()
+    recorded: list[tuple[t.Any, ...]] = []
+
+    def after_commit(sender: Flask, changes: list[tuple[t.Any, ...]]) -> None:
+        release.wait(5)
+        recorded.extend(changes)
+
+    with app.app_context(), models_committed.connected_to(after_commit, app):
+        db.create_all()
+
+        for _ in range(4):
+            db.session.add(Todo())
+            db.session.commit()
+
+        release.set()
+        assert db.wait_for_signals(timeout=5)
+
+    # At most one commit is being sent and one is queued, the rest are dropped.
+    signal_queue = db._app_signal_queue[app]
+    assert 2 <= signal_queue.dropped <= 3
+    assert len(recorded) == 4 - signal_queue.dropped
+    signal_queue.stop()
+    assert signal_queue._thread is None
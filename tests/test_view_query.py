@@ -8,6 +8,7 @@ import sqlalchemy.orm as sa_orm
 from flask import Flask
 from werkzeug.exceptions import NotFound
 
+import flask_sqlalchemy.loading
 from flask_sqlalchemy import SQLAlchemy
 
 
@@ -21,6 +22,70 @@ def test_view_get_or_404(db: SQLAlchemy, Todo: t.Any) -> None:
         assert db.get_or_404(Todo, 2)
 
 
+@pytest.mark.usefixtures("app_ctx")
+def test_get_many(db: SQLAlchemy, Todo: t.Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    db.session.add_all(Todo() for _ in range(5))
+    db.session.commit()
+    statements = []
+
+    @sa.event.listens_for(db.engine, "before_cursor_execute")
+    def record(*args: t.Any) -> None:
+        statements.append(args[2])
+
+    # Committing expired the instances, so they are queried.
+    items = db.get_many(Todo, [3, 1, 9, 3])
+    assert [item and item.id for item in items] == [3, 1, None, 3]
+    assert items[0] is items[3]
+    assert len(statements) == 1
+
+    # Loaded instances are not queried.
+    assert db.get_many(Todo, [1, 3]) == [items[1], items[0]]
+    assert len(statements) == 1
+
+    monkeypatch.setitem(flask_sqlalchemy.loading._max_params, "sqlite", 2)
+    db.session.expire_all()
+    items = db.get_many(Todo, range(1, 6))
+    assert [item and item.id for item in items] == [1, 2, 3, 4, 5]
+    assert len(statements) == 4
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_get_many_composite(db: SQLAlchemy) -> None:
+    class Pair(db.Model):
+        a = sa.Column(sa.Integer, primary_key=True)
+        b = sa.Column(sa.Integer, primary_key=True)
+
+    db.create_all()
+    db.bulk_insert(Pair, [{"a": 1, "b": 2}, {"a": 2, "b": 1}])
+    db.session.commit()
+    items = db.get_many(Pair, [(2, 1), {"a": 1, "b": 2}, (1, 1)])
+    assert [item and (item.a, item.b) for item in items] == [(2, 1), (1, 2), None]
+
+    with pytest.raises(sa.exc.InvalidRequestError, match="Expected 2, got 1"):
+        db.get_many(Pair, [1])
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_get_many_or_404(db: SQLAlchemy, Todo: t.Any) -> None:
+    db.session.add_all(Todo() for _ in range(2))
+    db.session.commit()
+    assert [item.id for item in db.get_many_or_404(Todo, [2, 1])] == [2, 1]
+
+    with pytest.raises(NotFound, match="primary key 3, 4"):
+        db.get_many_or_404(Todo, [1, 3, 4])
+
+
+@pytest.mark.usefixtures("app_ctx")
+def test_get_many_string_ids(db: SQLAlchemy, Todo: t.Any) -> None:
+    db.session.add_all(Todo() for _ in range(2))
+    db.session.commit()
+    db.session.expire_all()
+    # Ids from a request are converted to the primary key's type.
+    items = db.get_many(Todo, ["2", "1", "x"])
+    assert [item and item.id for item in items] == [2, 1, None]
+    assert [item.id for item in db.get_many_or_404(Todo, ["1", "2"])] == [1, 2]
+
+
 @pytest.mark.usefixtures("app_ctx")
 def test_first_or_404(db: SQLAlchemy, Todo: t.Any) -> None:
     db.session.add(Todo(title="a"))